@@ -1,11 +1,14 @@
 # app/api/endpoints/attempts.py
 
-from fastapi import APIRouter, Depends, HTTPException
-from pydantic import BaseModel
+import base64
 from datetime import datetime
-from typing import List, Dict, Any
-from sqlalchemy.orm import Session
-from app.db.database import get_db
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from pydantic import BaseModel
+from typing import List, Dict, Any, Optional, Tuple
+from sqlalchemy import select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.db.database import get_async_db
+from app.services.attempt_buffer import ingest_attempt
 from app.services.auth import get_current_user, sign_in_with_email_and_password
 from app.db.models import User, Attempt, LessonItem
 
@@ -20,66 +23,100 @@ class AttemptRequest(BaseModel):
 @router.post("/")
 async def store_attempt(
     request: AttemptRequest,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     user: User = Depends(get_current_user)
 ):
     try:
-        # Create new attempt
-        attempt = Attempt(
-            user_id=user.id,
+        xp, streak = await ingest_attempt(
+            db,
+            user,
             lesson_item_id=request.lesson_item_id,
             transcript=request.transcript,
             score=request.score,
-            word_feedback=request.word_feedback,
-            created_at=datetime.utcnow()
+            word_feedback=request.word_feedback
         )
         
-        db.add(attempt)
-        
-        # Update user XP and streak
-        user.xp += int(request.score)  # Add score as XP
-        
-        # Update streak (simplified logic)
-        today = datetime.utcnow().date()
-        last_attempt_date = db.query(Attempt.created_at).filter(
-            Attempt.user_id == user.id
-        ).order_by(Attempt.created_at.desc()).first()
-        
-        if last_attempt_date:
-            last_date = last_attempt_date[0].date()
-            if (today - last_date).days == 1:
-                user.streak += 1
-            elif (today - last_date).days > 1:
-                user.streak = 1
-        else:
-            user.streak = 1
-            
-        db.commit()
-        
         return {
-            "message": "Attempt stored successfully",
-            "xp": user.xp,
-            "streak": user.streak
+            # xp/streak are None when the attempt was only queued (ATTEMPT_BUFFER_ACK=enqueue)
+            "message": "Attempt stored successfully" if xp is not None else "Attempt queued",
+            "xp": xp,
+            "streak": streak
         }
         
+    except HTTPException:
+        raise
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         raise HTTPException(status_code=500, detail=f"Error storing attempt: {str(e)}")
 
-@router.get("/")
+ATTEMPT_FIELDS = ("id", "lesson_item_id", "transcript", "score", "created_at", "word_feedback")
+DEFAULT_ATTEMPT_FIELDS = ("id", "lesson_item_id", "transcript", "score", "created_at")
+
+class AttemptOut(BaseModel):
+    id: int
+    created_at: datetime
+    lesson_item_id: Optional[int] = None
+    transcript: Optional[str] = None
+    score: Optional[float] = None
+    word_feedback: Optional[List[Dict[str, Any]]] = None
+
+def encode_cursor(created_at: datetime, attempt_id: int) -> str:
+    raw = f"{created_at.isoformat()}|{attempt_id}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+def decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        created_at, attempt_id = raw.split("|")
+        return datetime.fromisoformat(created_at), int(attempt_id)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+def parse_fields(fields: Optional[str]) -> Tuple[str, ...]:
+    if not fields:
+        return DEFAULT_ATTEMPT_FIELDS
+    requested = {field.strip() for field in fields.split(",") if field.strip()}
+    unknown = requested - set(ATTEMPT_FIELDS)
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown fields: {', '.join(sorted(unknown))}")
+    # id and created_at are always needed to build the next cursor
+    return tuple(field for field in ATTEMPT_FIELDS if field in requested or field in ("id", "created_at"))
+
+@router.get("/", response_model=List[AttemptOut], response_model_exclude_unset=True)
 async def get_user_attempts(
-    skip: int = 0,
-    limit: int = 10,
-    db: Session = Depends(get_db),
+    response: Response,
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+    limit: int = Query(10, ge=1, le=100),
+    fields: Optional[str] = Query(None, description="Comma-separated fields; word_feedback is left out by default"),
+    skip: int = Query(0, ge=0, deprecated=True, description="Offset paging, ignored when cursor is given"),
+    db: AsyncSession = Depends(get_async_db),
     user: User = Depends(get_current_user)
 ):
-    attempts = db.query(Attempt).filter(
+    """Newest attempts first, paged by (created_at, id).
+
+    The cursor for the following page is returned in the X-Next-Cursor
+    header, which is absent on the last page.
+    """
+    selected = parse_fields(fields)
+    query = select(*[getattr(Attempt, field) for field in selected]).where(
         Attempt.user_id == user.id
     ).order_by(
-        Attempt.created_at.desc()
-    ).offset(skip).limit(limit).all()
-    
-    return attempts
+        Attempt.created_at.desc(), Attempt.id.desc()
+    ).limit(limit + 1)
+
+    if cursor:
+        created_at, attempt_id = decode_cursor(cursor)
+        query = query.where(tuple_(Attempt.created_at, Attempt.id) < tuple_(created_at, attempt_id))
+    elif skip:
+        query = query.offset(skip)
+
+    rows = (await db.execute(query)).all()
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1]
+        response.headers["X-Next-Cursor"] = encode_cursor(last.created_at, last.id)
+
+    return [AttemptOut(**row._asdict()) for row in rows]
 
 @router.post("/auth/signin")
 async def sign_in(email: str, password: str):
@@ -0,0 +1,65 @@
+# app/api/endpoints/flashcards.py
+from datetime import datetime
+from fastapi import APIRouter, Depends, HTTPException, Query
+from pydantic import BaseModel, Field
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.db.database import get_async_db
+from app.services.auth import get_current_user
+from app.services.flashcards import due_cards, review
+from app.db.models import User, Flashcard
+
+router = APIRouter()
+
+class ReviewRequest(BaseModel):
+    quality: int = Field(..., ge=0, le=5, description="SM-2 recall quality: 0 blackout .. 5 perfect")
+
+def _card(card: Flashcard):
+    return {
+        "id": card.id,
+        "text": card.text,
+        "lesson_item_id": card.lesson_item_id,
+        "times_wrong": card.times_wrong,
+        "last_seen": card.last_seen,
+        "due_at": card.due_at,
+        "interval_days": card.interval_days,
+        "ease": card.ease,
+        "repetitions": card.repetitions,
+    }
+
+@router.get("/due")
+async def get_due_flashcards(
+    limit: int = Query(20, ge=1, le=100),
+    db: AsyncSession = Depends(get_async_db),
+    user: User = Depends(get_current_user)
+):
+    """The "Practice Again" deck: cards due now, most overdue first"""
+    try:
+        cards = await due_cards(db, user.id, datetime.utcnow(), limit)
+        return [_card(card) for card in cards]
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error fetching flashcards: {str(e)}")
+
+@router.post("/{flashcard_id}/review")
+async def review_flashcard(
+    flashcard_id: int,
+    request: ReviewRequest,
+    db: AsyncSession = Depends(get_async_db),
+    user: User = Depends(get_current_user)
+):
+    try:
+        result = await db.execute(
+            select(Flashcard).where(Flashcard.id == flashcard_id, Flashcard.user_id == user.id)
+        )
+        card = result.scalars().first()
+        if card is None:
+            raise HTTPException(status_code=404, detail="Flashcard not found")
+
+        review(card, request.quality, datetime.utcnow())
+        await db.commit()
+        return _card(card)
+    except HTTPException:
+        raise
+    except Exception as e:
+        await db.rollback()
+        raise HTTPException(status_code=500, detail=f"Error reviewing flashcard: {str(e)}")
@@ -1,23 +1,44 @@
 # app/api/endpoints/leaderboard.py
 from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy.orm import Session
-from sqlalchemy import desc
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List, Optional
-from app.db.database import get_db
+from app.db.database import get_async_db
 from app.services.auth import get_current_user
+from app.services.ranking import RankedUser, leaderboard_index
 from app.db.models import User
 
 router = APIRouter()
 
+def _entry(ranked: RankedUser, user: User):
+    return {
+        "rank": ranked.rank,
+        "user_id": ranked.user_id,
+        "username": ranked.name,
+        "xp": ranked.xp,
+        "streak": ranked.streak,
+        "isCurrentUser": ranked.user_id == user.id,
+    }
+
 @router.get("/")
 async def get_leaderboard(
     language: Optional[str] = Query(None, description="Filter by language (English,yoruba, igbo, hausa)"),
     limit: int = Query(10, ge=1, le=100, description="Number of top users to return"),
-    db: Session = Depends(get_db),
+    around: int = Query(2, ge=0, le=25, description="Neighbors to return above and below the current user"),
+    db: AsyncSession = Depends(get_async_db),
     user: User = Depends(get_current_user)
 ):
     try:
-        # Base query
-        query = db.query(User).order
-    except:
-        pass    
+        await leaderboard_index.ensure_loaded(db)
+
+        me = leaderboard_index.rank(user.id, language)
+        return {
+            "language": language,
+            "entries": [_entry(ranked, user) for ranked in leaderboard_index.top(limit, language)],
+            "current_user": _entry(me, user) if me else None,
+            "neighbors": [
+                _entry(ranked, user)
+                for ranked in leaderboard_index.neighbors(user.id, around, language)
+            ],
+        }
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error fetching leaderboard: {str(e)}")
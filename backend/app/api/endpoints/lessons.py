@@ -1,49 +1,76 @@
 # app/api/endpoints/lessons.py
-from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List, Optional
-from app.db.database import get_db
-from app.services.auth import get_current_user
-from app.db.models import User, Lesson, LessonItem
+from app.db.database import get_async_db
+from app.services.auth import get_current_user, require_admin
+from app.services.catalog import RenderedResponse, lesson_catalog
+from app.services.target_index import target_index
+from app.db.models import User
 
 router = APIRouter()
 
+def _etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    if not if_none_match:
+        return False
+    candidates = [tag.strip() for tag in if_none_match.split(",")]
+    return "*" in candidates or any(tag.removeprefix("W/") == etag for tag in candidates)
+
+def _catalog_response(request: Request, rendered: RenderedResponse) -> Response:
+    """Serve a pre-rendered catalog body, or 304 when the client already has it"""
+    headers = {"ETag": rendered.etag, "Cache-Control": "private, no-cache"}
+    if _etag_matches(request.headers.get("if-none-match"), rendered.etag):
+        return Response(status_code=304, headers=headers)
+    return Response(content=rendered.body, media_type="application/json", headers=headers)
+
 @router.get("/")
 async def get_lessons(
+    request: Request,
     language: Optional[str] = Query(None, description="Filter by language (English, yoruba, igbo, hausa)"),
     level: Optional[str] = Query(None, description="Filter by level (beginner, intermediate, advanced)"),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     user: User = Depends(get_current_user)
 ):
     try:
-        query = db.query(Lesson)
-        
-        if language:
-            query = query.filter(Lesson.language == language)
-        if level:
-            query = query.filter(Lesson.level == level)
-            
-        lessons = query.all()
-        
-        return lessons
+        catalog = await lesson_catalog.get(db)
+        return _catalog_response(request, catalog.lessons_response(language, level))
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error fetching lessons: {str(e)}")
 
+@router.post("/reload")
+async def reload_catalog(
+    db: AsyncSession = Depends(get_async_db),
+    user: User = Depends(require_admin)
+):
+    """Drop the cached catalog after lessons were imported and load it again.
+
+    Admins only (ADMIN_UIDS). This reloads the worker that serves the request
+    and no other; with several workers rely on CATALOG_REFRESH_SECONDS, or
+    restart them, to have every worker pick the import up.
+    """
+    try:
+        lesson_catalog.invalidate()
+        target_index.invalidate()
+        catalog = await lesson_catalog.get(db)
+        return {"lessons": len(catalog.lessons), "items": len(catalog.items)}
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error reloading lessons: {str(e)}")
+
 @router.get("/{lesson_id}/items")
 async def get_lesson_items(
+    request: Request,
     lesson_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     user: User = Depends(get_current_user)
 ):
     try:
-        lesson_items = db.query(LessonItem).filter(
-            LessonItem.lesson_id == lesson_id
-        ).all()
+        catalog = await lesson_catalog.get(db)
+        rendered = catalog.lesson_items_response(lesson_id)
         
-        if not lesson_items:
+        if rendered is None:
             raise HTTPException(status_code=404, detail="Lesson not found")
             
-        return lesson_items
+        return _catalog_response(request, rendered)
     except HTTPException:
         raise
     except Exception as e:
@@ -51,20 +78,20 @@ async def get_lesson_items(
 
 @router.get("/items/{item_id}")
 async def get_lesson_item(
+    request: Request,
     item_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     user: User = Depends(get_current_user)
 ):
     try:
-        lesson_item = db.query(LessonItem).filter(
-            LessonItem.id == item_id
-        ).first()
+        catalog = await lesson_catalog.get(db)
+        rendered = catalog.lesson_item_response(item_id)
         
-        if not lesson_item:
+        if rendered is None:
             raise HTTPException(status_code=404, detail="Lesson item not found")
             
-        return lesson_item
+        return _catalog_response(request, rendered)
     except HTTPException:
         raise
     except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Error fetching lesson item: {str(e)}")
\ No newline at end of file
+        raise HTTPException(status_code=500, detail=f"Error fetching lesson item: {str(e)}")
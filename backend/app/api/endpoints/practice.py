@@ -0,0 +1,72 @@
+# app/api/endpoints/practice.py
+from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Form
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.db.database import get_async_db
+from app.services.attempt_buffer import ingest_attempt
+from app.services.auth import get_current_user
+from app.services.catalog import lesson_catalog
+from app.services.preprocessing import prepare_upload
+from app.services.scoring import score_words, tokenize
+from app.services.spitch import TranscriptionService, get_transcription_service
+from app.services.target_index import target_index
+from app.db.models import User
+
+router = APIRouter()
+
+@router.post("/{lesson_item_id}")
+async def practice_lesson_item(
+    lesson_item_id: int,
+    audio_file: UploadFile = File(...),
+    language: Optional[str] = Form(None),
+    confidence: float = Form(1.0, ge=0, le=1),
+    db: AsyncSession = Depends(get_async_db),
+    user: User = Depends(get_current_user),
+    service: TranscriptionService = Depends(get_transcription_service)
+):
+    """Transcribe a spoken attempt, score it against the item and store it.
+
+    Replaces the /transcribe -> /score -> /attempts round trips. ``language``
+    defaults to the language of the item's lesson.
+    """
+    try:
+        target = await target_index.get(db, lesson_item_id)
+        if target is None:
+            raise HTTPException(status_code=404, detail="Lesson item not found")
+        if not language:
+            catalog = await lesson_catalog.get(db)
+            language = catalog.item_language(lesson_item_id)
+            if not language:
+                raise HTTPException(status_code=400, detail="language is required for this item")
+        # End the read transaction so the pooled connection isn't held through the
+        # upload and the upstream call (up to TRANSCRIBE_TIMEOUT_SECONDS)
+        await db.commit()
+
+        content, sha256 = await prepare_upload(audio_file)
+        transcription = await service.transcribe(language, content, content_sha256=sha256)
+
+        result = score_words(target.tokens, tokenize(transcription["transcript"]), confidence)
+
+        xp, streak = await ingest_attempt(
+            db,
+            user,
+            lesson_item_id=lesson_item_id,
+            transcript=transcription["transcript"],
+            score=result["score"],
+            word_feedback=result["word_feedback"]
+        )
+
+        return {
+            "lesson_item_id": lesson_item_id,
+            "request_id": transcription["request_id"],
+            "transcript": transcription["transcript"],
+            "cached": transcription["cached"],
+            **result,
+            "xp": xp,
+            "streak": streak
+        }
+    except HTTPException:
+        raise
+    except Exception as e:
+        await db.rollback()
+        raise HTTPException(status_code=500, detail=f"Practice error: {str(e)}")
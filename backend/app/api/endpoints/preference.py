@@ -1,48 +1,70 @@
 # preferences.py
+import json
 from datetime import datetime
 
 from fastapi.params import Depends
-from fastapi import APIRouter
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, HTTPException
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 
 
-from app.db.database import get_db
+from app.db.database import get_async_db
 from app.db.models import User, UserPreferences
+from app.db.upsert import insert_missing
 from app.services.auth import get_current_user
+from app.services.ranking import leaderboard_index
 
 
 router = APIRouter()
 
+async def _get_or_create_preferences(db: AsyncSession, user_id: int) -> UserPreferences:
+    """The user's preferences row, created with the defaults (and indexed) if missing.
+
+    One row per user (uq_user_preferences_user_id); concurrent first requests
+    both insert-or-skip and read back the same row.
+    """
+    result = await db.execute(select(UserPreferences).where(UserPreferences.user_id == user_id))
+    preferences = result.scalars().first()
+    if preferences is None:
+        await db.execute(insert_missing(
+            db.get_bind().dialect.name, UserPreferences.__table__, {"user_id": user_id}, ["user_id"]
+        ))
+        await db.commit()
+        result = await db.execute(select(UserPreferences).where(UserPreferences.user_id == user_id))
+        preferences = result.scalars().one()
+        leaderboard_index.set_language(user_id, preferences.target_language)
+    return preferences
+
 @router.get("/")
 async def get_user_preferences(
     user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
-    preferences = db.query(UserPreferences).filter(UserPreferences.user_id == user.id).first()
-    if not preferences:
-        # Create default preferences if they don't exist
-        preferences = UserPreferences(user_id=user.id)
-        db.add(preferences)
-        db.commit()
-        db.refresh(preferences)
-    return preferences
+    # Create default preferences if they don't exist
+    return await _get_or_create_preferences(db, user.id)
 
 @router.put("/")
 async def update_user_preferences(
     preferences_update: str,
     user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
-    preferences = db.query(UserPreferences).filter(UserPreferences.user_id == user.id).first()
-    if not preferences:
-        preferences = UserPreferences(user_id=user.id)
-        db.add(preferences)
+    # The client sends the update as a JSON-encoded query parameter
+    try:
+        update = json.loads(preferences_update)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="preferences_update must be a JSON object")
+    if not isinstance(update, dict):
+        raise HTTPException(status_code=400, detail="preferences_update must be a JSON object")
+
+    preferences = await _get_or_create_preferences(db, user.id)
     
     # Update preferences
-    if "target_language" in preferences_update:
-        preferences.target_language = preferences_update["target_language"]
+    if "target_language" in update:
+        preferences.target_language = update["target_language"]
     
     preferences.updated_at = datetime.utcnow()
-    db.commit()
-    db.refresh(preferences)
+    await db.commit()
+    await db.refresh(preferences)
+    leaderboard_index.set_language(user.id, preferences.target_language)
     return preferences
\ No newline at end of file
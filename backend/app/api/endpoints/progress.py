@@ -0,0 +1,26 @@
+# app/api/endpoints/progress.py
+from datetime import datetime
+from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.db.database import get_async_db
+from app.services.auth import get_current_user
+from app.services.catalog import lesson_catalog
+from app.services.progress import progress_summary
+from app.db.models import User
+
+router = APIRouter()
+
+@router.get("/")
+async def get_progress(
+    language: Optional[str] = Query(None, description="Only lessons in this language"),
+    days: int = Query(30, ge=1, le=366, description="Days of daily activity to return"),
+    db: AsyncSession = Depends(get_async_db),
+    user: User = Depends(get_current_user)
+):
+    """Per-lesson completion and best scores, per-language averages and daily activity"""
+    try:
+        catalog = await lesson_catalog.get(db)
+        return await progress_summary(db, user.id, catalog, days, datetime.utcnow().date(), language)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error fetching progress: {str(e)}")
@@ -1,8 +1,13 @@
 # app/api/endpoints/score.py
+from typing import List
 from fastapi import APIRouter, Depends, HTTPException
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.config import settings
+from app.db.database import get_async_db
 from app.services.auth import get_current_user
-from app.services.scoring import score_attempt
+from app.services.scoring import score_attempt, score_attempts_batch, score_words, tokenize
+from app.services.target_index import target_index
 from app.db.models import User
 
 router = APIRouter()
@@ -10,7 +15,14 @@ router = APIRouter()
 class ScoreRequest(BaseModel):
     target_text: str
     transcript: str
-    confidence: float = 1.0
+    confidence: float = Field(1.0, ge=0, le=1)
+
+class ItemScoreRequest(BaseModel):
+    transcript: str
+    confidence: float = Field(1.0, ge=0, le=1)
+
+class ScoreBatchRequest(BaseModel):
+    items: List[ScoreRequest] = Field(..., max_length=settings.SCORE_BATCH_MAX_ITEMS)
 
 @router.post("/")
 async def score_attempt_endpoint(
@@ -25,4 +37,38 @@ async def score_attempt_endpoint(
         )
         return result
     except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Scoring error: {str(e)}")
\ No newline at end of file
+        raise HTTPException(status_code=500, detail=f"Scoring error: {str(e)}")
+
+@router.post("/batch")
+async def score_attempts_batch_endpoint(
+    request: ScoreBatchRequest,
+    user: User = Depends(get_current_user)
+):
+    """Score many pairs at once; results keep input order with per-item errors"""
+    try:
+        results = score_attempts_batch([
+            (item.target_text, item.transcript, item.confidence)
+            for item in request.items
+        ])
+        return {"results": results}
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Scoring error: {str(e)}")
+
+@router.post("/items/{lesson_item_id}")
+async def score_lesson_item_endpoint(
+    lesson_item_id: int,
+    request: ItemScoreRequest,
+    db: AsyncSession = Depends(get_async_db),
+    user: User = Depends(get_current_user)
+):
+    """Score against a catalog item using its pre-normalized target"""
+    try:
+        target = await target_index.get(db, lesson_item_id)
+        if target is None:
+            raise HTTPException(status_code=404, detail="Lesson item not found")
+
+        return score_words(target.tokens, tokenize(request.transcript), request.confidence)
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Scoring error: {str(e)}")
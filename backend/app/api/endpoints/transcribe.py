@@ -1,34 +1,204 @@
 # app/api/endpoints/transcribe.py
-from fastapi import APIRouter, HTTPException, Depends, UploadFile, File, Form
-from app.services.auth import get_current_user
-from app.db.models import User
+import asyncio
+import json
+from fastapi import APIRouter, HTTPException, Depends, UploadFile, File, Form, WebSocket, WebSocketDisconnect
+from fastapi.responses import StreamingResponse
 from app.core.config import settings
-from spitch import Spitch
+from app.db.database import AsyncSessionLocal
+from app.services.audio import ALLOWED_AUDIO_TYPES, base_content_type
+from app.services.auth import authenticate_token, get_current_user
+from app.services.catalog import lesson_catalog
+from app.services.jobs import FINISHED, TranscriptionJob, TranscriptionJobQueue, get_job_queue, spool_content
+from app.services.preprocessing import prepare_upload
+from app.services.scoring import IncrementalScorer
+from app.services.spitch import TranscriptionService, get_transcription_service
+from app.services.streaming import StreamingTranscriber, get_streaming_transcriber
+from app.services.target_index import target_index
+from app.db.models import User
 
 router = APIRouter()
 
-# Initialize Spitch client with API key
-client = Spitch(api_key=settings.SPITCH_API_KEY)
+# Seconds between SSE keep-alive comments while a job is pending
+SSE_HEARTBEAT_SECONDS = 15
 
 @router.post("/")
 async def transcribe_audio(
     language: str = Form(...),
     audio_file: UploadFile = File(...),
-    user: User = Depends(get_current_user)
+    user: User = Depends(get_current_user),
+    service: TranscriptionService = Depends(get_transcription_service)
 ):
     try:
-        # Read audio file bytes
-        audio_data = await audio_file.read()
+        content, sha256 = await prepare_upload(audio_file)
 
-        # Call Spitch API via SDK
-        response = client.speech.transcribe(
-            language=language,
-            content=audio_data
-        )
+        # Stream it to Spitch without blocking the event loop; the cache is
+        # keyed by the original upload
+        return await service.transcribe(language, content, content_sha256=sha256)
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
 
+@router.post("/jobs", status_code=202)
+async def create_transcription_job(
+    language: str = Form(...),
+    audio_file: UploadFile = File(...),
+    user: User = Depends(get_current_user),
+    queue: TranscriptionJobQueue = Depends(get_job_queue)
+):
+    """Queue a transcription and return its job id right away"""
+    try:
+        content, sha256 = await prepare_upload(audio_file)
+        # The upload's temp file is closed when this request ends
+        content = await asyncio.to_thread(spool_content, content)
+        job = queue.submit(user.id, language, content, sha256)
         return {
-            "request_id": getattr(response, "request_id", None),
-            "transcript": response.text
+            "job_id": job.id,
+            "status": job.status,
+            "status_url": f"/transcribe/jobs/{job.id}",
+            "events_url": f"/transcribe/jobs/{job.id}/events",
         }
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
+
+def _user_job(queue: TranscriptionJobQueue, job_id: str, user: User) -> TranscriptionJob:
+    job = queue.get(job_id)
+    if job is None or job.user_id != user.id:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job
+
+@router.get("/jobs/{job_id}")
+async def get_transcription_job(
+    job_id: str,
+    user: User = Depends(get_current_user),
+    queue: TranscriptionJobQueue = Depends(get_job_queue)
+):
+    return _user_job(queue, job_id, user).to_dict()
+
+@router.get("/jobs/{job_id}/events")
+async def stream_transcription_job(
+    job_id: str,
+    user: User = Depends(get_current_user),
+    queue: TranscriptionJobQueue = Depends(get_job_queue)
+):
+    """Server-sent events: one 'status' event per change until the job finishes"""
+    job = _user_job(queue, job_id, user)
+
+    async def events():
+        while True:
+            changed = job.changed
+            yield f"event: status\ndata: {json.dumps(job.to_dict())}\n\n"
+            if job.status in FINISHED:
+                return
+            while True:
+                try:
+                    await asyncio.wait_for(changed.wait(), timeout=SSE_HEARTBEAT_SECONDS)
+                    break
+                except asyncio.TimeoutError:
+                    yield ": keep-alive\n\n"
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+@router.websocket("/stream/{lesson_item_id}")
+async def stream_practice(
+    websocket: WebSocket,
+    lesson_item_id: int,
+    transcriber: StreamingTranscriber = Depends(get_streaming_transcriber)
+):
+    """Score a lesson item while it is being spoken.
+
+    The client opens the socket and sends a JSON start frame
+    ``{"token", "language"?, "confidence"?, "content_type"?}`` (the token stays out of the
+    URL and access logs), then binary audio chunks, then the text frame
+    ``end``. The server answers ``ready`` with the target words, ``partial``
+    frames whose ``words`` hold only the per-word feedback that changed, and
+    a ``final`` frame with the full score. Errors arrive as an ``error``
+    frame before the socket is closed.
+    """
+    await websocket.accept()
+    try:
+        start = await websocket.receive_json()
+        target, language = await _start_stream(start, lesson_item_id)
+        confidence = float(start.get("confidence", 1.0))
+        if not 0 <= confidence <= 1:
+            raise HTTPException(status_code=422, detail="confidence must be between 0 and 1")
+        content_type = base_content_type(start.get("content_type")) or None
+        if content_type is not None and content_type not in ALLOWED_AUDIO_TYPES:
+            raise HTTPException(status_code=415, detail=f"Unsupported audio type: {content_type}")
+    except WebSocketDisconnect:
+        return
+    except (HTTPException, ValueError, TypeError, AttributeError) as e:
+        status_code = getattr(e, "status_code", 400)
+        detail = getattr(e, "detail", None) or "Expected a JSON start frame with a token"
+        await websocket.send_json({"type": "error", "status": status_code, "detail": detail})
+        await websocket.close(code=1008)
+        return
+
+    scorer = IncrementalScorer(target.tokens, confidence)
+    stream = transcriber.open(language, content_type)
+    await websocket.send_json({"type": "ready", "lesson_item_id": lesson_item_id, "words": list(target.tokens)})
+    try:
+        received = 0
+        while True:
+            message = await websocket.receive()
+            if message["type"] == "websocket.disconnect":
+                return
+            chunk = message.get("bytes")
+            if chunk is None:
+                if (message.get("text") or "").strip() == "end":
+                    break
+                continue
+            received += len(chunk)
+            if received > settings.AUDIO_MAX_BYTES:
+                await websocket.send_json({
+                    "type": "error", "status": 413, "detail": f"Audio exceeds {settings.AUDIO_MAX_BYTES} bytes"
+                })
+                await websocket.close(code=1009)
+                return
+            partial = await stream.feed(chunk)
+            if partial is not None:
+                await websocket.send_json({"type": "partial", "transcript": partial, "words": scorer.update(partial)})
+
+        transcription = await stream.finish()
+        words = scorer.update(transcription["transcript"], final=True)
+        await websocket.send_json({
+            "type": "final",
+            "request_id": transcription["request_id"],
+            "transcript": transcription["transcript"],
+            "cached": transcription["cached"],
+            "words": words,
+            **scorer.result()
+        })
+        await websocket.close()
+    except WebSocketDisconnect:
+        pass
+    except HTTPException as e:
+        await websocket.send_json({"type": "error", "status": e.status_code, "detail": e.detail})
+        await websocket.close(code=1011)
+    except Exception as e:
+        await websocket.send_json({"type": "error", "status": 500, "detail": str(e)})
+        await websocket.close(code=1011)
+    finally:
+        await stream.aclose()
+
+async def _start_stream(start: dict, lesson_item_id: int):
+    """Authenticate the start frame and resolve the item's target and language"""
+    token = start.get("token")
+    if not token:
+        raise HTTPException(status_code=401, detail="Missing token")
+    # Only hold a pooled connection for the setup, not the whole utterance
+    async with AsyncSessionLocal() as db:
+        await authenticate_token(token, db)
+        target = await target_index.get(db, lesson_item_id)
+        if target is None:
+            raise HTTPException(status_code=404, detail="Lesson item not found")
+        language = start.get("language") or (await lesson_catalog.get(db)).item_language(lesson_item_id)
+    if not language:
+        raise HTTPException(status_code=400, detail="language is required for this item")
+    return target, language
@@ -0,0 +1,128 @@
+# app/commands/backfill_progress.py
+"""Rebuild the progress rollups from the attempts table.
+
+    python -m app.commands.backfill_progress [--user-id ID]
+
+Rollups are maintained by record_attempt and were filled from the existing
+attempts by migration 0004; run this to repair drift or after re-scoring. Each user's rows are deleted and
+re-aggregated with set-based INSERT ... SELECT statements in a single
+transaction, so nothing is read into Python.
+
+keep_xp=True (what rescore uses) leaves the daily xp as it was earned:
+existing daily rows get their attempts and total_score recomputed in place
+instead, so DailyProgress.xp keeps summing to what users.xp was credited.
+"""
+import argparse
+import time
+
+from sqlalchemy import Integer, cast, delete, func, insert, select, update
+
+from app.db.database import SessionLocal
+from app.db.models import Attempt, DailyProgress, ItemProgress
+
+
+def _attempt_xp(dialect_name: str):
+    """int(score) as record_attempt computes it; Postgres rounds on cast"""
+    score = func.trunc(Attempt.score) if dialect_name == "postgresql" else Attempt.score
+    return cast(score, Integer)
+
+def backfill(user_id=None, keep_xp: bool = False) -> dict:
+    with SessionLocal() as db:
+        dialect_name = db.get_bind().dialect.name
+        scope = [Attempt.score.isnot(None), Attempt.lesson_item_id.isnot(None)]
+        if user_id is not None:
+            scope.append(Attempt.user_id == user_id)
+
+        delete_items = delete(ItemProgress)
+        delete_days = delete(DailyProgress)
+        if user_id is not None:
+            delete_items = delete_items.where(ItemProgress.user_id == user_id)
+            delete_days = delete_days.where(DailyProgress.user_id == user_id)
+        db.execute(delete_items)
+        if not keep_xp:
+            db.execute(delete_days)
+
+        # Last score per item: the score of the attempt with the highest id
+        # among those at the latest timestamp
+        latest = (
+            select(
+                Attempt.user_id, Attempt.lesson_item_id, Attempt.score,
+                func.row_number().over(
+                    partition_by=(Attempt.user_id, Attempt.lesson_item_id),
+                    order_by=(Attempt.created_at.desc(), Attempt.id.desc()),
+                ).label("position"),
+            )
+            .where(*scope)
+            .subquery()
+        )
+        items = (
+            select(
+                Attempt.user_id,
+                Attempt.lesson_item_id,
+                func.count(),
+                func.sum(Attempt.score),
+                func.max(Attempt.score),
+                func.max(Attempt.created_at),
+            )
+            .where(*scope)
+            .group_by(Attempt.user_id, Attempt.lesson_item_id)
+            .subquery()
+        )
+        item_rows = db.execute(
+            insert(ItemProgress).from_select(
+                ["user_id", "lesson_item_id", "attempts", "total_score", "best_score",
+                 "last_attempt_at", "last_score"],
+                select(*items.c, latest.c.score).join(
+                    latest,
+                    (latest.c.user_id == items.c.user_id)
+                    & (latest.c.lesson_item_id == items.c.lesson_item_id)
+                    & (latest.c.position == 1),
+                ),
+            )
+        ).rowcount
+
+        day = func.date(Attempt.created_at)
+        if keep_xp:
+            same_day = (
+                (Attempt.user_id == DailyProgress.user_id)
+                & (day == DailyProgress.day)
+            )
+            statement = update(DailyProgress).values(
+                attempts=select(func.count()).where(*scope, same_day).scalar_subquery(),
+                total_score=select(func.coalesce(func.sum(Attempt.score), 0.0))
+                .where(*scope, same_day)
+                .scalar_subquery(),
+            )
+            if user_id is not None:
+                statement = statement.where(DailyProgress.user_id == user_id)
+            day_rows = db.execute(statement).rowcount
+        else:
+            day_rows = db.execute(
+                insert(DailyProgress).from_select(
+                    ["user_id", "day", "attempts", "total_score", "xp"],
+                    select(
+                        Attempt.user_id, day, func.count(), func.sum(Attempt.score),
+                        func.sum(_attempt_xp(dialect_name)),
+                    )
+                    .where(*scope)
+                    .group_by(Attempt.user_id, day),
+                )
+            ).rowcount
+
+        db.commit()
+    return {"item_progress_rows": item_rows, "daily_progress_rows": day_rows}
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--user-id", type=int, help="only rebuild this user's rollups")
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    counts = backfill(args.user_id)
+    print(
+        f"Rebuilt {counts['item_progress_rows']} item and {counts['daily_progress_rows']} "
+        f"daily rows in {time.perf_counter() - start:.2f}s"
+    )
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,237 @@
+# app/commands/import_catalog.py
+"""Load lesson packs into the catalog.
+
+    python -m app.commands.import_catalog [PATH ...] [--dry-run]
+
+Each PATH is a .json or .csv pack or a directory of them (default: the
+packs in backend/catalog). Lessons are matched on (language, level, title)
+and items on (lesson, text), so a pack can be re-run or extended at any
+time: new rows are inserted, changed ones updated and nothing is deleted.
+Writes are multi-row INSERT ... ON CONFLICT statements of up to
+CHUNK_ROWS rows, in one transaction.
+
+A JSON pack is an object (or a list of them) shaped like
+
+    {"language": "yo", "level": "beginner", "lessons": [
+        {"title": "Basic Greetings", "items": [
+            {"text": "Báwo ni?", "expected_answer": "bawo ni", "hint": "How are you?"}
+        ]}
+    ]}
+
+and a CSV pack has one item per row with the columns language, level,
+title, text and optionally expected_answer, hint and audio_url.
+
+Running API workers pick the changes up after CATALOG_REFRESH_SECONDS, or
+on POST /lessons/reload (admins only), which reloads just the worker that
+serves it.
+"""
+import argparse
+import csv
+import json
+import os
+import time
+from datetime import datetime
+from typing import Dict, Iterable, List, NamedTuple, Optional
+
+from sqlalchemy import func, select
+
+from app.db.database import get_engine
+from app.db.models import Lesson, LessonItem
+from app.db.upsert import insert_missing, upsert
+from app.services.scoring import normalize_text
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+CATALOG_DIR = os.path.join(BACKEND_DIR, "catalog")
+CSV_COLUMNS = ("language", "level", "title", "text")
+CHUNK_ROWS = 500
+
+
+class PackItem(NamedTuple):
+    language: str
+    level: str
+    title: str
+    text: str
+    expected_answer: Optional[str]
+    hint: Optional[str]
+    audio_url: Optional[str]
+
+
+def _clean(value) -> Optional[str]:
+    if value is None:
+        return None
+    value = str(value).strip()
+    return value or None
+
+def _pack_item(language, level, title, item: dict, where: str) -> PackItem:
+    fields = [_clean(language), _clean(level), _clean(title), _clean(item.get("text"))]
+    if not all(fields):
+        raise ValueError(f"{where}: language, level, title and text are required")
+    return PackItem(
+        *fields,
+        expected_answer=_clean(item.get("expected_answer")),
+        hint=_clean(item.get("hint")),
+        audio_url=_clean(item.get("audio_url")),
+    )
+
+def read_json_pack(path: str) -> List[PackItem]:
+    with open(path, encoding="utf-8") as f:
+        data = json.load(f)
+    groups = data if isinstance(data, list) else [data]
+    items = []
+    for g, group in enumerate(groups):
+        for l, lesson in enumerate(group.get("lessons", [])):
+            for i, item in enumerate(lesson.get("items", [])):
+                items.append(_pack_item(
+                    group.get("language"), group.get("level"), lesson.get("title"), item,
+                    f"{path}: group {g}, lesson {l}, item {i}",
+                ))
+    return items
+
+def read_csv_pack(path: str) -> List[PackItem]:
+    with open(path, encoding="utf-8-sig", newline="") as f:
+        reader = csv.DictReader(f)
+        missing = [column for column in CSV_COLUMNS if column not in (reader.fieldnames or [])]
+        if missing:
+            raise ValueError(f"{path}: missing columns {', '.join(missing)}")
+        return [
+            _pack_item(row["language"], row["level"], row["title"], row, f"{path}: line {reader.line_num}")
+            for row in reader
+        ]
+
+READERS = {".json": read_json_pack, ".csv": read_csv_pack}
+
+def read_packs(paths: Iterable[str]) -> List[PackItem]:
+    """Items from every pack, directories expanded in name order"""
+    files = []
+    for path in paths:
+        if os.path.isdir(path):
+            files.extend(
+                os.path.join(path, name) for name in sorted(os.listdir(path))
+                if os.path.splitext(name)[1].lower() in READERS
+            )
+        else:
+            files.append(path)
+
+    items = []
+    for path in files:
+        extension = os.path.splitext(path)[1].lower()
+        if extension not in READERS:
+            raise ValueError(f"{path}: unsupported pack type {extension or '(none)'}")
+        items.extend(READERS[extension](path))
+    return items
+
+
+def _chunks(rows: List, size: int = CHUNK_ROWS):
+    for start in range(0, len(rows), size):
+        yield rows[start:start + size]
+
+def _lesson_ids(connection, languages) -> Dict[tuple, int]:
+    result = connection.execute(
+        select(Lesson.id, Lesson.language, Lesson.level, Lesson.title)
+        .where(Lesson.language.in_(languages))
+    )
+    return {(row.language, row.level, row.title): row.id for row in result}
+
+def import_catalog(items: Iterable[PackItem], engine=None, dry_run: bool = False) -> dict:
+    """Upsert ``items`` and count what changed; ``dry_run`` rolls it all back"""
+    # A key listed twice keeps its last version, in its first position
+    unique: Dict[tuple, PackItem] = {}
+    listed = 0
+    for item in items:
+        unique[(item.language, item.level, item.title, item.text)] = item
+        listed += 1
+    lesson_keys = list(dict.fromkeys(key[:3] for key in unique))
+    languages = sorted({key[0] for key in lesson_keys})
+    counts = {
+        "lessons": {"inserted": 0, "unchanged": 0},
+        "items": {"inserted": 0, "updated": 0, "unchanged": 0},
+        "duplicates": listed - len(unique),
+    }
+
+    engine = engine or get_engine()
+    with engine.connect() as connection:
+        transaction = connection.begin()
+        dialect_name = connection.dialect.name
+
+        lesson_ids = _lesson_ids(connection, languages)
+        new_lessons = [key for key in lesson_keys if key not in lesson_ids]
+        if new_lessons:
+            now = datetime.utcnow()
+            for chunk in _chunks(new_lessons):
+                connection.execute(insert_missing(dialect_name, Lesson.__table__, [
+                    {"language": language, "level": level, "title": title, "created_at": now}
+                    for language, level, title in chunk
+                ], ["language", "level", "title"]))
+            lesson_ids = _lesson_ids(connection, languages)
+        counts["lessons"]["inserted"] = len(new_lessons)
+        counts["lessons"]["unchanged"] = len(lesson_keys) - len(new_lessons)
+
+        existing = {}
+        wanted_lessons = sorted({lesson_ids[key] for key in lesson_keys})
+        for chunk in _chunks(wanted_lessons):
+            result = connection.execute(
+                select(
+                    LessonItem.lesson_id, LessonItem.text, LessonItem.expected_answer, LessonItem.hint,
+                    LessonItem.audio_url, LessonItem.normalized_answer,
+                ).where(LessonItem.lesson_id.in_(chunk))
+            )
+            existing.update({(row.lesson_id, row.text): row for row in result})
+
+        writes = []
+        for key, item in unique.items():
+            row = {
+                "lesson_id": lesson_ids[key[:3]],
+                "text": item.text,
+                "expected_answer": item.expected_answer,
+                "hint": item.hint,
+                "audio_url": item.audio_url,
+                "normalized_answer": normalize_text(item.expected_answer or item.text),
+            }
+            current = existing.get((row["lesson_id"], item.text))
+            if current is None:
+                counts["items"]["inserted"] += 1
+            elif (
+                (current.expected_answer, current.hint, current.normalized_answer)
+                == (row["expected_answer"], row["hint"], row["normalized_answer"])
+                and item.audio_url in (None, current.audio_url)
+            ):
+                counts["items"]["unchanged"] += 1
+                continue
+            else:
+                counts["items"]["updated"] += 1
+            writes.append(row)
+
+        items_table = LessonItem.__table__
+        for chunk in _chunks(writes):
+            connection.execute(upsert(dialect_name, items_table, chunk, ["lesson_id", "text"], lambda excluded: {
+                "expected_answer": excluded.expected_answer,
+                "hint": excluded.hint,
+                "normalized_answer": excluded.normalized_answer,
+                # Packs without audio keep whatever audio the item has
+                "audio_url": func.coalesce(excluded.audio_url, items_table.c.audio_url),
+            }))
+
+        if dry_run:
+            transaction.rollback()
+        else:
+            transaction.commit()
+    return counts
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("paths", nargs="*", default=[CATALOG_DIR], help="packs or directories of packs")
+    parser.add_argument("--dry-run", action="store_true", help="report what would change without writing")
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    counts = import_catalog(read_packs(args.paths), dry_run=args.dry_run)
+    lessons, items = counts["lessons"], counts["items"]
+    print(
+        f"{'Would import' if args.dry_run else 'Imported'} in {time.perf_counter() - start:.2f}s: "
+        f"lessons {lessons['inserted']} inserted, {lessons['unchanged']} unchanged; "
+        f"items {items['inserted']} inserted, {items['updated']} updated, {items['unchanged']} unchanged"
+        + (f"; {counts['duplicates']} repeated entries, last one used" if counts["duplicates"] else "")
+    )
+
+if __name__ == "__main__":
+    main()
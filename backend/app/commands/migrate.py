@@ -0,0 +1,70 @@
+# app/commands/migrate.py
+"""Bring the database schema up to date.
+
+    python -m app.commands.migrate [--revision REV]
+
+Only upgrades; use ``alembic downgrade REV`` from backend/ to go back.
+
+Run once per deploy, before starting the API workers, rather than in every
+worker. A database created by the old import-time create_all (tables but no
+alembic_version) is stamped at the baseline first, so only the later
+revisions run against it. On Postgres an advisory lock serializes
+concurrent runs, e.g. when MIGRATE_ON_STARTUP is set on several replicas.
+"""
+import argparse
+import os
+import time
+
+from alembic import command
+from alembic.config import Config
+from alembic.runtime.migration import MigrationContext
+from sqlalchemy import inspect, text
+
+from app.db.database import get_engine
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+BASELINE = "0001_baseline"
+# Arbitrary key shared by every process migrating this database
+ADVISORY_LOCK_ID = 0x6F7961
+
+
+def alembic_config() -> Config:
+    config = Config(os.path.join(BACKEND_DIR, "alembic.ini"))
+    config.set_main_option("script_location", os.path.join(BACKEND_DIR, "migrations"))
+    return config
+
+def current_revision(connection):
+    return MigrationContext.configure(connection).get_current_revision()
+
+def migrate(revision: str = "head", engine=None) -> dict:
+    engine = engine or get_engine()
+    config = alembic_config()
+    # Leave the app's logging alone when called from the lifespan
+    config.attributes["configure_logger"] = False
+    with engine.begin() as connection:
+        if connection.dialect.name == "postgresql":
+            connection.execute(text("SELECT pg_advisory_xact_lock(:id)"), {"id": ADVISORY_LOCK_ID})
+        config.attributes["connection"] = connection
+
+        before = current_revision(connection)
+        stamped = False
+        if before is None and inspect(connection).has_table("users"):
+            command.stamp(config, BASELINE)
+            before, stamped = BASELINE, True
+        command.upgrade(config, revision)
+        after = current_revision(connection)
+    return {"from": before, "to": after, "stamped_baseline": stamped}
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--revision", default="head", help="revision to upgrade to (default: head)")
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    result = migrate(args.revision)
+    stamped = " (existing schema stamped at baseline)" if result["stamped_baseline"] else ""
+    print(f"Migrated {result['from'] or 'empty database'} -> {result['to']}{stamped} "
+          f"in {time.perf_counter() - start:.2f}s")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,214 @@
+# app/commands/rescore.py
+"""Re-score stored attempts with the current scoring rules.
+
+    python -m app.commands.rescore --confidence C [--workers N] [--chunk-size N]
+                                   [--user-id ID] [--checkpoint PATH] [--restart]
+                                   [--dry-run] [--rebuild-progress]
+
+Attempts are read in id order together with their lesson item, through a
+server-side cursor (Postgres) or id-keyed pages (SQLite, which has no
+server-side cursors). Chunks are scored across a process pool. Only attempts
+whose score or word_feedback changed are written back, one executemany
+UPDATE and commit per chunk. At most two chunks per worker are in flight,
+so memory stays flat however many attempts there are.
+
+After each committed chunk the last attempt id is saved to the checkpoint
+file, and an interrupted run resumes from there. The file is removed once
+a run completes. The confidence an attempt was scored with isn't stored, so
+everything is re-scored at --confidence, which has no default: 1.0 would
+score every attempt as if the recognizer had been certain, inflating scores.
+
+XP is left alone, both users.xp and the xp in the daily rollups, so a
+learner's total keeps matching their history. --rebuild-progress recomputes
+the item rollups and the daily attempt counts and score totals afterwards.
+"""
+import argparse
+import functools
+import json
+import os
+import time
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Any, Deque, Dict, Iterator, List, Optional, Tuple
+
+from sqlalchemy import bindparam, select, update
+
+from app.db.database import get_engine
+from app.db.models import Attempt, LessonItem
+from app.services.scoring import score_words, tokenize
+from app.services.target_index import build_target
+
+DEFAULT_CHECKPOINT = os.path.join(".cache", "rescore-checkpoint.json")
+REPORT_EVERY_SECONDS = 5.0
+
+
+def _score_chunk(rows: List[tuple], confidence: float) -> Tuple[int, List[Dict[str, Any]]]:
+    """Worker side: (rows scored, updates for the attempts whose result changed)"""
+    targets = {}
+    updates = []
+    for attempt_id, transcript, text, expected_answer, normalized_answer, old_score, old_feedback in rows:
+        key = (text, expected_answer, normalized_answer)
+        target = targets.get(key)
+        if target is None:
+            target = targets[key] = build_target(0, text, expected_answer, normalized_answer)
+        result = score_words(list(target.tokens), tokenize(transcript), confidence)
+        if result["score"] != old_score or result["word_feedback"] != old_feedback:
+            updates.append({
+                "attempt_id": attempt_id,
+                "score": result["score"],
+                "word_feedback": result["word_feedback"],
+            })
+    return len(rows), updates
+
+
+def _attempt_chunks(engine, after_id: int, chunk_size: int, user_id: Optional[int]) -> Iterator[List[tuple]]:
+    query = (
+        select(
+            Attempt.id, Attempt.transcript, LessonItem.text, LessonItem.expected_answer,
+            LessonItem.normalized_answer, Attempt.score, Attempt.word_feedback,
+        )
+        .join(LessonItem, LessonItem.id == Attempt.lesson_item_id)
+        .where(Attempt.transcript.isnot(None))
+        .order_by(Attempt.id)
+    )
+    if user_id is not None:
+        query = query.where(Attempt.user_id == user_id)
+
+    if engine.dialect.supports_server_side_cursors:
+        # One read-only query on its own connection; writes use another
+        with engine.connect() as connection:
+            result = connection.execution_options(stream_results=True, yield_per=chunk_size).execute(
+                query.where(Attempt.id > after_id)
+            )
+            for partition in result.partitions():
+                yield [tuple(row) for row in partition]
+        return
+
+    # Without server-side cursors, page by id so no read stays open while chunks are written
+    while True:
+        with engine.connect() as connection:
+            rows = connection.execute(query.where(Attempt.id > after_id).limit(chunk_size)).all()
+        if not rows:
+            return
+        yield [tuple(row) for row in rows]
+        after_id = rows[-1][0]
+
+
+def _load_checkpoint(path: str, user_id: Optional[int], confidence: float) -> Dict[str, Any]:
+    state = {"last_id": 0, "scored": 0, "changed": 0, "user_id": user_id, "confidence": confidence}
+    if not os.path.exists(path):
+        return state
+    with open(path) as f:
+        saved = json.load(f)
+    if saved.get("user_id") != user_id or saved.get("confidence") != confidence:
+        raise SystemExit(
+            f"{path} is from a run with --user-id {saved.get('user_id')} and --confidence "
+            f"{saved.get('confidence')}; pass the same options or --restart"
+        )
+    state.update(saved)
+    return state
+
+def _save_checkpoint(path: str, state: Dict[str, Any]):
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(path + ".tmp", "w") as f:
+        json.dump(state, f)
+    os.replace(path + ".tmp", path)
+
+def rescore(
+    confidence: float,
+    workers: int = 0,
+    chunk_size: int = 1000,
+    user_id: Optional[int] = None,
+    checkpoint: str = DEFAULT_CHECKPOINT,
+    restart: bool = False,
+    dry_run: bool = False,
+    engine=None,
+) -> Dict[str, Any]:
+    engine = engine or get_engine()
+    workers = workers or os.cpu_count() or 1
+    if restart and os.path.exists(checkpoint):
+        os.remove(checkpoint)
+    state = _load_checkpoint(checkpoint, user_id, confidence)
+    resumed_from = state["last_id"]
+    scored = changed = 0
+
+    statement = (
+        update(Attempt.__table__)
+        .where(Attempt.__table__.c.id == bindparam("attempt_id"))
+        .values(score=bindparam("score"), word_feedback=bindparam("word_feedback"))
+    )
+    score_chunk = functools.partial(_score_chunk, confidence=confidence)
+    start = last_report = time.perf_counter()
+
+    def write(last_id: int, future: Future):
+        nonlocal scored, changed, last_report
+        chunk_scored, updates = future.result()
+        if updates and not dry_run:
+            with engine.begin() as connection:
+                connection.execute(statement, updates)
+        scored += chunk_scored
+        changed += len(updates)
+        state.update(last_id=last_id, scored=state["scored"] + chunk_scored, changed=state["changed"] + len(updates))
+        if not dry_run:
+            _save_checkpoint(checkpoint, state)
+
+        now = time.perf_counter()
+        if now - last_report >= REPORT_EVERY_SECONDS:
+            last_report = now
+            print(f"  {scored} attempts, {changed} changed, up to id {last_id} "
+                  f"({scored / (now - start):.0f} attempts/s)", flush=True)
+
+    pending: Deque[Tuple[int, Future]] = deque()
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        for rows in _attempt_chunks(engine, state["last_id"], chunk_size, user_id):
+            pending.append((rows[-1][0], executor.submit(score_chunk, rows)))
+            # Chunks are written in order, so the checkpoint never skips one
+            while len(pending) >= workers * 2:
+                write(*pending.popleft())
+        while pending:
+            write(*pending.popleft())
+
+    if not dry_run and os.path.exists(checkpoint):
+        os.remove(checkpoint)
+    elapsed = time.perf_counter() - start
+    return {
+        "resumed_from": resumed_from,
+        "scored": scored,
+        "changed": changed,
+        "seconds": elapsed,
+        "attempts_per_second": scored / elapsed if elapsed else 0.0,
+    }
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--workers", type=int, default=0, help="scoring processes (default: CPU count)")
+    parser.add_argument("--chunk-size", type=int, default=1000, help="attempts per read, score and write batch")
+    parser.add_argument("--user-id", type=int, help="only re-score this user's attempts")
+    parser.add_argument("--confidence", type=float, required=True, help="ASR confidence to score with (0-1)")
+    parser.add_argument("--checkpoint", default=DEFAULT_CHECKPOINT, help="progress file for resuming")
+    parser.add_argument("--restart", action="store_true", help="ignore the checkpoint and start from the first attempt")
+    parser.add_argument("--dry-run", action="store_true", help="count what would change without writing")
+    parser.add_argument("--rebuild-progress", action="store_true",
+                        help="rebuild the progress rollups from the new scores afterwards, keeping XP")
+    args = parser.parse_args(argv)
+    if not 0 <= args.confidence <= 1:
+        parser.error("--confidence must be between 0 and 1")
+
+    result = rescore(
+        workers=args.workers, chunk_size=args.chunk_size, user_id=args.user_id, confidence=args.confidence,
+        checkpoint=args.checkpoint, restart=args.restart, dry_run=args.dry_run,
+    )
+    resumed = f" (resumed after id {result['resumed_from']})" if result["resumed_from"] else ""
+    print(
+        f"{'Would change' if args.dry_run else 'Re-scored'} {result['changed']} of {result['scored']} attempts"
+        f"{resumed} in {result['seconds']:.2f}s, {result['attempts_per_second']:.0f} attempts/s"
+    )
+    if args.rebuild_progress and not args.dry_run:
+        from app.commands.backfill_progress import backfill
+        counts = backfill(args.user_id, keep_xp=True)
+        print(f"Rebuilt {counts['item_progress_rows']} item and {counts['daily_progress_rows']} daily rows")
+
+if __name__ == "__main__":
+    main()
@@ -3,9 +3,14 @@ from http.client import HTTPException
 import firebase_admin
 import os
 import json
+import threading
 from firebase_admin import auth, credentials
 from app.core.config import settings
 from firebase_admin.exceptions import FirebaseError
+from app.core.startup import startup_report
+
+_init_lock = threading.Lock()
+
 def init_firebase():
     """Initialize Firebase Admin SDK using JSON content from an environment variable"""
     try:
@@ -31,9 +36,24 @@ def init_firebase():
             # Re-raise other ValueErrors (like JSON parsing errors)
             raise
 
+def get_firebase_app():
+    """Return the default Firebase app, initializing it once on first use"""
+    try:
+        return firebase_admin.get_app()
+    except ValueError:
+        pass
+    with _init_lock:
+        try:
+            return firebase_admin.get_app()
+        except ValueError:
+            with startup_report.phase("firebase"):
+                init_firebase()
+            return firebase_admin.get_app()
+
 
 def verify_token(token: str):
     """Verify Firebase ID token"""
+    get_firebase_app()
     try:
         decoded_token = auth.verify_id_token(token)
         return decoded_token
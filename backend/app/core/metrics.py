@@ -0,0 +1,344 @@
+# app/core/metrics.py
+import asyncio
+import bisect
+import functools
+import os
+import random
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+try:
+    import pyinstrument
+except ImportError:  # optional, cProfile is used without it
+    pyinstrument = None
+
+from sqlalchemy import event
+
+from app.core.config import settings
+
+PREFIX = "oya_"
+REQUEST_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+SPAN_BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5,
+                1.0, 2.5, 5.0, 10.0, 30.0)
+
+# Span durations of the request being handled, for its Server-Timing header
+_request_spans: ContextVar[Optional[Dict[str, float]]] = ContextVar("request_spans", default=None)
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+def _labels(names: Tuple[str, ...], values: Tuple, extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+def _number(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Histogram:
+    """Prometheus histogram with a fixed label set"""
+
+    def __init__(self, name: str, help: str, label_names: Tuple[str, ...], buckets: Tuple[float, ...]):
+        self.name = PREFIX + name
+        self.help = help
+        self.label_names = label_names
+        self.buckets = buckets
+        self._series: Dict[Tuple, List] = {}  # labels -> [bucket counts, sum, count]
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, *labels):
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                series = self._series[labels] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            series[0][bisect.bisect_left(self.buckets, value)] += 1
+            series[1] += value
+            series[2] += 1
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            series = [(labels, list(counts), total, count) for labels, (counts, total, count) in self._series.items()]
+        for labels, counts, total, count in sorted(series):
+            running = 0
+            for bound, bucket in zip(self.buckets + (float("inf"),), counts):
+                running += bucket
+                le = 'le="' + _number(bound) + '"'
+                lines.append(f"{self.name}_bucket{_labels(self.label_names, labels, le)} {running}")
+            lines.append(f"{self.name}_sum{_labels(self.label_names, labels)} {total}")
+            lines.append(f"{self.name}_count{_labels(self.label_names, labels)} {count}")
+        return lines
+
+
+class MetricsRegistry:
+    """Histograms recorded here plus stats dicts collected at scrape time.
+
+    ``add_stats`` folds the existing ``stats()`` methods (token cache, pools,
+    transcription cache, ...) into the exposition: numeric values become
+    untyped samples, nested ``le_*`` dicts become ``le`` labels and other
+    nested dicts a ``key`` label.
+    """
+
+    def __init__(self):
+        self.histograms: List[Histogram] = []
+        self.collectors: List[Tuple[str, Callable[[], Dict[str, Any]], Optional[str]]] = []
+
+    def histogram(self, name: str, help: str, label_names: Tuple[str, ...], buckets: Tuple[float, ...]):
+        histogram = Histogram(name, help, label_names, buckets)
+        self.histograms.append(histogram)
+        return histogram
+
+    def add_stats(self, prefix: str, collect: Callable[[], Dict[str, Any]], label: Optional[str] = None):
+        """Export ``collect()``; with ``label``, it returns {label value: stats}"""
+        self.collectors.append((prefix, collect, label))
+
+    def render(self) -> str:
+        lines: List[str] = []
+        for histogram in self.histograms:
+            lines.extend(histogram.render())
+
+        samples: Dict[str, List[str]] = {}
+        for prefix, collect, label in self.collectors:
+            try:
+                groups = collect().items() if label else [(None, collect())]
+            except Exception:
+                continue  # one broken collector shouldn't hide the rest
+            for label_value, stats in groups:
+                base = (label,) if label else ()
+                base_values = (label_value,) if label else ()
+                for key, value in stats.items():
+                    name = f"{PREFIX}{prefix}_{key}"
+                    if isinstance(value, dict):
+                        for sub_key, sub_value in value.items():
+                            if not isinstance(sub_value, (int, float)):
+                                continue
+                            if str(sub_key).startswith("le_"):
+                                bound = sub_key[3:]
+                                extra = 'le="' + ("+Inf" if bound == "inf" else bound) + '"'
+                            else:
+                                extra = f'key="{_escape(sub_key)}"'
+                            samples.setdefault(name, []).append(
+                                f"{name}{_labels(base, base_values, extra)} {_number(sub_value)}"
+                            )
+                    elif isinstance(value, (bool, int, float)):
+                        value = int(value) if isinstance(value, bool) else value
+                        samples.setdefault(name, []).append(f"{name}{_labels(base, base_values)} {_number(value)}")
+        for name, name_samples in samples.items():
+            lines.append(f"# TYPE {name} untyped")
+            lines.extend(name_samples)
+        return "\n".join(lines) + "\n"
+
+
+registry = MetricsRegistry()
+request_duration = registry.histogram(
+    "http_request_duration_seconds", "Request latency by route template", ("method", "route", "status"),
+    REQUEST_BUCKETS,
+)
+span_duration = registry.histogram(
+    "span_duration_seconds", "Time spent in instrumented hot paths", ("span",), SPAN_BUCKETS,
+)
+
+
+def record_span(name: str, seconds: float):
+    span_duration.observe(seconds, name)
+    spans = _request_spans.get()
+    if spans is not None:
+        spans[name] = spans.get(name, 0.0) + seconds
+
+@contextmanager
+def span(name: str):
+    """Time a block, in sync or async code: ``with span("verify_token"): ...``"""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        record_span(name, time.perf_counter() - start)
+
+def timed(name: str):
+    """Decorator form of ``span`` for plain and async functions"""
+    def decorate(fn):
+        if asyncio.iscoroutinefunction(fn):
+            @functools.wraps(fn)
+            async def async_wrapper(*args, **kwargs):
+                with span(name):
+                    return await fn(*args, **kwargs)
+            return async_wrapper
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            with span(name):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorate
+
+def instrument_queries(engine, name: str = "db.query"):
+    """Record every statement's execution time on ``engine`` (a sync Engine)"""
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        starts = conn.info.get("query_start")
+        if starts:
+            record_span(name, time.perf_counter() - starts.pop())
+
+    @event.listens_for(engine, "handle_error")
+    def handle_error(context):
+        starts = context.connection.info.get("query_start") if context.connection is not None else None
+        if starts:
+            starts.pop()
+
+
+class SlowRequestProfiler:
+    """Profiles a random sample of requests and keeps those slower than a threshold.
+
+    Only one request is profiled at a time. cProfile hooks the whole event
+    loop thread, so a profile also contains whatever else the loop ran
+    meanwhile; pyinstrument (when installed and selected) follows the
+    request's own task. Profiles are written to ``directory`` as .prof
+    (load with pstats or snakeviz) or .html.
+    """
+
+    def __init__(self, threshold_ms: float, sample_rate: float, directory: str, backend: str = "cprofile"):
+        self.threshold_ms = threshold_ms
+        self.sample_rate = sample_rate
+        self.directory = directory
+        self.backend = "pyinstrument" if backend == "pyinstrument" and pyinstrument is not None else "cprofile"
+        self.captured = 0
+        self.discarded = 0
+        self._active = False
+
+    @property
+    def enabled(self) -> bool:
+        return self.threshold_ms > 0 and self.sample_rate > 0
+
+    def start(self):
+        """A running profiler for this request, or None if it isn't sampled"""
+        if not self.enabled or self._active or random.random() >= self.sample_rate:
+            return None
+        if self.backend == "pyinstrument":
+            profiler = pyinstrument.Profiler(async_mode="enabled")
+        else:
+            import cProfile
+            profiler = cProfile.Profile()
+        try:
+            profiler.start() if self.backend == "pyinstrument" else profiler.enable()
+        except (RuntimeError, ValueError):  # another profiler is attached
+            return None
+        self._active = True
+        return profiler
+
+    async def finish(self, profiler, elapsed_ms: float, method: str, route: str):
+        self._active = False
+        if self.backend == "pyinstrument":
+            profiler.stop()
+        else:
+            profiler.disable()
+        if elapsed_ms < self.threshold_ms:
+            self.discarded += 1
+            return
+        self.captured += 1
+        stamp = time.strftime("%Y%m%dT%H%M%S")
+        slug = route.strip("/").replace("/", "_").replace("{", "").replace("}", "") or "root"
+        path = os.path.join(self.directory, f"{stamp}-{method}-{slug}-{int(elapsed_ms)}ms")
+        await asyncio.to_thread(self._write, profiler, path)
+
+    def _write(self, profiler, path: str):
+        os.makedirs(self.directory, exist_ok=True)
+        if self.backend == "pyinstrument":
+            with open(path + ".html", "w") as f:
+                f.write(profiler.output_html())
+        else:
+            profiler.dump_stats(path + ".prof")
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "enabled": self.enabled,
+            "threshold_ms": self.threshold_ms,
+            "sample_rate": self.sample_rate,
+            "captured": self.captured,
+            "discarded": self.discarded,
+        }
+
+
+profiler = SlowRequestProfiler(
+    threshold_ms=settings.PROFILE_SLOW_REQUEST_MS,
+    sample_rate=settings.PROFILE_SAMPLE_RATE,
+    directory=settings.PROFILE_DIR,
+    backend=settings.PROFILER,
+)
+registry.add_stats("slow_request_profiles", profiler.stats)
+
+
+class MetricsMiddleware:
+    """Times every HTTP request by route template and reports its spans.
+
+    Latency goes to ``oya_http_request_duration_seconds``; the spans recorded
+    while handling the request are also returned in a ``Server-Timing``
+    header so the breakdown shows up in browser dev tools.
+    """
+
+    def __init__(self, app, server_timing: bool = True):
+        self.app = app
+        self.server_timing = server_timing
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        spans: Dict[str, float] = {}
+        token = _request_spans.set(spans)
+        status = 500
+        start = time.perf_counter()
+        running_profiler = profiler.start()
+
+        async def timed_send(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                if self.server_timing and spans:
+                    timing = ", ".join(
+                        f"{name.replace('.', '-')};dur={seconds * 1000:.1f}" for name, seconds in spans.items()
+                    )
+                    message = {**message, "headers": list(message.get("headers", [])) + [
+                        (b"server-timing", timing.encode("latin-1"))
+                    ]}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, timed_send)
+        finally:
+            elapsed = time.perf_counter() - start
+            route_path = route_template(scope)
+            request_duration.observe(elapsed, scope["method"], route_path, str(status))
+            _request_spans.reset(token)
+            if running_profiler is not None:
+                await profiler.finish(running_profiler, elapsed * 1000, scope["method"], route_path)
+
+def route_template(scope) -> str:
+    """Full path template of the matched route, e.g. /practice/{lesson_item_id}.
+
+    Routes included with a prefix only know their own part of the template,
+    so the prefix is taken from the real path: everything before the
+    segments the route matched. Unmatched requests share one label to keep
+    the series bounded.
+    """
+    template = getattr(scope.get("route"), "path", None)
+    if not template:
+        return "<unmatched>"
+    matched_segments = template.count("/")
+    prefix = "/".join(scope["path"].split("/")[:-matched_segments])
+    return prefix + template
+
+def render_metrics() -> str:
+    return registry.render()
@@ -0,0 +1,44 @@
+# app/core/middleware.py
+from typing import Iterable
+
+from fastapi import HTTPException
+from starlette.responses import JSONResponse
+
+
+class UploadSizeLimitMiddleware:
+    """Reject oversized request bodies on upload routes before they are parsed.
+
+    A declared Content-Length over the limit is answered with 413 straight
+    away; chunked bodies are counted as they stream in and cut off at the
+    limit, so an upload never spools more than ``max_bytes`` to disk.
+    """
+
+    def __init__(self, app, max_bytes: int, path_prefixes: Iterable[str]):
+        self.app = app
+        self.max_bytes = max_bytes
+        self.path_prefixes = tuple(path_prefixes)
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not scope["path"].startswith(self.path_prefixes):
+            return await self.app(scope, receive, send)
+
+        headers = dict(scope["headers"])
+        content_length = headers.get(b"content-length")
+        if content_length is not None and content_length.isdigit() and int(content_length) > self.max_bytes:
+            response = JSONResponse(
+                {"detail": f"Upload exceeds {self.max_bytes} bytes"}, status_code=413
+            )
+            return await response(scope, receive, send)
+
+        received = 0
+
+        async def limited_receive():
+            nonlocal received
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > self.max_bytes:
+                    raise HTTPException(status_code=413, detail=f"Upload exceeds {self.max_bytes} bytes")
+            return message
+
+        await self.app(scope, limited_receive, send)
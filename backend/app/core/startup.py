@@ -0,0 +1,63 @@
+# app/core/startup.py
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Optional
+
+
+class StartupReport:
+    """How long each part of a worker took to become ready.
+
+    ``app.main`` records its import time and the lifespan its startup. Lazy
+    resources (engines, Firebase app, transcription client) record
+    themselves the first time they are used, which is usually during the
+    first request rather than at startup; ``stats()`` tells the two apart.
+    """
+
+    def __init__(self):
+        self.created_at = time.time()
+        self.import_ms: Optional[float] = None
+        self.lifespan_ms: Optional[float] = None
+        self.ready_at: Optional[float] = None
+        self.phases: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+
+    def record(self, name: str, seconds: float):
+        with self._lock:
+            self.phases[name] = {
+                "ms": round(seconds * 1000, 3),
+                "during": "startup" if self.ready_at is None else "first_use",
+                "at": time.time(),
+            }
+
+    @contextmanager
+    def phase(self, name: str):
+        """Time one initialization step: ``with startup_report.phase("firebase"): ...``
+
+        Failed steps aren't recorded; lazy ones are retried on next use.
+        """
+        start = time.perf_counter()
+        yield
+        self.record(name, time.perf_counter() - start)
+
+    def imported(self, seconds: float):
+        self.import_ms = round(seconds * 1000, 3)
+
+    def started(self, seconds: float):
+        self.lifespan_ms = round(seconds * 1000, 3)
+        self.ready_at = time.time()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            phases = dict(self.phases)
+        return {
+            "ready": self.ready_at is not None,
+            "import_ms": self.import_ms,
+            "lifespan_ms": self.lifespan_ms,
+            "uptime_seconds": round(time.time() - self.created_at, 1),
+            "phases_ms": {name: phase["ms"] for name, phase in phases.items()},
+            "first_use": sorted(name for name, phase in phases.items() if phase["during"] == "first_use"),
+        }
+
+
+startup_report = StartupReport()
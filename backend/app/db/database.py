@@ -1,11 +1,134 @@
 # app/db/database.py
+import threading
 from sqlalchemy import create_engine
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import Session, sessionmaker
 from app.core.config import settings
+from app.core.metrics import instrument_queries
+from app.core.startup import startup_report
+from app.db.pool import PoolMetrics, instrument_engine, timed_pool_class
 
-engine = create_engine(settings.DATABASE_URL)
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+ASYNC_DRIVERS = {
+    "postgresql": "postgresql+asyncpg",
+    "postgresql+psycopg2": "postgresql+asyncpg",
+    "postgres": "postgresql+asyncpg",
+    "sqlite": "sqlite+aiosqlite",
+    "sqlite+pysqlite": "sqlite+aiosqlite",
+}
+
+def to_async_url(database_url: str):
+    """Map a sync DATABASE_URL onto the matching async driver"""
+    url = make_url(database_url)
+    if url.drivername in ASYNC_DRIVERS:
+        url = url.set(drivername=ASYNC_DRIVERS[url.drivername])
+    if url.drivername == "postgresql+asyncpg" and "sslmode" in url.query:
+        # asyncpg spells libpq's sslmode as ssl
+        query = dict(url.query)
+        query["ssl"] = query.pop("sslmode")
+        url = url.set(query=query)
+    return url
+
+def engine_options(url, metrics: PoolMetrics, async_: bool = False) -> dict:
+    """Pool sizing and statement timeout options for create_engine"""
+    url = make_url(url)
+    if url.get_backend_name() == "sqlite" and url.database in (None, "", ":memory:"):
+        # In-memory SQLite uses a single shared connection, nothing to size
+        return {}
+
+    options = {
+        "poolclass": timed_pool_class(metrics, async_=async_),
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+    }
+    if url.get_backend_name() == "postgresql" and settings.DB_STATEMENT_TIMEOUT_MS:
+        timeout = str(settings.DB_STATEMENT_TIMEOUT_MS)
+        if async_:
+            options["connect_args"] = {"server_settings": {"statement_timeout": timeout}}
+        else:
+            options["connect_args"] = {"options": f"-c statement_timeout={timeout}"}
+    return options
+
+sync_pool_metrics = PoolMetrics("sync")
+async_pool_metrics = PoolMetrics("async")
+
+# Engines are created on first use, so importing the app (tests, CLI
+# commands, worker boot) neither loads a driver nor opens a connection
+_engine = None
+_async_engine = None
+_engine_lock = threading.Lock()
+
+# Bound to their engine by get_engine() / get_async_engine()
+_session_factory = sessionmaker(autocommit=False, autoflush=False)
+_async_session_factory = async_sessionmaker(
+    class_=AsyncSession,
+    autoflush=False,
+    expire_on_commit=False,
+)
+
+def get_engine():
+    """Sync engine for scripts (seeding, maintenance, migrations)"""
+    global _engine
+    if _engine is None:
+        with _engine_lock:
+            if _engine is None:
+                with startup_report.phase("db_engine"):
+                    engine = create_engine(
+                        settings.DATABASE_URL,
+                        **engine_options(settings.DATABASE_URL, sync_pool_metrics)
+                    )
+                    instrument_engine(engine, sync_pool_metrics)
+                    instrument_queries(engine)
+                    _session_factory.configure(bind=engine)
+                _engine = engine
+    return _engine
+
+def get_async_engine():
+    """Async engine used by the API"""
+    global _async_engine
+    if _async_engine is None:
+        with _engine_lock:
+            if _async_engine is None:
+                with startup_report.phase("db_async_engine"):
+                    async_database_url = settings.ASYNC_DATABASE_URL or to_async_url(settings.DATABASE_URL)
+                    engine = create_async_engine(
+                        async_database_url,
+                        **engine_options(async_database_url, async_pool_metrics, async_=True)
+                    )
+                    instrument_engine(engine.sync_engine, async_pool_metrics)
+                    instrument_queries(engine.sync_engine)
+                    _async_session_factory.configure(bind=engine)
+                _async_engine = engine
+    return _async_engine
+
+# Called like the sessionmakers they wrap, creating the engine first if needed
+def SessionLocal(**kw) -> Session:
+    get_engine()
+    return _session_factory(**kw)
+
+def AsyncSessionLocal(**kw) -> AsyncSession:
+    get_async_engine()
+    return _async_session_factory(**kw)
+
+async def dispose_engines():
+    """Close pooled connections; the engines are rebuilt if used again"""
+    global _engine, _async_engine
+    with _engine_lock:
+        engine, async_engine, _engine, _async_engine = _engine, _async_engine, None, None
+    if async_engine is not None:
+        await async_engine.dispose()
+    if engine is not None:
+        engine.dispose()
+
+def pool_stats() -> dict:
+    return {
+        "sync": sync_pool_metrics.stats(_engine.pool if _engine is not None else None),
+        "async": async_pool_metrics.stats(_async_engine.sync_engine.pool if _async_engine is not None else None),
+    }
 
 Base = declarative_base()
 
@@ -14,4 +137,8 @@ def get_db():
     try:
         yield db
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
+
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
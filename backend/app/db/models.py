@@ -1,12 +1,12 @@
 # models.py
-from sqlalchemy import Column, Integer, String, Float, DateTime, JSON, ForeignKey
+from sqlalchemy import Column, Integer, String, Float, Date, DateTime, JSON, ForeignKey, Index, UniqueConstraint
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import relationship
 from datetime import datetime
-from app.db.database import  Base,engine
+from app.db.database import Base
 
+# The schema is created and changed by migrations (backend/migrations)
 
-Base.metadata.create_all(bind=engine)
 class User(Base):
     __tablename__ = "users"
     
@@ -16,6 +16,7 @@ class User(Base):
     name = Column(String)
     xp = Column(Integer, default=0)
     streak = Column(Integer, default=0)
+    last_activity_date = Column(Date)  # UTC day of the latest attempt, drives the streak
     created_at = Column(DateTime, default=datetime.utcnow)
     
     attempts = relationship("Attempt", back_populates="user")
@@ -23,6 +24,10 @@ class User(Base):
 
 class Lesson(Base):
     __tablename__ = "lessons"
+    __table_args__ = (
+        # Natural key used by app/commands/import_catalog.py
+        UniqueConstraint("language", "level", "title", name="uq_lessons_language_level_title"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     language = Column(String)  # yoruba, igbo, hausa, english
@@ -34,6 +39,9 @@ class Lesson(Base):
 
 class UserPreferences(Base):
     __tablename__ = "user_preferences"
+    __table_args__ = (
+        UniqueConstraint("user_id", name="uq_user_preferences_user_id"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"))
@@ -45,11 +53,15 @@ class UserPreferences(Base):
 
 class LessonItem(Base):
     __tablename__ = "lesson_items"
+    __table_args__ = (
+        UniqueConstraint("lesson_id", "text", name="uq_lesson_items_lesson_id_text"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     lesson_id = Column(Integer, ForeignKey("lessons.id"))
     text = Column(String)  # target phrase
     expected_answer = Column(String)  # NEW: expected pronunciation/response
+    normalized_answer = Column(String)  # normalize_text(expected_answer or text), set on import
     audio_url = Column(String)
     hint = Column(String)
     
@@ -59,6 +71,9 @@ class LessonItem(Base):
 
 class Attempt(Base):
     __tablename__ = "attempts"
+    __table_args__ = (
+        Index("ix_attempts_user_id_created_at", "user_id", "created_at"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"))
@@ -73,11 +88,44 @@ class Attempt(Base):
 
 class Flashcard(Base):
     __tablename__ = "flashcards"
+    __table_args__ = (
+        UniqueConstraint("user_id", "text", name="uq_flashcards_user_id_text"),
+        Index("ix_flashcards_user_id_due_at", "user_id", "due_at"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"))
-    text = Column(String)
+    lesson_item_id = Column(Integer, ForeignKey("lesson_items.id"))  # where the word was last missed
+    text = Column(String)  # normalized target word
     times_wrong = Column(Integer, default=0)
     last_seen = Column(DateTime, default=datetime.utcnow)
+    # SM-2 schedule (app/services/flashcards.py)
+    due_at = Column(DateTime, default=datetime.utcnow)
+    interval_days = Column(Float, default=0.0)
+    ease = Column(Float, default=2.5)
+    repetitions = Column(Integer, default=0)
     
     user = relationship("User", back_populates="flashcards")
+
+
+class ItemProgress(Base):
+    """Running totals per (user, lesson item), kept by app/services/progress.py"""
+    __tablename__ = "item_progress"
+
+    user_id = Column(Integer, ForeignKey("users.id"), primary_key=True)
+    lesson_item_id = Column(Integer, ForeignKey("lesson_items.id"), primary_key=True)
+    attempts = Column(Integer, nullable=False, default=0)
+    total_score = Column(Float, nullable=False, default=0.0)
+    best_score = Column(Float)
+    last_score = Column(Float)
+    last_attempt_at = Column(DateTime)
+
+class DailyProgress(Base):
+    """Running totals per (user, UTC day)"""
+    __tablename__ = "daily_progress"
+
+    user_id = Column(Integer, ForeignKey("users.id"), primary_key=True)
+    day = Column(Date, primary_key=True)
+    attempts = Column(Integer, nullable=False, default=0)
+    total_score = Column(Float, nullable=False, default=0.0)
+    xp = Column(Integer, nullable=False, default=0)
@@ -0,0 +1,127 @@
+# app/db/pool.py
+import bisect
+import threading
+import time
+from typing import Any, Dict
+
+from sqlalchemy import event
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+
+from app.core.metrics import record_span
+
+# Upper bounds (ms) of the checkout wait-time buckets
+WAIT_BUCKETS_MS = (1, 5, 10, 25, 50, 100, 250, 500, 1000, 5000)
+
+
+class PoolMetrics:
+    """Checkout wait-time and occupancy counters for one connection pool"""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.checkouts = 0
+        self.timeouts = 0
+        self.wait_total_ms = 0.0
+        self.wait_max_ms = 0.0
+        self.wait_buckets = [0] * (len(WAIT_BUCKETS_MS) + 1)
+        self.in_use = 0
+        self.in_use_peak = 0
+        self.hold_total_ms = 0.0
+        self.hold_max_ms = 0.0
+        self.checkins = 0
+        self.connects = 0
+        self._lock = threading.Lock()
+
+    def record_wait(self, wait_ms: float, timed_out: bool = False):
+        with self._lock:
+            if timed_out:
+                self.timeouts += 1
+            else:
+                self.checkouts += 1
+            self.wait_total_ms += wait_ms
+            self.wait_max_ms = max(self.wait_max_ms, wait_ms)
+            self.wait_buckets[bisect.bisect_left(WAIT_BUCKETS_MS, wait_ms)] += 1
+
+    def on_checkout(self, dbapi_connection, connection_record, connection_proxy):
+        connection_record.info["checked_out_at"] = time.perf_counter()
+        with self._lock:
+            self.in_use += 1
+            self.in_use_peak = max(self.in_use_peak, self.in_use)
+
+    def on_checkin(self, dbapi_connection, connection_record):
+        # How long a session kept the connection, from checkout to return
+        checked_out_at = connection_record.info.pop("checked_out_at", None)
+        held = time.perf_counter() - checked_out_at if checked_out_at is not None else None
+        with self._lock:
+            self.in_use = max(self.in_use - 1, 0)
+            if held is not None:
+                self.checkins += 1
+                self.hold_total_ms += held * 1000
+                self.hold_max_ms = max(self.hold_max_ms, held * 1000)
+        if held is not None:
+            record_span("db.connection_held", held)
+
+    def on_connect(self, *args):
+        with self._lock:
+            self.connects += 1
+
+    def cumulative_buckets(self) -> Dict[str, int]:
+        buckets, running = {}, 0
+        for bound, count in zip(WAIT_BUCKETS_MS + ("inf",), self.wait_buckets):
+            running += count
+            buckets[f"le_{bound}"] = running
+        return buckets
+
+    def stats(self, pool=None) -> Dict[str, Any]:
+        waits = self.checkouts + self.timeouts
+        stats = {
+            "in_use": self.in_use,
+            "in_use_peak": self.in_use_peak,
+            "checkouts": self.checkouts,
+            "timeouts": self.timeouts,
+            "connects": self.connects,
+            "wait_avg_ms": round(self.wait_total_ms / waits, 3) if waits else 0.0,
+            "wait_max_ms": round(self.wait_max_ms, 3),
+            "hold_avg_ms": round(self.hold_total_ms / self.checkins, 3) if self.checkins else 0.0,
+            "hold_max_ms": round(self.hold_max_ms, 3),
+            "wait_buckets_ms": self.cumulative_buckets(),
+        }
+        if isinstance(pool, QueuePool):
+            stats.update({
+                "size": pool.size(),
+                "checked_in": pool.checkedin(),
+                "overflow": pool.overflow(),
+            })
+        return stats
+
+
+class _TimedPoolMixin:
+    """Times every checkout, including waiting for a free slot"""
+
+    metrics: PoolMetrics
+
+    def connect(self):
+        start = time.perf_counter()
+        try:
+            connection = super().connect()
+        except PoolTimeoutError:
+            self.metrics.record_wait((time.perf_counter() - start) * 1000, timed_out=True)
+            raise
+        self.metrics.record_wait((time.perf_counter() - start) * 1000)
+        return connection
+
+
+def timed_pool_class(metrics: PoolMetrics, async_: bool = False):
+    """Build a QueuePool subclass bound to ``metrics``.
+
+    The metrics live on the class so they survive ``Pool.recreate()``.
+    """
+    base = AsyncAdaptedQueuePool if async_ else QueuePool
+    return type(f"Timed{base.__name__}", (_TimedPoolMixin, base), {"metrics": metrics})
+
+
+def instrument_engine(engine, metrics: PoolMetrics):
+    """Track connections in use on ``engine`` (sync engine of an AsyncEngine)"""
+    event.listen(engine, "checkout", metrics.on_checkout)
+    event.listen(engine, "checkin", metrics.on_checkin)
+    event.listen(engine, "connect", metrics.on_connect)
@@ -0,0 +1,36 @@
+# app/db/upsert.py
+from typing import Callable, Dict, Iterable, List, Optional, Union
+
+from sqlalchemy import Table
+from sqlalchemy.dialects import postgresql, sqlite
+
+# Both dialects spell it INSERT ... ON CONFLICT (...) DO UPDATE
+INSERTS = {
+    "postgresql": postgresql.insert,
+    "sqlite": sqlite.insert,
+}
+
+
+def upsert(dialect_name: str, table: Table, values: Union[Dict, List[Dict]],
+           index_elements: Iterable[str], set_: Callable[..., Dict]):
+    """INSERT ... ON CONFLICT (``index_elements``) DO UPDATE SET ``set_``.
+
+    ``set_`` is a function of the statement's ``excluded`` row so updates can
+    merge rather than overwrite, e.g. ``lambda excluded: {"n": table.c.n + excluded.n}``.
+    """
+    stmt = _insert(dialect_name, table).values(values)
+    return stmt.on_conflict_do_update(index_elements=list(index_elements), set_=set_(stmt.excluded))
+
+def insert_missing(dialect_name: str, table: Table, values: Union[Dict, List[Dict]],
+                   index_elements: Optional[Iterable[str]] = None):
+    """INSERT ... ON CONFLICT (``index_elements``) DO NOTHING.
+
+    Without ``index_elements`` a row conflicting on any unique constraint is skipped.
+    """
+    stmt = _insert(dialect_name, table).values(values)
+    return stmt.on_conflict_do_nothing(index_elements=list(index_elements) if index_elements else None)
+
+def _insert(dialect_name: str, table: Table):
+    if dialect_name not in INSERTS:
+        raise NotImplementedError(f"No upsert for the {dialect_name} dialect")
+    return INSERTS[dialect_name](table)
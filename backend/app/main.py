@@ -1,17 +1,73 @@
 # app/main.py
-from fastapi import FastAPI
+import time
+# Everything below, down to the routers, counts as import time in the startup report
+_import_started = time.perf_counter()
+
+import asyncio
+import logging
+from contextlib import asynccontextmanager
+from fastapi import Depends, FastAPI
+from fastapi.responses import PlainTextResponse
 from fastapi.middleware.cors import CORSMiddleware
-from app.api.endpoints import auth, lessons, transcribe, score, attempts, leaderboard,preference
-from app.db.database import engine, Base
-from app.core.firebase import init_firebase 
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.config import settings
+from app.core.metrics import MetricsMiddleware, registry, render_metrics
+from app.core.middleware import UploadSizeLimitMiddleware
+from app.api.endpoints import auth, lessons, transcribe, score, attempts, leaderboard, preference, practice, flashcards, progress
+from app.core.startup import startup_report
+from app.db.database import dispose_engines, get_async_db, get_async_engine, pool_stats
+from app.core.firebase import get_firebase_app
+from app.services.attempt_buffer import current_attempt_buffer, shutdown_attempt_buffer
+from app.services.jobs import current_job_queue, shutdown_job_queue
+from app.services.preprocessing import preprocess_metrics, shutdown_preprocessing
+from app.services.spitch import close_transcription_service, current_transcription_service, get_transcription_service
+from app.services.token_cache import token_cache
+
+logger = logging.getLogger(__name__)
+
+async def _warm_db():
+    async with get_async_engine().connect() as connection:
+        await connection.execute(text("SELECT 1"))
+
+async def _warm_firebase():
+    await asyncio.to_thread(get_firebase_app)
+
+async def _warm_transcription():
+    get_transcription_service()
+
+WARMUPS = {"db": _warm_db, "firebase": _warm_firebase, "transcription": _warm_transcription}
 
-# Create database tables
-Base.metadata.create_all(bind=engine)
 
-# Initialize Firebase
-init_firebase()
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Startup does only what STARTUP_WARMUP / MIGRATE_ON_STARTUP ask for;
+    everything else is created on first use"""
+    start = time.perf_counter()
+    unknown = [name for name in settings.STARTUP_WARMUP if name not in WARMUPS]
+    if unknown:
+        raise ValueError(f"Unknown STARTUP_WARMUP entries: {', '.join(unknown)}")
+    if settings.MIGRATE_ON_STARTUP:
+        from app.commands.migrate import migrate
+        with startup_report.phase("migrate"):
+            await asyncio.to_thread(migrate)
+    for name in settings.STARTUP_WARMUP:
+        with startup_report.phase(f"warmup.{name}"):
+            await WARMUPS[name]()
+    startup_report.started(time.perf_counter() - start)
+    logger.info("Startup: import %.0f ms, lifespan %.0f ms", startup_report.import_ms, startup_report.lifespan_ms)
 
-app = FastAPI(title="Language Learning API", version="1.0.0")
+    yield
+
+    # Flush buffered attempts while the database is still available
+    await shutdown_attempt_buffer()
+    await shutdown_job_queue()
+    await close_transcription_service()
+    shutdown_preprocessing()
+    await dispose_engines()
+
+
+app = FastAPI(title="Language Learning API", version="1.0.0", lifespan=lifespan)
 
 # CORS middleware
 app.add_middleware(
@@ -20,7 +76,25 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["ETag", "X-Next-Cursor"],
 )
+# Leave room for the multipart framing around the clip
+app.add_middleware(
+    UploadSizeLimitMiddleware,
+    max_bytes=settings.AUDIO_MAX_BYTES + 64 * 1024,
+    path_prefixes=["/transcribe", "/practice"],
+)
+# Outermost, so request timings include the other middleware
+app.add_middleware(MetricsMiddleware)
+
+# Existing counters, exported alongside the histograms at /metrics
+registry.add_stats("token_cache", token_cache.stats)
+registry.add_stats("db_pool", pool_stats, label="pool")
+registry.add_stats("transcription_cache", lambda: _transcription_cache_stats())
+registry.add_stats("audio_preprocessing", preprocess_metrics.stats)
+registry.add_stats("transcription_jobs", lambda: _transcription_job_stats())
+registry.add_stats("startup", startup_report.stats)
+registry.add_stats("attempt_buffer", lambda: _attempt_buffer_stats())
 
 # Include routers
 # app.include_router(auth.router, prefix="/auth", tags=["auth"])
@@ -30,6 +104,9 @@ app.include_router(preference.router, prefix="/preference", tags=["preference"])
 app.include_router(transcribe.router, prefix="/transcribe", tags=["transcribe"])
 app.include_router(score.router, prefix="/score", tags=["score"])
 app.include_router(attempts.router, prefix="/attempts", tags=["attempts"])
+app.include_router(practice.router, prefix="/practice", tags=["practice"])
+app.include_router(flashcards.router, prefix="/flashcards", tags=["flashcards"])
+app.include_router(progress.router, prefix="/progress", tags=["progress"])
 app.include_router(leaderboard.router, prefix="/leaderboard", tags=["leaderboard"])
 
 
@@ -40,3 +117,63 @@ async def root():
 @app.get("/health")
 async def health_check():
     return {"status": "healthy"}
+
+@app.get("/health/db")
+async def database_health(db: AsyncSession = Depends(get_async_db)):
+    start = time.perf_counter()
+    try:
+        await db.execute(text("SELECT 1"))
+        status = "healthy"
+    except Exception:
+        status = "unhealthy"
+    return {
+        "status": status,
+        "latency_ms": round((time.perf_counter() - start) * 1000, 3),
+        "pools": pool_stats(),
+    }
+
+def _transcription_cache_stats():
+    # Don't create the client just to report on it
+    service = current_transcription_service()
+    if service is None:
+        return {"enabled": settings.TRANSCRIPT_CACHE_BACKEND not in ("", "none"), "started": False}
+    cache = service.cache
+    return {"enabled": cache is not None, "started": True, **(cache.stats() if cache else {})}
+
+@app.get("/health/transcription-cache")
+async def transcription_cache_health():
+    return _transcription_cache_stats()
+
+@app.get("/health/audio-preprocessing")
+async def audio_preprocessing_health():
+    return preprocess_metrics.stats()
+
+@app.get("/metrics", response_class=PlainTextResponse)
+async def metrics():
+    """Prometheus text exposition: request and span histograms plus service counters"""
+    return PlainTextResponse(render_metrics(), media_type="text/plain; version=0.0.4")
+
+def _transcription_job_stats():
+    queue = current_job_queue()
+    return queue.stats() if queue is not None else {"started": False}
+
+@app.get("/health/transcription-jobs")
+async def transcription_jobs_health():
+    return _transcription_job_stats()
+
+def _attempt_buffer_stats():
+    buffer = current_attempt_buffer()
+    stats = buffer.stats() if buffer is not None else {"started": False}
+    return {"mode": settings.ATTEMPT_INGEST_MODE, **stats}
+
+@app.get("/health/attempt-buffer")
+async def attempt_buffer_health():
+    return _attempt_buffer_stats()
+
+@app.get("/health/startup")
+async def startup_health():
+    """Import and lifespan time of this worker, and when each lazy resource was first created"""
+    return startup_report.stats()
+
+
+startup_report.imported(time.perf_counter() - _import_started)
@@ -0,0 +1,334 @@
+# app/services/attempt_buffer.py
+import asyncio
+import time
+from datetime import datetime
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Tuple
+
+from fastapi import HTTPException
+from sqlalchemy import insert, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.metrics import record_span
+from app.db.database import AsyncSessionLocal
+from app.db.models import Attempt, User
+from app.services.attempts import progress_update, record_attempt
+from app.services.flashcards import schedule_from_feedback
+from app.services.progress import daily_progress_upsert, item_progress_upsert
+from app.services.ranking import leaderboard_index
+
+ACK_MODES = ("flush", "enqueue")
+
+
+class PendingAttempt(NamedTuple):
+    user_id: int
+    user_name: Optional[str]
+    lesson_item_id: int
+    transcript: str
+    score: float
+    word_feedback: List[Dict[str, Any]]
+    created_at: datetime
+    done: Optional[asyncio.Future]
+
+
+class AttemptBuffer:
+    """Write-behind buffer that stores attempts in batches.
+
+    Attempts are flushed ``max_rows`` at a time, or once the oldest has
+    waited ``flush_ms``. A flush is one transaction and one commit:
+    - one multi-row INSERT into attempts
+    - one UPDATE per (user, day) with the XP summed over the batch
+    - one upsert per rollup table
+    - the flashcard updates
+
+    With ``ack="flush"`` callers wait for the commit and get the user's
+    (xp, streak) after it. With ``ack="enqueue"`` they return at once;
+    attempts still buffered are lost if the process dies, and failures only
+    show up in ``stats()``. A failed batch is retried one attempt at a time,
+    so a single bad row doesn't fail its neighbours. ``submit`` answers 429
+    once ``max_pending`` attempts are waiting.
+    """
+
+    def __init__(
+        self,
+        session_factory: Callable[[], AsyncSession] = AsyncSessionLocal,
+        ack: str = "flush",
+        flush_ms: float = 50,
+        max_rows: int = 200,
+        max_pending: int = 5000,
+    ):
+        if ack not in ACK_MODES:
+            raise ValueError(f"Unknown ATTEMPT_BUFFER_ACK: {ack}")
+        self.session_factory = session_factory
+        self.ack = ack
+        self.flush_interval = flush_ms / 1000
+        self.max_rows = max_rows
+        self.max_pending = max_pending
+        self._pending: List[PendingAttempt] = []
+        self._has_rows = asyncio.Event()
+        self._full = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+        self._closed = False
+
+        self.enqueued = 0
+        self.rejected = 0
+        self.flushes = 0
+        self.rows_flushed = 0
+        self.isolated_flushes = 0
+        self.failed = 0
+        self.flush_total_ms = 0.0
+        self.flush_max_ms = 0.0
+        self.last_error: Optional[str] = None
+
+    async def submit(
+        self,
+        user_id: int,
+        user_name: Optional[str],
+        lesson_item_id: int,
+        transcript: str,
+        score: float,
+        word_feedback: List[Dict[str, Any]],
+    ) -> Tuple[Optional[int], Optional[int]]:
+        """Buffer an attempt; (xp, streak) after its flush, or (None, None) with ack on enqueue"""
+        if self._closed:
+            raise HTTPException(status_code=503, detail="Server is shutting down, retry shortly")
+        if len(self._pending) >= self.max_pending:
+            self.rejected += 1
+            raise HTTPException(
+                status_code=429,
+                detail="Too many attempts waiting to be saved, retry shortly",
+                headers={"Retry-After": "1"},
+            )
+        self._start()
+
+        done = asyncio.get_running_loop().create_future() if self.ack == "flush" else None
+        self._pending.append(PendingAttempt(
+            user_id, user_name, lesson_item_id, transcript, score, word_feedback, datetime.utcnow(), done
+        ))
+        self.enqueued += 1
+        self._has_rows.set()
+        if len(self._pending) >= self.max_rows:
+            self._full.set()
+        if done is None:
+            return None, None
+        # The attempt is saved even if this request is cancelled meanwhile
+        return await asyncio.shield(done)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "ack": self.ack,
+            "pending": len(self._pending),
+            "max_pending": self.max_pending,
+            "max_rows": self.max_rows,
+            "flush_ms": self.flush_interval * 1000,
+            "enqueued": self.enqueued,
+            "rejected": self.rejected,
+            "flushes": self.flushes,
+            "rows_flushed": self.rows_flushed,
+            "avg_batch_rows": round(self.rows_flushed / self.flushes, 1) if self.flushes else 0.0,
+            "flush_avg_ms": round(self.flush_total_ms / self.flushes, 3) if self.flushes else 0.0,
+            "flush_max_ms": round(self.flush_max_ms, 3),
+            "isolated_flushes": self.isolated_flushes,
+            "failed": self.failed,
+            "last_error": self.last_error,
+        }
+
+    async def shutdown(self):
+        """Stop taking attempts and flush everything already buffered"""
+        self._closed = True
+        self._has_rows.set()
+        self._full.set()
+        if self._task is not None:
+            await self._task
+            self._task = None
+
+    def _start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def _run(self):
+        while True:
+            if not self._pending:
+                if self._closed:
+                    return
+                self._has_rows.clear()
+                await self._has_rows.wait()
+                continue
+            # Wait for a full batch, but no longer than flush_ms after the oldest row
+            wait = self._pending[0].created_at.timestamp() + self.flush_interval - datetime.utcnow().timestamp()
+            if len(self._pending) < self.max_rows and not self._closed and wait > 0:
+                self._full.clear()
+                try:
+                    await asyncio.wait_for(self._full.wait(), wait)
+                except asyncio.TimeoutError:
+                    pass
+            batch, self._pending = self._pending[:self.max_rows], self._pending[self.max_rows:]
+            await self._flush(batch)
+
+    async def _flush(self, batch: List[PendingAttempt]):
+        start = time.perf_counter()
+        try:
+            totals = await self._write(batch)
+            results: List[Any] = [totals[attempt.user_id] for attempt in batch]
+        except Exception as e:
+            self.last_error = f"{type(e).__name__}: {e}"
+            self.isolated_flushes += 1
+            results = await self._write_each(batch)
+        elapsed = time.perf_counter() - start
+        record_span("attempt_buffer.flush", elapsed)
+        self.flushes += 1
+        self.rows_flushed += len(batch)
+        self.flush_total_ms += elapsed * 1000
+        self.flush_max_ms = max(self.flush_max_ms, elapsed * 1000)
+
+        for attempt, result in zip(batch, results):
+            if isinstance(result, Exception):
+                self.failed += 1
+                if attempt.done is not None and not attempt.done.done():
+                    attempt.done.set_exception(result)
+                continue
+            xp, streak = result
+            leaderboard_index.update_user(attempt.user_id, xp, streak, attempt.user_name)
+            if attempt.done is not None and not attempt.done.done():
+                attempt.done.set_result((xp, streak))
+
+    async def _write(self, batch: List[PendingAttempt]) -> Dict[int, Tuple[int, int]]:
+        """Store the batch in one transaction; returns each user's (xp, streak) after it"""
+        async with self.session_factory() as db:
+            await db.execute(insert(Attempt), [
+                {
+                    "user_id": attempt.user_id,
+                    "lesson_item_id": attempt.lesson_item_id,
+                    "transcript": attempt.transcript,
+                    "score": attempt.score,
+                    "word_feedback": attempt.word_feedback,
+                    "created_at": attempt.created_at,
+                }
+                for attempt in batch
+            ])
+
+            # XP summed per (user, day), applied in day order so the streak
+            # advances as it would have attempt by attempt
+            xp_deltas: Dict[Tuple[int, Any], int] = {}
+            for attempt in batch:
+                key = (attempt.user_id, attempt.created_at.date())
+                xp_deltas[key] = xp_deltas.get(key, 0) + int(attempt.score)
+            totals: Dict[int, Tuple[int, int]] = {}
+            for (user_id, day), xp_gained in sorted(xp_deltas.items(), key=lambda entry: entry[0][1]):
+                result = await db.execute(
+                    update(User)
+                    .where(User.id == user_id)
+                    .values(**progress_update(xp_gained, day))
+                    .returning(User.xp, User.streak)
+                    .execution_options(synchronize_session=False)
+                )
+                totals[user_id] = tuple(result.one())
+
+            item_rows, day_rows = _progress_rows(batch)
+            dialect_name = db.get_bind().dialect.name
+            await db.execute(item_progress_upsert(dialect_name, item_rows))
+            await db.execute(daily_progress_upsert(dialect_name, day_rows))
+
+            for attempt in batch:
+                await schedule_from_feedback(
+                    db, attempt.user_id, attempt.lesson_item_id, attempt.word_feedback, attempt.created_at
+                )
+            await db.commit()
+        return totals
+
+    async def _write_each(self, batch: List[PendingAttempt]) -> List[Any]:
+        results: List[Any] = []
+        for attempt in batch:
+            try:
+                async with self.session_factory() as db:
+                    results.append(await record_attempt(
+                        db, attempt.user_id, attempt.lesson_item_id, attempt.transcript,
+                        attempt.score, attempt.word_feedback, now=attempt.created_at,
+                    ))
+            except Exception as e:
+                self.last_error = f"{type(e).__name__}: {e}"
+                results.append(e)
+        return results
+
+
+def _progress_rows(batch: List[PendingAttempt]) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+    """The batch folded into one item_progress and one daily_progress row per key"""
+    items: Dict[Tuple[int, int], Dict[str, Any]] = {}
+    days: Dict[Tuple[int, Any], Dict[str, Any]] = {}
+    for attempt in batch:
+        score = attempt.score
+        item = items.get((attempt.user_id, attempt.lesson_item_id))
+        if item is None:
+            items[(attempt.user_id, attempt.lesson_item_id)] = {
+                "user_id": attempt.user_id,
+                "lesson_item_id": attempt.lesson_item_id,
+                "attempts": 1,
+                "total_score": score,
+                "best_score": score,
+                "last_score": score,
+                "last_attempt_at": attempt.created_at,
+            }
+        else:
+            item["attempts"] += 1
+            item["total_score"] += score
+            item["best_score"] = max(item["best_score"], score)
+            if attempt.created_at >= item["last_attempt_at"]:
+                item["last_score"] = score
+                item["last_attempt_at"] = attempt.created_at
+
+        day = days.setdefault((attempt.user_id, attempt.created_at.date()), {
+            "user_id": attempt.user_id, "day": attempt.created_at.date(),
+            "attempts": 0, "total_score": 0.0, "xp": 0,
+        })
+        day["attempts"] += 1
+        day["total_score"] += score
+        day["xp"] += int(score)
+    return list(items.values()), list(days.values())
+
+
+_buffer: Optional[AttemptBuffer] = None
+
+def get_attempt_buffer() -> AttemptBuffer:
+    global _buffer
+    if _buffer is None:
+        _buffer = AttemptBuffer(
+            ack=settings.ATTEMPT_BUFFER_ACK,
+            flush_ms=settings.ATTEMPT_BUFFER_FLUSH_MS,
+            max_rows=settings.ATTEMPT_BUFFER_MAX_ROWS,
+            max_pending=settings.ATTEMPT_BUFFER_MAX_PENDING,
+        )
+    return _buffer
+
+def current_attempt_buffer() -> Optional[AttemptBuffer]:
+    """The buffer if an attempt has been buffered already; never creates it"""
+    return _buffer
+
+async def shutdown_attempt_buffer():
+    global _buffer
+    if _buffer is not None:
+        await _buffer.shutdown()
+        _buffer = None
+
+
+async def ingest_attempt(
+    db: AsyncSession,
+    user: User,
+    lesson_item_id: int,
+    transcript: str,
+    score: float,
+    word_feedback: List[Dict[str, Any]],
+) -> Tuple[Optional[int], Optional[int]]:
+    """Store an attempt as ATTEMPT_INGEST_MODE says and keep the leaderboard current.
+
+    Returns the user's (xp, streak), or (None, None) when buffered with ack
+    on enqueue.
+    """
+    if settings.ATTEMPT_INGEST_MODE == "buffered":
+        return await get_attempt_buffer().submit(
+            user.id, user.name, lesson_item_id, transcript, score, word_feedback
+        )
+    if settings.ATTEMPT_INGEST_MODE != "direct":
+        raise ValueError(f"Unknown ATTEMPT_INGEST_MODE: {settings.ATTEMPT_INGEST_MODE}")
+    xp, streak = await record_attempt(db, user.id, lesson_item_id, transcript, score, word_feedback)
+    leaderboard_index.update_user(user.id, xp, streak, user.name)
+    return xp, streak
@@ -0,0 +1,66 @@
+# app/services/attempts.py
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy import case, func, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.models import Attempt, User
+from app.services.flashcards import schedule_from_feedback
+from app.services.progress import record_progress
+
+
+def progress_update(xp_gained: int, today):
+    """Column values that add XP and advance the streak in one UPDATE.
+
+    The streak is unchanged for a second attempt on the same day, grows by one
+    when the previous attempt was yesterday and restarts at 1 otherwise.
+    """
+    return {
+        "xp": func.coalesce(User.xp, 0) + xp_gained,
+        "streak": case(
+            (User.last_activity_date == today, func.coalesce(User.streak, 1)),
+            (User.last_activity_date == today - timedelta(days=1), func.coalesce(User.streak, 0) + 1),
+            else_=1,
+        ),
+        "last_activity_date": today,
+    }
+
+async def record_attempt(
+    db: AsyncSession,
+    user_id: int,
+    lesson_item_id: int,
+    transcript: str,
+    score: float,
+    word_feedback: List[Dict[str, Any]],
+    now: Optional[datetime] = None,
+) -> Tuple[int, int]:
+    """Insert an attempt and update the user's XP/streak; returns (xp, streak).
+
+    Costs one INSERT, one UPDATE ... RETURNING, two rollup upserts and the
+    flashcard lookup and writes for missed words, and commits. The counters
+    are computed by the database, so concurrent submissions from the same
+    user cannot overwrite each other.
+    """
+    now = now or datetime.utcnow()
+    db.add(Attempt(
+        user_id=user_id,
+        lesson_item_id=lesson_item_id,
+        transcript=transcript,
+        score=score,
+        word_feedback=word_feedback,
+        created_at=now
+    ))
+
+    result = await db.execute(
+        update(User)
+        .where(User.id == user_id)
+        .values(**progress_update(int(score), now.date()))
+        .returning(User.xp, User.streak)
+        .execution_options(synchronize_session=False)
+    )
+    xp, streak = result.one()
+    await record_progress(db, user_id, lesson_item_id, score, now)
+    await schedule_from_feedback(db, user_id, lesson_item_id, word_feedback, now)
+    await db.commit()
+    return xp, streak
@@ -0,0 +1,108 @@
+# app/services/audio.py
+import hashlib
+import struct
+from typing import BinaryIO, Optional
+
+from fastapi import HTTPException, UploadFile
+
+CHUNK_SIZE = 64 * 1024
+
+# What browsers' MediaRecorder and common recorders produce
+ALLOWED_AUDIO_TYPES = {
+    "audio/wav", "audio/x-wav", "audio/wave", "audio/vnd.wave",
+    "audio/webm", "video/webm",
+    "audio/ogg", "audio/opus",
+    "audio/mpeg", "audio/mp3",
+    "audio/mp4", "audio/m4a", "audio/x-m4a", "audio/aac",
+    "audio/flac", "audio/x-flac",
+}
+
+
+class AudioUpload:
+    """A validated upload, still on Starlette's spooled temp file.
+
+    The bytes are never copied into memory: they were hashed chunk by chunk
+    and ``content`` hands the rewound file object to the upstream request,
+    which streams it.
+    """
+
+    def __init__(self, upload: UploadFile, content_type: str, size: int, sha256: str,
+                 duration_seconds: Optional[float]):
+        self.upload = upload
+        self.filename = upload.filename or "audio"
+        self.content_type = content_type
+        self.size = size
+        self.sha256 = sha256
+        self.duration_seconds = duration_seconds
+
+    @property
+    def file(self) -> BinaryIO:
+        return self.upload.file
+
+    @property
+    def content(self):
+        self.upload.file.seek(0)
+        return (self.filename, self.upload.file, self.content_type)
+
+
+def base_content_type(content_type: Optional[str]) -> str:
+    return (content_type or "").split(";")[0].strip().lower()
+
+async def receive_audio(upload: UploadFile, max_bytes: int, max_seconds: float) -> AudioUpload:
+    """Validate an uploaded clip's type, size and (for WAV) duration"""
+    content_type = base_content_type(upload.content_type)
+    if content_type not in ALLOWED_AUDIO_TYPES:
+        raise HTTPException(status_code=415, detail=f"Unsupported audio type: {upload.content_type}")
+
+    digest = hashlib.sha256()
+    size = 0
+    await upload.seek(0)
+    while True:
+        chunk = await upload.read(CHUNK_SIZE)
+        if not chunk:
+            break
+        size += len(chunk)
+        if size > max_bytes:
+            raise HTTPException(status_code=413, detail=f"Audio exceeds {max_bytes} bytes")
+        digest.update(chunk)
+    if size == 0:
+        raise HTTPException(status_code=400, detail="Audio file is empty")
+
+    duration = None
+    if content_type in ("audio/wav", "audio/x-wav", "audio/wave", "audio/vnd.wave"):
+        upload.file.seek(0)
+        duration = wav_duration_seconds(upload.file, size)
+        if duration is not None and duration > max_seconds:
+            raise HTTPException(
+                status_code=413,
+                detail=f"Audio is {duration:.1f}s long, the limit is {max_seconds:g}s"
+            )
+
+    upload.file.seek(0)
+    return AudioUpload(upload, content_type, size, digest.hexdigest(), duration)
+
+def wav_duration_seconds(file: BinaryIO, file_size: int) -> Optional[float]:
+    """Duration from a RIFF/WAVE header, or None if it can't be read"""
+    header = file.read(12)
+    if len(header) < 12 or header[:4] != b"RIFF" or header[8:12] != b"WAVE":
+        return None
+
+    byte_rate = None
+    while True:
+        chunk_header = file.read(8)
+        if len(chunk_header) < 8:
+            return None
+        chunk_id, chunk_size = chunk_header[:4], struct.unpack("<I", chunk_header[4:])[0]
+        if chunk_id == b"fmt ":
+            fmt = file.read(chunk_size + (chunk_size & 1))
+            if len(fmt) < 12:
+                return None
+            byte_rate = struct.unpack("<I", fmt[8:12])[0]
+        elif chunk_id == b"data":
+            if not byte_rate:
+                return None
+            # Streaming recorders leave the size at 0 or 0xFFFFFFFF
+            data_size = min(chunk_size, file_size - file.tell()) if chunk_size else file_size - file.tell()
+            return data_size / byte_rate
+        else:
+            file.seek(chunk_size + (chunk_size & 1), 1)
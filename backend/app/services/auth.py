@@ -1,15 +1,30 @@
 # app/services/auth.py
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from app.db.database import get_db
+from app.core.config import settings
+from app.db.database import get_async_db
 from app.db.models import User
-from app.core.firebase import verify_token
-from sqlalchemy.orm import Session
+from app.db.upsert import insert_missing
+from app.core.firebase import get_firebase_app, verify_token
+from app.core.metrics import span
+from app.services.ranking import leaderboard_index
+from app.services.token_cache import token_cache
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import make_transient_to_detached
 from firebase_admin import auth
 security = HTTPBearer()
 
 
 def verify_token(token: str):
+    try:
+        get_firebase_app()
+    except ValueError:
+        # Missing or malformed FIREBASE_CREDENTIALS_JSON: a server problem, not a bad token
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Authentication is not configured",
+        )
     try:
         return auth.verify_id_token(token)
     except Exception:
@@ -19,24 +34,76 @@ def verify_token(token: str):
             headers={"WWW-Authenticate": "Bearer"},
         )
 
+def _user_snapshot(user: User) -> dict:
+    return {column.key: getattr(user, column.key) for column in User.__table__.columns}
+
+def _user_from_snapshot(snapshot: dict) -> User:
+    user = User(**snapshot)
+    # Mark it as a clean, already-persisted row so attaching it costs no SQL
+    make_transient_to_detached(user)
+    return user
+
 async def get_current_user(
     credentials: HTTPAuthorizationCredentials = Depends(security),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
-    decoded_token = verify_token(credentials.credentials)
+    user = await authenticate_token(credentials.credentials, db)
+    # A token-cache miss reads the user; don't keep that transaction (and its pooled
+    # connection) open through slow work such as an upstream transcription
+    await db.commit()
+    return user
+
+async def authenticate_token(token: str, db: AsyncSession) -> User:
+    """Resolve a Firebase ID token to its user, creating the user on first sight"""
+    cached = token_cache.get(token)
+    if cached is not None:
+        user = _user_from_snapshot(cached.user)
+        db.add(user)
+        return user
+
+    with span("verify_token"):
+        decoded_token = verify_token(token)
     firebase_uid = decoded_token["uid"]
 
-    user = db.query(User).filter(User.firebase_uid == firebase_uid).first()
+    result = await db.execute(select(User).where(User.firebase_uid == firebase_uid))
+    user = result.scalars().first()
     if not user:
-        user = User(
-            firebase_uid=firebase_uid,
-            email=decoded_token.get("email"),
-            name=decoded_token.get("name", decoded_token.get("email")),
+        user = await _create_user(db, decoded_token)
+
+    token_cache.put(token, decoded_token, _user_snapshot(user))
+    return user
+
+async def _create_user(db: AsyncSession, decoded_token: dict) -> User:
+    """Insert a new user and return the row.
+
+    A new user's first page load sends several requests at once, each
+    trying to create the row; the insert skips on conflict and every
+    request reads back the one row that won.
+    """
+    firebase_uid = decoded_token["uid"]
+    inserted = await db.execute(insert_missing(db.get_bind().dialect.name, User.__table__, {
+        "firebase_uid": firebase_uid,
+        "email": decoded_token.get("email"),
+        "name": decoded_token.get("name", decoded_token.get("email")),
+    }))
+    await db.commit()
+
+    result = await db.execute(select(User).where(User.firebase_uid == firebase_uid))
+    user = result.scalars().first()
+    if user is None:
+        # Skipped on the email: another Firebase account already has it
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="This email is already linked to another account",
         )
-        db.add(user)
-        db.commit()
-        db.refresh(user)
+    if inserted.rowcount:
+        leaderboard_index.update_user(user.id, user.xp, user.streak, user.name)
+    return user
 
+async def require_admin(user: User = Depends(get_current_user)) -> User:
+    """Only let through users whose Firebase UID is listed in ADMIN_UIDS"""
+    if user.firebase_uid not in settings.ADMIN_UIDS:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Admin access required")
     return user
 
 # async def get_user_by_email_throuh
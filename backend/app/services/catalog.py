@@ -0,0 +1,163 @@
+# app/services/catalog.py
+import asyncio
+import hashlib
+import json
+import time
+from datetime import datetime
+from typing import Dict, NamedTuple, Optional, Tuple
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.db.models import Lesson, LessonItem
+from app.services.spitch import to_spitch_language
+
+
+class LessonEntry(NamedTuple):
+    id: int
+    language: Optional[str]
+    title: Optional[str]
+    level: Optional[str]
+    created_at: Optional[datetime]
+
+
+class LessonItemEntry(NamedTuple):
+    id: int
+    lesson_id: int
+    text: Optional[str]
+    expected_answer: Optional[str]
+    audio_url: Optional[str]
+    hint: Optional[str]
+
+
+class RenderedResponse(NamedTuple):
+    body: bytes
+    etag: str
+
+
+def _render(payload) -> RenderedResponse:
+    body = json.dumps(payload, ensure_ascii=False, separators=(",", ":"), default=_json_default).encode("utf-8")
+    return RenderedResponse(body, '"' + hashlib.sha256(body).hexdigest()[:32] + '"')
+
+def _json_default(value):
+    if isinstance(value, datetime):
+        return value.isoformat()
+    raise TypeError(f"{type(value).__name__} is not JSON serializable")
+
+
+class CatalogSnapshot:
+    """Immutable view of every lesson and lesson item.
+
+    JSON bodies and their ETags are rendered once per distinct query and
+    reused until the snapshot is replaced. Lesson filters are normalized to
+    the languages and levels the catalog has, so arbitrary query strings
+    can't grow the cache: anything unknown shares one empty response.
+    """
+
+    def __init__(self, lessons: Tuple[LessonEntry, ...], items: Tuple[LessonItemEntry, ...]):
+        self.lessons = lessons
+        self.lessons_by_id = {lesson.id: lesson for lesson in lessons}
+        self.items = {item.id: item for item in items}
+        grouped: Dict[int, list] = {}
+        for item in items:
+            grouped.setdefault(item.lesson_id, []).append(item)
+        self.items_by_lesson = {lesson_id: tuple(group) for lesson_id, group in grouped.items()}
+        self.languages = {to_spitch_language(lesson.language) for lesson in lessons if lesson.language}
+        self.levels = {lesson.level.strip().lower() for lesson in lessons if lesson.level}
+        self.loaded_at = time.monotonic()
+        self._rendered: Dict[tuple, RenderedResponse] = {}
+
+    def item_language(self, item_id: int) -> Optional[str]:
+        item = self.items.get(item_id)
+        lesson = self.lessons_by_id.get(item.lesson_id) if item else None
+        return lesson.language if lesson else None
+
+    def lessons_response(self, language: Optional[str] = None, level: Optional[str] = None) -> RenderedResponse:
+        """Lessons filtered by language (name or code, as the leaderboard takes them) and level"""
+        language = to_spitch_language(language) if language else None
+        level = level.strip().lower() if level else None
+        if (language and language not in self.languages) or (level and level not in self.levels):
+            key = ("lessons", "no match")
+            if key not in self._rendered:
+                self._rendered[key] = _render([])
+            return self._rendered[key]
+
+        key = ("lessons", language, level)
+        if key not in self._rendered:
+            self._rendered[key] = _render([
+                lesson._asdict() for lesson in self.lessons
+                if (not language or (lesson.language and to_spitch_language(lesson.language) == language))
+                and (not level or (lesson.level and lesson.level.strip().lower() == level))
+            ])
+        return self._rendered[key]
+
+    def lesson_items_response(self, lesson_id: int) -> Optional[RenderedResponse]:
+        items = self.items_by_lesson.get(lesson_id)
+        if not items:
+            return None
+        key = ("items", lesson_id)
+        if key not in self._rendered:
+            self._rendered[key] = _render([item._asdict() for item in items])
+        return self._rendered[key]
+
+    def lesson_item_response(self, item_id: int) -> Optional[RenderedResponse]:
+        item = self.items.get(item_id)
+        if item is None:
+            return None
+        key = ("item", item_id)
+        if key not in self._rendered:
+            self._rendered[key] = _render(item._asdict())
+        return self._rendered[key]
+
+
+class LessonCatalog:
+    """Process-wide lesson catalog, loaded on first use.
+
+    The catalog only changes when lessons are imported, so it is kept until
+    ``invalidate`` is called (see POST /lessons/reload) or, when
+    CATALOG_REFRESH_SECONDS is set, until it is older than that. Each worker
+    process holds its own copy: a reload only reaches the worker that served
+    it, so multi-worker deployments should set CATALOG_REFRESH_SECONDS (or
+    restart the workers) after an import.
+    """
+
+    def __init__(self, refresh_seconds: int = 0):
+        self.refresh_seconds = refresh_seconds
+        self._snapshot: Optional[CatalogSnapshot] = None
+        self._lock = asyncio.Lock()
+
+    async def get(self, db: AsyncSession) -> CatalogSnapshot:
+        snapshot = self._snapshot
+        if snapshot is None or self._is_stale(snapshot):
+            async with self._lock:
+                snapshot = self._snapshot
+                if snapshot is None or self._is_stale(snapshot):
+                    snapshot = self._snapshot = await self._load(db)
+        return snapshot
+
+    def invalidate(self):
+        self._snapshot = None
+
+    def _is_stale(self, snapshot: CatalogSnapshot) -> bool:
+        return bool(self.refresh_seconds) and time.monotonic() - snapshot.loaded_at > self.refresh_seconds
+
+    @staticmethod
+    async def _load(db: AsyncSession) -> CatalogSnapshot:
+        lessons = await db.execute(
+            select(Lesson.id, Lesson.language, Lesson.title, Lesson.level, Lesson.created_at)
+            .order_by(Lesson.id)
+        )
+        items = await db.execute(
+            select(
+                LessonItem.id, LessonItem.lesson_id, LessonItem.text,
+                LessonItem.expected_answer, LessonItem.audio_url, LessonItem.hint
+            ).order_by(LessonItem.id)
+        )
+        return CatalogSnapshot(
+            tuple(LessonEntry(*row) for row in lessons),
+            tuple(LessonItemEntry(*row) for row in items),
+        )
+
+
+lesson_catalog = LessonCatalog(refresh_seconds=settings.CATALOG_REFRESH_SECONDS)
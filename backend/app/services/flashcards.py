@@ -0,0 +1,112 @@
+# app/services/flashcards.py
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.models import Flashcard
+
+# SM-2 answer quality (0-5) for each scoring status; a word spoken
+# correctly only reviews an existing card, it never creates one
+FEEDBACK_QUALITY = {"wrong": 1, "close": 3, "correct": 5}
+PERFECT = 5
+
+MIN_EASE = 1.3
+DEFAULT_EASE = 2.5
+# A missed word is due again straight away, so it shows up in the
+# Practice Again deck in the same session rather than tomorrow
+RELEARN_DELAY = timedelta(0)
+
+
+def review(card: Flashcard, quality: int, now: datetime):
+    """Apply one SM-2 review with ``quality`` 0-5 to ``card`` in place"""
+    ease = card.ease if card.ease is not None else DEFAULT_EASE
+    repetitions = card.repetitions or 0
+    if quality < 3:
+        repetitions = 0
+        interval = 0.0
+        card.times_wrong = (card.times_wrong or 0) + 1
+        card.due_at = now + RELEARN_DELAY
+    else:
+        repetitions += 1
+        if repetitions == 1:
+            interval = 1.0
+        elif repetitions == 2:
+            interval = 6.0
+        else:
+            interval = round((card.interval_days or 1.0) * ease, 2)
+        card.due_at = now + timedelta(days=interval)
+    card.ease = round(max(MIN_EASE, ease + 0.1 - (5 - quality) * (0.08 + (5 - quality) * 0.02)), 2)
+    card.repetitions = repetitions
+    card.interval_days = interval
+    card.last_seen = now
+
+def feedback_qualities(word_feedback: List[Dict[str, Any]]) -> Dict[str, int]:
+    """Worst quality per target word in an attempt's feedback; extra words are ignored"""
+    qualities: Dict[str, int] = {}
+    for entry in word_feedback or []:
+        if not isinstance(entry, dict) or entry.get("op") == "insert":
+            continue
+        word, quality = entry.get("word"), FEEDBACK_QUALITY.get(entry.get("status"))
+        if not isinstance(word, str) or not word or quality is None:
+            continue
+        qualities[word] = min(quality, qualities.get(word, quality))
+    return qualities
+
+async def schedule_from_feedback(
+    db: AsyncSession,
+    user_id: int,
+    lesson_item_id: Optional[int],
+    word_feedback: List[Dict[str, Any]],
+    now: datetime,
+):
+    """Create or review the user's cards for the words in an attempt.
+
+    Missed (close/wrong) words get a card if they don't have one yet;
+    every word that already has a card counts as a review of it. Costs one
+    indexed SELECT on (user_id, text) plus the flushed writes, and runs in
+    the caller's transaction.
+    """
+    qualities = feedback_qualities(word_feedback)
+    if not qualities:
+        return
+
+    for attempt in range(2):
+        try:
+            # A savepoint, so losing a race on the unique (user_id, text)
+            # only retries the cards, not the whole attempt
+            async with db.begin_nested():
+                result = await db.execute(
+                    select(Flashcard)
+                    .where(Flashcard.user_id == user_id, Flashcard.text.in_(list(qualities)))
+                )
+                cards = {card.text: card for card in result.scalars()}
+                for word, quality in qualities.items():
+                    card = cards.get(word)
+                    if card is None:
+                        if quality == PERFECT:
+                            continue
+                        card = Flashcard(
+                            user_id=user_id, text=word, times_wrong=0,
+                            ease=DEFAULT_EASE, repetitions=0, interval_days=0.0
+                        )
+                        db.add(card)
+                    if quality < PERFECT:
+                        card.lesson_item_id = lesson_item_id
+                    review(card, quality, now)
+            return
+        except IntegrityError:
+            if attempt:
+                raise
+
+async def due_cards(db: AsyncSession, user_id: int, now: datetime, limit: int) -> List[Flashcard]:
+    """Cards due by ``now``, most overdue first: a range scan of (user_id, due_at)"""
+    result = await db.execute(
+        select(Flashcard)
+        .where(Flashcard.user_id == user_id, Flashcard.due_at <= now)
+        .order_by(Flashcard.due_at)
+        .limit(limit)
+    )
+    return list(result.scalars())
@@ -0,0 +1,263 @@
+# app/services/jobs.py
+import asyncio
+import random
+import shutil
+import tempfile
+import time
+import uuid
+from abc import ABC, abstractmethod
+from typing import Any, Dict, List, Optional
+
+from fastapi import HTTPException
+
+from app.core.config import settings
+from app.services.spitch import TranscriptionService, UpstreamError, get_transcription_service
+
+QUEUED, RUNNING, SUCCEEDED, FAILED = "queued", "running", "succeeded", "failed"
+FINISHED = (SUCCEEDED, FAILED)
+
+
+class TranscriptionJob:
+    def __init__(self, user_id: int, language: str, content, content_sha256: Optional[str]):
+        self.id = uuid.uuid4().hex
+        self.user_id = user_id
+        self.language = language
+        self.content = content
+        self.content_sha256 = content_sha256
+        self.status = QUEUED
+        self.attempts = 0
+        self.result: Optional[dict] = None
+        self.error: Optional[str] = None
+        self.created_at = time.time()
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        self.changed = asyncio.Event()
+
+    def to_dict(self) -> Dict[str, Any]:
+        timing = {}
+        if self.started_at:
+            timing["queued_ms"] = round((self.started_at - self.created_at) * 1000, 1)
+        if self.finished_at and self.started_at:
+            timing["run_ms"] = round((self.finished_at - self.started_at) * 1000, 1)
+        return {
+            "job_id": self.id,
+            "status": self.status,
+            "attempts": self.attempts,
+            "result": self.result,
+            "error": self.error,
+            "timing": timing,
+        }
+
+    def set_status(self, status: str):
+        self.status = status
+        # Wake everyone waiting on this change, then re-arm for the next one
+        self.changed.set()
+        self.changed = asyncio.Event()
+
+    @property
+    def file(self):
+        """The file object behind ``content``, if it isn't plain bytes"""
+        data = self.content[1] if isinstance(self.content, tuple) else self.content
+        return data if hasattr(data, "seek") else None
+
+    def release_content(self):
+        if self.file is not None:
+            self.file.close()
+        self.content = None
+
+    def fail(self, error: str):
+        self.error = error
+        self.finished_at = time.time()
+        self.set_status(FAILED)
+
+
+class JobStore(ABC):
+    """Where jobs live while queued and after they finish"""
+
+    @abstractmethod
+    def add(self, job: TranscriptionJob):
+        ...
+
+    @abstractmethod
+    def get(self, job_id: str) -> Optional[TranscriptionJob]:
+        ...
+
+    @abstractmethod
+    def purge_finished(self, older_than: float):
+        ...
+
+
+class InMemoryJobStore(JobStore):
+    def __init__(self):
+        self._jobs: Dict[str, TranscriptionJob] = {}
+
+    def add(self, job: TranscriptionJob):
+        self._jobs[job.id] = job
+
+    def get(self, job_id: str) -> Optional[TranscriptionJob]:
+        return self._jobs.get(job_id)
+
+    def purge_finished(self, older_than: float):
+        expired = [
+            job_id for job_id, job in self._jobs.items()
+            if job.status in FINISHED and job.finished_at < older_than
+        ]
+        for job_id in expired:
+            del self._jobs[job_id]
+
+
+class TranscriptionJobQueue:
+    """Bounded in-process queue drained by a fixed pool of worker tasks.
+
+    ``submit`` answers 429 once ``max_depth`` jobs are waiting. Upstream
+    errors marked retryable (timeouts, 5xx, rate limits) are retried with
+    exponential backoff and jitter; rejected audio fails at once. Finished
+    jobs are kept for ``result_ttl`` seconds. ``shutdown`` fails whatever is
+    still queued or running.
+    """
+
+    def __init__(
+        self,
+        service: TranscriptionService,
+        store: Optional[JobStore] = None,
+        workers: int = 4,
+        max_depth: int = 100,
+        max_retries: int = 2,
+        backoff: float = 0.5,
+        result_ttl: int = 3600,
+    ):
+        self.service = service
+        self.store = store or InMemoryJobStore()
+        self.workers = workers
+        self.max_depth = max_depth
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.result_ttl = result_ttl
+        self.rejected = 0
+        self._queue: "asyncio.Queue[TranscriptionJob]" = asyncio.Queue()
+        self._tasks: List[asyncio.Task] = []
+
+    @property
+    def depth(self) -> int:
+        return self._queue.qsize()
+
+    def submit(self, user_id: int, language: str, content, content_sha256: Optional[str] = None) -> TranscriptionJob:
+        if self._queue.qsize() >= self.max_depth:
+            self.rejected += 1
+            raise HTTPException(
+                status_code=429,
+                detail="Transcription queue is full, retry shortly",
+                headers={"Retry-After": "1"},
+            )
+        self._start()
+        self.store.purge_finished(time.time() - self.result_ttl)
+
+        job = TranscriptionJob(user_id, language, content, content_sha256)
+        self.store.add(job)
+        self._queue.put_nowait(job)
+        return job
+
+    def get(self, job_id: str) -> Optional[TranscriptionJob]:
+        return self.store.get(job_id)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "depth": self.depth,
+            "max_depth": self.max_depth,
+            "workers": len(self._tasks),
+            "rejected": self.rejected,
+        }
+
+    async def shutdown(self):
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        # Nothing will pick these up: fail them so pollers stop waiting, and drop their spooled audio
+        while not self._queue.empty():
+            job = self._queue.get_nowait()
+            job.release_content()
+            job.fail("Server shut down before the job ran")
+            self._queue.task_done()
+
+    def _start(self):
+        if not self._tasks:
+            self._tasks = [asyncio.create_task(self._worker()) for _ in range(self.workers)]
+
+    async def _worker(self):
+        while True:
+            job = await self._queue.get()
+            try:
+                await self._run(job)
+            except asyncio.CancelledError:
+                job.fail("Server shut down while the job was running")
+                raise
+            finally:
+                job.release_content()
+                self._queue.task_done()
+
+    async def _run(self, job: TranscriptionJob):
+        job.started_at = time.time()
+        job.set_status(RUNNING)
+        while True:
+            job.attempts += 1
+            try:
+                if job.file is not None:
+                    job.file.seek(0)
+                job.result = await self.service.transcribe(job.language, job.content, job.content_sha256)
+                status = SUCCEEDED
+                break
+            except HTTPException as e:
+                if isinstance(e, UpstreamError) and e.retryable and job.attempts <= self.max_retries:
+                    delay = self.backoff * 2 ** (job.attempts - 1)
+                    await asyncio.sleep(delay + random.uniform(0, delay / 2))
+                    continue
+                job.error = e.detail
+                status = FAILED
+                break
+            except Exception as e:
+                job.error = str(e)
+                status = FAILED
+                break
+        job.finished_at = time.time()
+        job.set_status(status)
+
+
+def spool_content(content, max_memory: int = 1024 * 1024):
+    """Copy upload content so it outlives the request that received it"""
+    if isinstance(content, tuple):
+        filename, data, content_type = content
+        return (filename, spool_content(data, max_memory), content_type)
+    if isinstance(content, bytes):
+        return content
+    spooled = tempfile.SpooledTemporaryFile(max_size=max_memory)
+    content.seek(0)
+    shutil.copyfileobj(content, spooled)
+    spooled.seek(0)
+    return spooled
+
+
+_queue: Optional[TranscriptionJobQueue] = None
+
+def get_job_queue() -> TranscriptionJobQueue:
+    global _queue
+    if _queue is None:
+        _queue = TranscriptionJobQueue(
+            get_transcription_service(),
+            workers=settings.TRANSCRIBE_JOB_WORKERS,
+            max_depth=settings.TRANSCRIBE_JOB_MAX_QUEUE,
+            max_retries=settings.TRANSCRIBE_JOB_MAX_RETRIES,
+            backoff=settings.TRANSCRIBE_JOB_BACKOFF_SECONDS,
+            result_ttl=settings.TRANSCRIBE_JOB_TTL_SECONDS,
+        )
+    return _queue
+
+def current_job_queue() -> Optional[TranscriptionJobQueue]:
+    """The queue if a job has been submitted already; never creates it"""
+    return _queue
+
+async def shutdown_job_queue():
+    global _queue
+    if _queue is not None:
+        await _queue.shutdown()
+        _queue = None
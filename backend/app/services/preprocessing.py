@@ -0,0 +1,190 @@
+# app/services/preprocessing.py
+import asyncio
+import io
+import threading
+import time
+import wave
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, Optional, Tuple
+
+try:
+    import audioop
+except ImportError:  # removed from the stdlib in 3.13, see audioop-lts
+    audioop = None
+
+from fastapi import UploadFile
+
+from app.core.config import settings
+from app.services.audio import AudioUpload, receive_audio
+
+WAV_TYPES = ("audio/wav", "audio/x-wav", "audio/wave", "audio/vnd.wave")
+STAGES = ("decode", "downmix", "resample", "trim", "encode")
+
+# Silence trimming works on 20 ms windows and keeps 100 ms of padding
+WINDOW_MS = 20
+PADDING_MS = 100
+
+
+class PreprocessResult:
+    __slots__ = ("audio", "bytes_in", "bytes_out", "stage_ms", "skipped")
+
+    def __init__(self, audio: bytes, bytes_in: int, stage_ms: Dict[str, float], skipped: Optional[str] = None):
+        self.audio = audio
+        self.bytes_in = bytes_in
+        self.bytes_out = len(audio)
+        self.stage_ms = stage_ms
+        self.skipped = skipped
+
+
+def preprocess_wav(data: bytes, target_rate: int, silence_threshold: int) -> PreprocessResult:
+    """Downmix to mono 16-bit, resample to ``target_rate`` and trim silence.
+
+    Runs in a worker process. Anything that isn't integer PCM WAV is
+    returned untouched with ``skipped`` set.
+    """
+    stage_ms: Dict[str, float] = {}
+    clock = time.perf_counter()
+
+    def lap(stage):
+        nonlocal clock
+        now = time.perf_counter()
+        stage_ms[stage] = (now - clock) * 1000
+        clock = now
+
+    try:
+        with wave.open(io.BytesIO(data)) as wav:
+            channels, width, rate = wav.getnchannels(), wav.getsampwidth(), wav.getframerate()
+            frames = wav.readframes(wav.getnframes())
+    except (wave.Error, EOFError) as e:
+        return PreprocessResult(data, len(data), stage_ms, skipped=f"unreadable wav: {e}")
+    if channels > 2:
+        return PreprocessResult(data, len(data), stage_ms, skipped=f"{channels} channels")
+    if width == 1:
+        frames = audioop.bias(frames, 1, -128)  # 8-bit WAV is unsigned
+    if width != 2:
+        frames = audioop.lin2lin(frames, width, 2)
+    lap("decode")
+
+    if channels == 2:
+        frames = audioop.tomono(frames, 2, 0.5, 0.5)
+    lap("downmix")
+
+    if rate != target_rate:
+        frames, _ = audioop.ratecv(frames, 2, 1, rate, target_rate, None)
+    lap("resample")
+
+    frames = trim_silence(frames, target_rate, silence_threshold)
+    lap("trim")
+
+    out = io.BytesIO()
+    with wave.open(out, "wb") as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(2)
+        wav.setframerate(target_rate)
+        wav.writeframes(frames)
+    lap("encode")
+
+    return PreprocessResult(out.getvalue(), len(data), stage_ms)
+
+def trim_silence(frames: bytes, rate: int, threshold: int) -> bytes:
+    """Drop leading/trailing 16-bit mono windows whose RMS is under ``threshold``"""
+    window = rate * WINDOW_MS // 1000 * 2
+    if window == 0 or len(frames) <= window:
+        return frames
+    loud = [
+        offset for offset in range(0, len(frames) - window + 1, window)
+        if audioop.rms(frames[offset:offset + window], 2) >= threshold
+    ]
+    if not loud:
+        return frames  # all quiet: let the ASR decide
+    padding = rate * PADDING_MS // 1000 * 2
+    start = max(loud[0] - padding, 0)
+    end = min(loud[-1] + window + padding, len(frames))
+    return frames[start:end]
+
+
+class PreprocessMetrics:
+    def __init__(self):
+        self.processed = 0
+        self.skipped = 0
+        self.bytes_in = 0
+        self.bytes_out = 0
+        self.stage_ms = {stage: 0.0 for stage in STAGES}
+        self.total_ms = 0.0
+        self._lock = threading.Lock()
+
+    def record(self, result: PreprocessResult, total_ms: float):
+        with self._lock:
+            if result.skipped:
+                self.skipped += 1
+                return
+            self.processed += 1
+            self.bytes_in += result.bytes_in
+            self.bytes_out += result.bytes_out
+            self.total_ms += total_ms
+            for stage, ms in result.stage_ms.items():
+                self.stage_ms[stage] += ms
+
+    def stats(self) -> Dict[str, Any]:
+        runs = self.processed or 1
+        return {
+            "enabled": settings.AUDIO_PREPROCESS_ENABLED and audioop is not None,
+            "processed": self.processed,
+            "skipped": self.skipped,
+            "bytes_in": self.bytes_in,
+            "bytes_out": self.bytes_out,
+            "bytes_saved": self.bytes_in - self.bytes_out,
+            "avg_total_ms": round(self.total_ms / runs, 3),
+            "avg_stage_ms": {stage: round(ms / runs, 3) for stage, ms in self.stage_ms.items()},
+        }
+
+
+preprocess_metrics = PreprocessMetrics()
+_executor: Optional[ProcessPoolExecutor] = None
+
+def _get_executor() -> ProcessPoolExecutor:
+    global _executor
+    if _executor is None:
+        _executor = ProcessPoolExecutor(max_workers=settings.AUDIO_PREPROCESS_WORKERS)
+    return _executor
+
+def shutdown_preprocessing():
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=False, cancel_futures=True)
+        _executor = None
+
+def _read_from_start(file) -> bytes:
+    file.seek(0)
+    return file.read()
+
+async def prepare_audio(audio: AudioUpload) -> Tuple[Any, Optional[PreprocessResult]]:
+    """Upstream content for ``audio``, preprocessed in the process pool when enabled.
+
+    Only WAV can be reshaped without a codec; other formats are streamed
+    unchanged.
+    """
+    if not settings.AUDIO_PREPROCESS_ENABLED or audioop is None or audio.content_type not in WAV_TYPES:
+        return audio.content, None
+
+    # A spooled upload may already be on disk; don't read it on the event loop
+    data = await asyncio.to_thread(_read_from_start, audio.file)
+    start = time.perf_counter()
+    result = await asyncio.get_running_loop().run_in_executor(
+        _get_executor(),
+        preprocess_wav,
+        data,
+        settings.AUDIO_TARGET_SAMPLE_RATE,
+        settings.AUDIO_SILENCE_THRESHOLD,
+    )
+    preprocess_metrics.record(result, (time.perf_counter() - start) * 1000)
+    if result.skipped or result.bytes_out >= result.bytes_in:
+        return audio.content, result
+    return (audio.filename, result.audio, "audio/wav"), result
+
+async def prepare_upload(upload: UploadFile):
+    """Validate and hash an uploaded clip without loading it into memory, then
+    run preprocessing. Returns (upstream content, sha256 of the original)."""
+    audio = await receive_audio(upload, settings.AUDIO_MAX_BYTES, settings.AUDIO_MAX_SECONDS)
+    content, _ = await prepare_audio(audio)
+    return content, audio.sha256
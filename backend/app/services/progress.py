@@ -0,0 +1,160 @@
+# app/services/progress.py
+from datetime import date, datetime, timedelta
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import case, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.models import DailyProgress, ItemProgress
+from app.db.upsert import upsert
+from app.services.catalog import CatalogSnapshot
+from app.services.spitch import to_spitch_language
+
+# An item counts as completed once its best score reaches this
+COMPLETION_SCORE = 70.0
+
+
+def item_progress_upsert(dialect_name: str, rows: List[Dict[str, Any]]):
+    """Merge (user, lesson item) totals into item_progress.
+
+    Rows carry ``attempts``/``total_score`` increments and the best/last
+    score of what they cover, so the same statement records one attempt or
+    a whole backfilled history.
+    """
+    table = ItemProgress.__table__
+    c = table.c
+
+    def merge(excluded):
+        newer = c.last_attempt_at.is_(None) | (excluded.last_attempt_at >= c.last_attempt_at)
+        return {
+            "attempts": c.attempts + excluded.attempts,
+            "total_score": c.total_score + excluded.total_score,
+            "best_score": case(
+                (c.best_score.is_(None) | (excluded.best_score > c.best_score), excluded.best_score),
+                else_=c.best_score,
+            ),
+            "last_score": case((newer, excluded.last_score), else_=c.last_score),
+            "last_attempt_at": case((newer, excluded.last_attempt_at), else_=c.last_attempt_at),
+        }
+
+    return upsert(dialect_name, table, rows, ["user_id", "lesson_item_id"], merge)
+
+def daily_progress_upsert(dialect_name: str, rows: List[Dict[str, Any]]):
+    """Merge (user, day) totals into daily_progress"""
+    table = DailyProgress.__table__
+    c = table.c
+    return upsert(dialect_name, table, rows, ["user_id", "day"], lambda excluded: {
+        "attempts": c.attempts + excluded.attempts,
+        "total_score": c.total_score + excluded.total_score,
+        "xp": c.xp + excluded.xp,
+    })
+
+async def record_progress(db: AsyncSession, user_id: int, lesson_item_id: int, score: float, now: datetime):
+    """Fold one attempt into the rollups, in the caller's transaction"""
+    dialect_name = db.get_bind().dialect.name
+    await db.execute(item_progress_upsert(dialect_name, [{
+        "user_id": user_id,
+        "lesson_item_id": lesson_item_id,
+        "attempts": 1,
+        "total_score": score,
+        "best_score": score,
+        "last_score": score,
+        "last_attempt_at": now,
+    }]))
+    await db.execute(daily_progress_upsert(dialect_name, [{
+        "user_id": user_id,
+        "day": now.date(),
+        "attempts": 1,
+        "total_score": score,
+        "xp": int(score),
+    }]))
+
+
+def _average(total: float, count: int) -> Optional[float]:
+    return round(total / count, 1) if count else None
+
+async def progress_summary(
+    db: AsyncSession,
+    user_id: int,
+    catalog: CatalogSnapshot,
+    days: int,
+    today: date,
+    language: Optional[str] = None,
+) -> Dict[str, Any]:
+    """Dashboard numbers from the rollups and the catalog only.
+
+    Reads one item_progress row per item practiced and one daily_progress
+    row per day in the window, however many attempts the user has made.
+    """
+    items = await db.execute(
+        select(
+            ItemProgress.lesson_item_id, ItemProgress.attempts, ItemProgress.total_score,
+            ItemProgress.best_score, ItemProgress.last_attempt_at
+        ).where(ItemProgress.user_id == user_id)
+    )
+    by_item = {row.lesson_item_id: row for row in items}
+
+    # Names ("yoruba") and codes ("yo") both select a language, as on the leaderboard
+    wanted = to_spitch_language(language) if language else None
+    lessons = []
+    languages: Dict[str, Dict[str, Any]] = {}
+    for lesson in catalog.lessons:
+        if wanted and to_spitch_language(lesson.language) != wanted:
+            continue
+        lesson_items = catalog.items_by_lesson.get(lesson.id, ())
+        practiced = [by_item[item.id] for item in lesson_items if item.id in by_item]
+        attempts = sum(row.attempts for row in practiced)
+        total_score = sum(row.total_score for row in practiced)
+        completed = sum(1 for row in practiced if (row.best_score or 0) >= COMPLETION_SCORE)
+        lessons.append({
+            "lesson_id": lesson.id,
+            "title": lesson.title,
+            "language": lesson.language,
+            "level": lesson.level,
+            "items_total": len(lesson_items),
+            "items_practiced": len(practiced),
+            "items_completed": completed,
+            "completion": round(completed / len(lesson_items), 3) if lesson_items else 0.0,
+            "best_scores": {row.lesson_item_id: row.best_score for row in practiced},
+            "attempts": attempts,
+            "average_score": _average(total_score, attempts),
+            "last_attempt_at": max((row.last_attempt_at for row in practiced), default=None),
+        })
+        totals = languages.setdefault(lesson.language, {
+            "language": lesson.language, "attempts": 0, "total_score": 0.0,
+            "items_total": 0, "items_completed": 0,
+        })
+        totals["attempts"] += attempts
+        totals["total_score"] += total_score
+        totals["items_total"] += len(lesson_items)
+        totals["items_completed"] += completed
+
+    since = today - timedelta(days=days - 1)
+    daily = await db.execute(
+        select(DailyProgress.day, DailyProgress.attempts, DailyProgress.total_score, DailyProgress.xp)
+        .where(DailyProgress.user_id == user_id, DailyProgress.day >= since)
+        .order_by(DailyProgress.day)
+    )
+
+    return {
+        "lessons": lessons,
+        "languages": [
+            {
+                "language": totals["language"],
+                "attempts": totals["attempts"],
+                "average_score": _average(totals["total_score"], totals["attempts"]),
+                "items_total": totals["items_total"],
+                "items_completed": totals["items_completed"],
+            }
+            for totals in languages.values()
+        ],
+        "days": [
+            {
+                "day": row.day,
+                "attempts": row.attempts,
+                "average_score": _average(row.total_score, row.attempts),
+                "xp": row.xp,
+            }
+            for row in daily
+        ],
+    }
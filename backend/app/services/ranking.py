@@ -0,0 +1,230 @@
+# app/services/ranking.py
+import asyncio
+import time
+from bisect import bisect_left, insort
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.db.models import User, UserPreferences
+from app.services.spitch import to_spitch_language
+
+# (-xp, user_id): ascending order is the leaderboard order
+RankKey = Tuple[int, int]
+
+
+class SortedKeys:
+    """Sorted list split into buckets of roughly ``load`` keys.
+
+    Inserts and removals touch one bucket and finding a key's position only
+    sums bucket lengths, so updates and rank lookups cost O(n / load + log n)
+    instead of shifting one huge list.
+    """
+
+    def __init__(self, load: int = 512):
+        self._load = load
+        self._buckets: List[List[RankKey]] = []
+        self._maxes: List[RankKey] = []
+        self._len = 0
+
+    def __len__(self):
+        return self._len
+
+    def add(self, key: RankKey):
+        if not self._buckets:
+            self._buckets.append([key])
+            self._maxes.append(key)
+        else:
+            pos = min(bisect_left(self._maxes, key), len(self._maxes) - 1)
+            bucket = self._buckets[pos]
+            insort(bucket, key)
+            self._maxes[pos] = bucket[-1]
+            if len(bucket) > 2 * self._load:
+                self._buckets[pos:pos + 1] = [bucket[:self._load], bucket[self._load:]]
+                self._maxes[pos:pos + 1] = [bucket[self._load - 1], bucket[-1]]
+        self._len += 1
+
+    def remove(self, key: RankKey):
+        pos = bisect_left(self._maxes, key)
+        if pos == len(self._maxes):
+            raise KeyError(key)
+        bucket = self._buckets[pos]
+        index = bisect_left(bucket, key)
+        if index == len(bucket) or bucket[index] != key:
+            raise KeyError(key)
+        del bucket[index]
+        self._len -= 1
+        if bucket:
+            self._maxes[pos] = bucket[-1]
+        else:
+            del self._buckets[pos]
+            del self._maxes[pos]
+
+    def position(self, key: RankKey) -> int:
+        """Number of keys strictly smaller than ``key``"""
+        pos = bisect_left(self._maxes, key)
+        if pos == len(self._maxes):
+            return self._len
+        preceding = sum(len(bucket) for bucket in self._buckets[:pos])
+        return preceding + bisect_left(self._buckets[pos], key)
+
+    def slice(self, start: int, stop: int) -> List[RankKey]:
+        start, stop = max(start, 0), min(stop, self._len)
+        keys: List[RankKey] = []
+        offset = 0
+        for bucket in self._buckets:
+            if offset + len(bucket) > start and offset < stop:
+                keys.extend(bucket[max(start - offset, 0):stop - offset])
+            offset += len(bucket)
+            if offset >= stop:
+                break
+        return keys
+
+
+class RankedUser(NamedTuple):
+    rank: int
+    user_id: int
+    name: Optional[str]
+    xp: int
+    streak: int
+
+
+class LeaderboardIndex:
+    """Global and per-language XP rankings kept in memory.
+
+    Loaded from the database with a single query on first use, then kept
+    current by ``update_user`` (attempts) and ``set_language`` (preferences).
+    Users with equal XP share a rank. Each worker keeps its own copy; writes
+    made elsewhere (other workers, rescore, backfill_progress) show up once
+    the copy is older than ``reload_seconds`` and the next request reloads
+    it, or after ``invalidate``.
+    """
+
+    def __init__(self, reload_seconds: float = 0):
+        self.reload_seconds = reload_seconds
+        self._global = SortedKeys()
+        self._by_language: Dict[str, SortedKeys] = {}
+        self._users: Dict[int, dict] = {}
+        self._loaded = False
+        self._loaded_at = 0.0
+        self._lock = asyncio.Lock()
+
+    @property
+    def loaded(self) -> bool:
+        return self._loaded
+
+    def _fresh(self) -> bool:
+        if not self._loaded:
+            return False
+        return not self.reload_seconds or time.monotonic() - self._loaded_at <= self.reload_seconds
+
+    async def ensure_loaded(self, db: AsyncSession):
+        if self._fresh():
+            return
+        async with self._lock:
+            if self._fresh():
+                return
+            result = await db.execute(
+                select(User.id, User.name, User.xp, User.streak, UserPreferences.target_language)
+                .outerjoin(UserPreferences, UserPreferences.user_id == User.id)
+            )
+            self._global = SortedKeys()
+            self._by_language = {}
+            self._users = {}
+            for user_id, name, xp, streak, language in result:
+                self._insert(user_id, name, xp or 0, streak or 0, language)
+            self._loaded = True
+            self._loaded_at = time.monotonic()
+
+    def invalidate(self):
+        self._loaded = False
+
+    def update_user(self, user_id: int, xp: int, streak: int = 0, name: Optional[str] = None):
+        if not self._loaded:
+            return
+        entry = self._users.get(user_id)
+        if entry is None:
+            self._insert(user_id, name, xp, streak, None)
+            return
+        self._remove(user_id)
+        self._insert(user_id, name or entry["name"], xp, streak, entry["language"])
+
+    def set_language(self, user_id: int, language: Optional[str]):
+        if not self._loaded or user_id not in self._users:
+            return
+        entry = self._users[user_id]
+        self._remove(user_id)
+        self._insert(user_id, entry["name"], entry["xp"], entry["streak"], language)
+
+    def top(self, limit: int, language: Optional[str] = None) -> List[RankedUser]:
+        board = self._board(language)
+        if board is None:
+            return []
+        return self._ranked(board, 0, board.slice(0, limit))
+
+    def rank(self, user_id: int, language: Optional[str] = None) -> Optional[RankedUser]:
+        board = self._board(language)
+        entry = self._users.get(user_id)
+        if board is None or entry is None or (language and entry["language"] != self._language_key(language)):
+            return None
+        return self._to_ranked(board, user_id)
+
+    def neighbors(self, user_id: int, around: int, language: Optional[str] = None) -> List[RankedUser]:
+        """The ``around`` users directly above and below ``user_id``"""
+        board = self._board(language)
+        me = self.rank(user_id, language)
+        if board is None or me is None:
+            return []
+        start = max(board.position(self._key(user_id)) - around, 0)
+        keys = board.slice(start, start + 2 * around + 1)
+        return self._ranked(board, start, keys)
+
+    @staticmethod
+    def _language_key(language: Optional[str]) -> Optional[str]:
+        return to_spitch_language(language) if language else None
+
+    def _board(self, language: Optional[str]) -> Optional[SortedKeys]:
+        if not language:
+            return self._global
+        return self._by_language.get(self._language_key(language))
+
+    def _key(self, user_id: int) -> RankKey:
+        return (-self._users[user_id]["xp"], user_id)
+
+    def _to_ranked(self, board: SortedKeys, user_id: int) -> RankedUser:
+        entry = self._users[user_id]
+        rank = board.position((-entry["xp"],)) + 1
+        return RankedUser(rank, user_id, entry["name"], entry["xp"], entry["streak"])
+
+    def _ranked(self, board: SortedKeys, start: int, keys: List[RankKey]) -> List[RankedUser]:
+        """Rank a contiguous run of keys beginning at position ``start``"""
+        ranked: List[RankedUser] = []
+        for offset, (_, user_id) in enumerate(keys):
+            if not ranked:
+                ranked.append(self._to_ranked(board, user_id))
+                continue
+            entry = self._users[user_id]
+            previous = ranked[-1]
+            rank = previous.rank if entry["xp"] == previous.xp else start + offset + 1
+            ranked.append(RankedUser(rank, user_id, entry["name"], entry["xp"], entry["streak"]))
+        return ranked
+
+    def _insert(self, user_id: int, name: Optional[str], xp: int, streak: int, language: Optional[str]):
+        language = self._language_key(language)
+        self._users[user_id] = {"name": name, "xp": xp, "streak": streak, "language": language}
+        key = (-xp, user_id)
+        self._global.add(key)
+        if language:
+            self._by_language.setdefault(language, SortedKeys()).add(key)
+
+    def _remove(self, user_id: int):
+        entry = self._users.pop(user_id)
+        key = (-entry["xp"], user_id)
+        self._global.remove(key)
+        if entry["language"]:
+            self._by_language[entry["language"]].remove(key)
+
+
+leaderboard_index = LeaderboardIndex(reload_seconds=settings.LEADERBOARD_RELOAD_SECONDS)
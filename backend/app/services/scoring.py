@@ -1,6 +1,21 @@
-from difflib import SequenceMatcher
+from typing import Callable, Dict, List, Optional, Tuple
+from rapidfuzz import fuzz
+from rapidfuzz.distance import Levenshtein
 import unicodedata
 import re
+from app.core.metrics import timed
+
+_PUNCTUATION = re.compile(r'[^\w\s]')
+_WHITESPACE = re.compile(r'\s+')
+
+CORRECT_THRESHOLD = 0.9
+CLOSE_THRESHOLD = 0.6
+
+# (op, target word, heard word, similarity 0-1); op is one of
+# "match", "substitute", "delete" (target word not heard) or "insert" (extra word heard)
+Alignment = List[Tuple[str, Optional[str], Optional[str], float]]
+# (target word, heard word) -> similarity 0-1
+WordSimilarity = Callable[[str, str], float]
 
 def normalize_text(text: str):
     """Normalize text for comparison"""
@@ -8,64 +23,279 @@ def normalize_text(text: str):
         return ""
     text = text.lower().strip()
     text = unicodedata.normalize('NFD', text)
-    text = re.sub(r'[^\w\s]', '', text)
-    text = re.sub(r'\s+', ' ', text)
+    text = _PUNCTUATION.sub('', text)
+    text = _WHITESPACE.sub(' ', text)
     return text
 
+def tokenize(text: str) -> List[str]:
+    return normalize_text(text).split()
+
 def similarity_ratio(a: str, b: str) -> float:
     """Return similarity ratio between two words (0-100)"""
-    return SequenceMatcher(None, a, b).ratio() * 100
+    return fuzz.ratio(a, b)
 
-def score_attempt(target: str, transcript: str, confidence: float):
-    target_norm = normalize_text(target)
-    transcript_norm = normalize_text(transcript)
-    
-    target_words = target_norm.split()
-    transcript_words = transcript_norm.split()
-    
-    word_feedback = []
-    word_scores = []
-
-    for i, target_word in enumerate(target_words):
-        if i >= len(transcript_words):
-            word_feedback.append({
-                "word": target_word,
-                "status": "wrong",
-                "suggestion": "Missing word"
-            })
-            word_scores.append(0)
+def word_similarity(target_word: str, heard_word: str) -> float:
+    return fuzz.ratio(target_word, heard_word) / 100
+
+def align_words(
+    target_words: List[str],
+    transcript_words: List[str],
+    similarity: WordSimilarity = word_similarity,
+) -> Alignment:
+    """Word-level edit-distance alignment of a transcript against its target.
+
+    Runs of identical words are found by rapidfuzz's C Levenshtein on the word
+    sequences; only the differing stretches between them are re-aligned with a
+    character-similarity substitution cost, so a near-correct attempt costs
+    almost nothing and one dropped word no longer shifts every later word.
+    ``similarity`` scores a target word against a heard word.
+    """
+    alignment = []
+    pending = None  # differing stretch: [i1, i2, j1, j2]
+    for tag, i1, i2, j1, j2 in Levenshtein.opcodes(target_words, transcript_words):
+        if tag != "equal":
+            if pending is None:
+                pending = [i1, i2, j1, j2]
+            else:
+                pending[1], pending[3] = i2, j2
             continue
+        if pending is not None:
+            alignment.extend(_align_block(
+                target_words[pending[0]:pending[1]],
+                transcript_words[pending[2]:pending[3]],
+                similarity
+            ))
+            pending = None
+        alignment.extend(("match", word, word, 1.0) for word in target_words[i1:i2])
+    if pending is not None:
+        alignment.extend(_align_block(
+            target_words[pending[0]:pending[1]],
+            transcript_words[pending[2]:pending[3]],
+            similarity
+        ))
+    return alignment
+
+def _align_block(
+    target_words: List[str],
+    heard_words: List[str],
+    similarity: WordSimilarity = word_similarity,
+) -> Alignment:
+    """Minimum-cost alignment where substituting costs (1 - similarity).
 
-        transcript_word = transcript_words[i]
-        similarity = similarity_ratio(target_word, transcript_word) / 100
+    Below CLOSE_THRESHOLD a substitution costs twice that, so two unrelated
+    words are only paired when nothing better is on offer: a dropped word
+    plus an extra one (cost 2) beats shifting a run of words onto their
+    neighbours, while a lone swapped word is still reported as a substitution.
+    """
+    if not heard_words:
+        return [("delete", word, None, 0.0) for word in target_words]
+    if not target_words:
+        return [("insert", None, word, 0.0) for word in heard_words]
 
-        # Single threshold logic
-        if similarity >= 0.9:
-            status = "correct"
-            suggestion = ""
-        elif similarity >= 0.6:
-            status = "close"
-            suggestion = f"Try pronouncing '{target_word}' more clearly"
+    rows, cols = len(target_words), len(heard_words)
+    similarities = [
+        [similarity(t, h) for h in heard_words]
+        for t in target_words
+    ]
+    substitution = [
+        [1 - sim if sim >= CLOSE_THRESHOLD else 2 * (1 - sim) for sim in sims]
+        for sims in similarities
+    ]
+    cost = [[0.0] * (cols + 1) for _ in range(rows + 1)]
+    for i in range(1, rows + 1):
+        cost[i][0] = float(i)
+    for j in range(1, cols + 1):
+        cost[0][j] = float(j)
+    for i in range(1, rows + 1):
+        row, prev, subs = cost[i], cost[i - 1], substitution[i - 1]
+        for j in range(1, cols + 1):
+            row[j] = min(
+                prev[j - 1] + subs[j - 1],
+                prev[j] + 1,
+                row[j - 1] + 1,
+            )
+
+    alignment = []
+    i, j = rows, cols
+    while i > 0 or j > 0:
+        if i > 0 and j > 0 and cost[i][j] == cost[i - 1][j - 1] + substitution[i - 1][j - 1]:
+            sim = similarities[i - 1][j - 1]
+            op = "match" if sim == 1.0 else "substitute"
+            alignment.append((op, target_words[i - 1], heard_words[j - 1], sim))
+            i, j = i - 1, j - 1
+        elif i > 0 and cost[i][j] == cost[i - 1][j] + 1:
+            alignment.append(("delete", target_words[i - 1], None, 0.0))
+            i -= 1
         else:
-            status = "wrong"
-            suggestion = f"Expected '{target_word}' but heard '{transcript_word}'"
+            alignment.append(("insert", None, heard_words[j - 1], 0.0))
+            j -= 1
+    alignment.reverse()
+    return alignment
 
-        word_feedback.append({
+def word_feedback_entry(op: str, target_word: Optional[str], heard_word: Optional[str], similarity: float):
+    if op == "insert":
+        return {
+            "word": heard_word,
+            "status": "extra",
+            "suggestion": f"Heard extra word '{heard_word}'",
+            "op": op
+        }
+    if op == "delete":
+        return {
             "word": target_word,
-            "status": status,
-            "suggestion": suggestion
-        })
-        word_scores.append(similarity)
+            "status": "wrong",
+            "suggestion": "Missing word",
+            "op": op
+        }
+
+    # Single threshold logic
+    if similarity >= CORRECT_THRESHOLD:
+        status = "correct"
+        suggestion = ""
+    elif similarity >= CLOSE_THRESHOLD:
+        status = "close"
+        suggestion = f"Try pronouncing '{target_word}' more clearly"
+    else:
+        status = "wrong"
+        suggestion = f"Expected '{target_word}' but heard '{heard_word}'"
+    return {
+        "word": target_word,
+        "status": status,
+        "suggestion": suggestion,
+        "op": op
+    }
+
+@timed("score_attempt")
+def score_words(target_words: List[str], transcript_words: List[str], confidence: float):
+    """Score already-tokenized words; see score_attempt"""
+    return _apply_confidence(_score_alignment(target_words, transcript_words), confidence)
+
+def _score_alignment(
+    target_words: List[str],
+    transcript_words: List[str],
+    similarity: WordSimilarity = word_similarity,
+):
+    """Confidence-independent part of scoring: (raw score, word_feedback, suggestions)"""
+    alignment = align_words(target_words, transcript_words, similarity)
+
+    word_feedback = [word_feedback_entry(*step) for step in alignment]
+    # Every target word counts, and each extra word heard dilutes the score
+    word_scores = [sim for _, _, _, sim in alignment]
+
+    raw_score = sum(word_scores) / len(word_scores) * 100 if target_words else 0
+    return raw_score, word_feedback, generate_suggestions(word_feedback)
 
-    overall_score = sum(word_scores) / len(word_scores) * 100 if word_scores else 0
-    overall_score = min(overall_score * (0.7 + 0.3 * confidence), 100)
+def _apply_confidence(scored, confidence: float):
+    raw_score, word_feedback, suggestions = scored
+    overall_score = min(raw_score * (0.7 + 0.3 * confidence), 100)
 
     return {
         "score": round(overall_score, 1),
         "word_feedback": word_feedback,
-        "suggestions": generate_suggestions(word_feedback)
+        "suggestions": suggestions
     }
 
+def score_attempt(target: str, transcript: str, confidence: float):
+    return score_words(tokenize(target), tokenize(transcript), confidence)
+
+class IncrementalScorer:
+    """Re-scores a growing transcript and reports per-word changes.
+
+    Each ``update`` aligns the latest partial transcript against the target
+    and returns feedback only for target words that are *stable* and differ
+    from what was last reported. A word is stable once some heard word other
+    than the last one comes after it in the alignment: the trailing word may
+    still be cut off mid-utterance or revised by the recognizer. ``final=True``
+    treats every word as stable. Entries carry the target ``index`` so a
+    client can patch its view in place when a word is later revised.
+    """
+
+    def __init__(self, target_words: List[str], confidence: float = 1.0):
+        self.target_words = list(target_words)
+        self.confidence = confidence
+        self.transcript_words: List[str] = []
+        self._reported: Dict[int, dict] = {}
+
+    def update(self, transcript: str, final: bool = False) -> List[dict]:
+        self.transcript_words = tokenize(transcript)
+        last_heard = len(self.transcript_words) - 1
+        changes = []
+        index = heard = 0
+        for op, target_word, heard_word, similarity in align_words(self.target_words, self.transcript_words):
+            if op == "insert":
+                heard += 1
+                continue
+            # For a missing word, the heard word right after it decides
+            if final or heard < last_heard:
+                entry = {"index": index, **word_feedback_entry(op, target_word, heard_word, similarity)}
+                if self._reported.get(index) != entry:
+                    self._reported[index] = entry
+                    changes.append(entry)
+            index += 1
+            if op != "delete":
+                heard += 1
+        return changes
+
+    def result(self) -> dict:
+        """Full score of the latest transcript, as score_words returns it"""
+        return score_words(self.target_words, self.transcript_words, self.confidence)
+
+class _BatchSimilarity:
+    """Word similarity matrix shared by one batch, filled in as needed.
+
+    Only the (target word, heard word) cells the alignments actually visit
+    are computed, each once for the whole batch; repeats across items are
+    dictionary hits, which cost about a third of a ``fuzz.ratio`` call.
+    """
+
+    def __init__(self):
+        self.cells: Dict[Tuple[str, str], float] = {}
+
+    def __call__(self, target_word: str, heard_word: str) -> float:
+        key = (target_word, heard_word)
+        sim = self.cells.get(key)
+        if sim is None:
+            sim = self.cells[key] = fuzz.ratio(target_word, heard_word) / 100
+        return sim
+
+@timed("score_attempts_batch")
+def score_attempts_batch(pairs: List[Tuple[str, str, float]]) -> List[dict]:
+    """Score many (target, transcript, confidence) triples in one pass.
+
+    Each distinct string is normalized and tokenized once, each distinct
+    (target, transcript) pair is aligned once, and per-word similarities come
+    from one lazily filled matrix for the whole batch, so review screens that
+    repeat the same targets and words pay for them a single time. This is not
+    a vectorized pass: ``process.cdist`` needs numpy, which scoring does not
+    depend on, and a full vocabulary-by-vocabulary matrix measured slower than
+    filling only the cells the alignments visit. Each alignment stays a
+    per-pair dynamic program. Confidence is bounded by the API models and not
+    re-checked here. Results come back in input order as ``{"index", "result"}``
+    or ``{"index", "error"}``.
+    """
+    tokens: Dict[str, List[str]] = {}
+    for target, transcript, _ in pairs:
+        for text in (target, transcript):
+            if text not in tokens:
+                tokens[text] = tokenize(text)
+    similarity = _BatchSimilarity()
+    scored: Dict[Tuple[str, str], tuple] = {}
+    results = []
+
+    for index, (target, transcript, confidence) in enumerate(pairs):
+        try:
+            if not tokens[target]:
+                raise ValueError("target_text is empty")
+
+            key = (target, transcript)
+            if key not in scored:
+                scored[key] = _score_alignment(tokens[target], tokens[transcript], similarity)
+            results.append({"index": index, "result": _apply_confidence(scored[key], confidence)})
+        except Exception as e:
+            results.append({"index": index, "error": str(e)})
+
+    return results
+
 def generate_suggestions(word_feedback):
     wrong_words = [fb for fb in word_feedback if fb["status"] == "wrong"]
     if wrong_words:
@@ -1,7 +1,16 @@
-from fastapi import HTTPException, UploadFile
+# app/services/spitch.py
+import asyncio
+import hashlib
+from typing import Optional
+
 import httpx
-from backend.app.config import settings
-from backend.app.services.scoring import normalize_text
+from fastapi import HTTPException
+from spitch import APIConnectionError, APIStatusError, AsyncSpitch
+
+from app.core.config import settings
+from app.core.metrics import span
+from app.core.startup import startup_report
+from app.services.transcription_cache import TranscriptionCache, build_transcription_cache
 
 
 LANGUAGE_MAPPING = {
@@ -11,34 +20,149 @@ LANGUAGE_MAPPING = {
     "english": "en"
 }
 
-async def transcribe_audio(audio_file: UploadFile, language: str):
-    try:
-        # Map our language code to Spitch language code
-        spitch_language = LANGUAGE_MAPPING.get(language.lower())
-        if not spitch_language:
-            raise HTTPException(
-                status_code=400, 
-                detail=f"Unsupported language: {language}"
+def to_spitch_language(language: str) -> str:
+    """Accept either our language names or Spitch's ISO codes"""
+    language = language.strip().lower()
+    return LANGUAGE_MAPPING.get(language, language)
+
+
+# Upstream statuses that mean the audio or language was rejected: the
+# caller's request, so retrying it can't help
+REJECTED_STATUS = (400, 413, 415, 422)
+
+
+class UpstreamError(HTTPException):
+    """A failed Spitch call.
+
+    ``upstream_status`` is Spitch's HTTP status (None for timeouts and
+    connection errors) and ``retryable`` says whether the same request may
+    succeed later: timeouts, connection errors, 408, 429 and 5xx are.
+    """
+
+    def __init__(self, status_code: int, detail: str, upstream_status: Optional[int] = None,
+                 retryable: bool = False):
+        super().__init__(status_code=status_code, detail=detail)
+        self.upstream_status = upstream_status
+        self.retryable = retryable
+
+
+class TranscriptionService:
+    """Async Spitch client shared by every request on a worker.
+
+    All calls go through one pooled ``httpx.AsyncClient``; a semaphore caps
+    the number of in-flight upstream requests and each call (including the
+    wait for a free slot) is bounded by ``timeout`` seconds. With a ``cache``,
+    audio already transcribed in the same language is answered without an
+    upstream call.
+    """
+
+    def __init__(
+        self,
+        api_key: str,
+        base_url: Optional[str] = None,
+        max_concurrency: int = 8,
+        timeout: float = 30.0,
+        max_connections: int = 20,
+        max_retries: int = 1,
+        cache: Optional[TranscriptionCache] = None,
+        transport: Optional[httpx.AsyncBaseTransport] = None,
+    ):
+        self.timeout = timeout
+        self.cache = cache
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._http_client = httpx.AsyncClient(
+            limits=httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_connections,
+            ),
+            timeout=httpx.Timeout(timeout, connect=min(timeout, 5.0)),
+            # Tests pass httpx.ASGITransport(app=tests.fake_spitch.create_app(...))
+            transport=transport,
+        )
+        self._client = AsyncSpitch(
+            api_key=api_key,
+            base_url=base_url,
+            timeout=timeout,
+            max_retries=max_retries,
+            http_client=self._http_client,
+        )
+
+    async def transcribe(self, language: str, content, content_sha256: Optional[str] = None,
+                         use_cache: bool = True) -> dict:
+        """Transcribe audio bytes (or a file object, with its ``content_sha256``)"""
+        language = to_spitch_language(language)
+        use_cache = use_cache and self.cache is not None
+        if use_cache and content_sha256 is None and isinstance(content, bytes):
+            content_sha256 = hashlib.sha256(content).hexdigest()
+        if use_cache and content_sha256 is not None:
+            cached = await self.cache.get(content_sha256, language)
+            if cached is not None:
+                return {**cached, "cached": True}
+
+        try:
+            result = await asyncio.wait_for(
+                self._transcribe(language, content),
+                timeout=self.timeout,
             )
-        
-        # Forward audio to Spitch API
-        async with httpx.AsyncClient() as client:
-            files = {"audio": (audio_file.filename, await audio_file.read(), audio_file.content_type)}
-            headers = {"Authorization": f"Bearer {settings.SPITCH_API_KEY}"}
-            response = await client.post(
-                f"{settings.SPITCH_API_URL}?language={spitch_language}",
-                files=files,
-                headers=headers
+        except asyncio.TimeoutError:
+            raise UpstreamError(504, "Transcription timed out", retryable=True)
+        except APIStatusError as e:
+            if e.status_code in REJECTED_STATUS:
+                raise UpstreamError(
+                    422, f"Transcription rejected the audio or language ({e.status_code})", e.status_code
+                )
+            raise UpstreamError(
+                502,
+                f"Transcription failed upstream ({e.status_code})",
+                e.status_code,
+                retryable=e.status_code in (408, 429) or e.status_code >= 500,
             )
-            
-            if response.status_code != 200:
-                raise HTTPException(status_code=response.status_code, detail="Transcription failed")
-            
-            result = response.json()
-            return {
-                "transcript": result.get("transcript", ""),
-                "confidence": result.get("confidence", 0),
-                "normalized_text": normalize_text(result.get("transcript", ""))
-            }
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
\ No newline at end of file
+        except APIConnectionError as e:
+            raise UpstreamError(502, f"Transcription service unreachable: {str(e)}", retryable=True)
+
+        if use_cache and content_sha256 is not None:
+            await self.cache.set(content_sha256, language, result)
+        return {**result, "cached": False}
+
+    async def _transcribe(self, language: str, content) -> dict:
+        async with self._semaphore:
+            with span("upstream_transcription"):
+                response = await self._client.speech.transcribe(
+                    language=language,
+                    content=content
+                )
+        return {
+            "request_id": getattr(response, "request_id", None),
+            "transcript": response.text or ""
+        }
+
+    async def aclose(self):
+        await self._http_client.aclose()
+
+
+_service: Optional[TranscriptionService] = None
+
+def get_transcription_service() -> TranscriptionService:
+    """Return the worker-wide transcription service, creating it on first use"""
+    global _service
+    if _service is None:
+        with startup_report.phase("transcription_client"):
+            _service = TranscriptionService(
+                api_key=settings.SPITCH_API_KEY,
+                base_url=settings.SPITCH_BASE_URL,
+                max_concurrency=settings.TRANSCRIBE_MAX_CONCURRENCY,
+                timeout=settings.TRANSCRIBE_TIMEOUT_SECONDS,
+                max_connections=settings.TRANSCRIBE_MAX_CONNECTIONS,
+                cache=build_transcription_cache(),
+            )
+    return _service
+
+def current_transcription_service() -> Optional[TranscriptionService]:
+    """The service if something has used it already; never creates it"""
+    return _service
+
+async def close_transcription_service():
+    global _service
+    if _service is not None:
+        await _service.aclose()
+        _service = None
@@ -0,0 +1,194 @@
+# app/services/streaming.py
+import asyncio
+import codecs
+import hashlib
+from abc import ABC, abstractmethod
+from typing import Optional
+
+from app.core.config import settings
+from app.services.spitch import TranscriptionService, get_transcription_service
+
+
+class TranscriptionStream(ABC):
+    """One utterance being recognized while it is still being recorded"""
+
+    @abstractmethod
+    async def feed(self, chunk: bytes) -> Optional[str]:
+        """Add audio; returns a newer partial transcript when one is ready"""
+
+    @abstractmethod
+    async def finish(self) -> dict:
+        """Final ``{"request_id", "transcript", "cached"}`` for the whole stream"""
+
+    async def aclose(self):
+        pass
+
+
+class StreamingTranscriber(ABC):
+    """Opens a TranscriptionStream per utterance"""
+
+    @abstractmethod
+    def open(self, language: str, content_type: Optional[str] = None) -> TranscriptionStream:
+        ...
+
+
+class PartialSlots:
+    """Non-blocking cap on upstream partial calls in flight across streams"""
+
+    def __init__(self, limit: int):
+        self.limit = limit
+        self.in_use = 0
+
+    def try_acquire(self) -> bool:
+        if self.in_use >= self.limit:
+            return False
+        self.in_use += 1
+        return True
+
+    def release(self):
+        self.in_use -= 1
+
+
+class ChunkedTranscriptionStream(TranscriptionStream):
+    """Spitch has no streaming API, so partials come from re-transcribing
+    everything received so far.
+
+    Each partial re-sends the whole buffer, so they are spaced out
+    geometrically: the next one waits for ``partial_bytes`` more audio and
+    for the buffer to reach ``growth`` times what was last sent, and there
+    are at most ``max_partials`` per stream. Upstream bytes then grow
+    linearly with the utterance rather than quadratically. At most one
+    partial is in flight per stream, and ``partial_slots`` (shared by every
+    stream on the worker) caps them overall. When every slot is taken the
+    partial is skipped, not queued, so partials never hold up full
+    transcriptions. ``feed`` never waits for a partial, and partials bypass
+    the transcript cache. Recorders that emit a self-describing stream
+    (MediaRecorder webm/ogg chunks, WAV) produce a decodable prefix at every
+    chunk boundary.
+    """
+
+    def __init__(self, service: TranscriptionService, language: str, partial_bytes: int,
+                 content_type: Optional[str] = None, growth: float = 1.5, max_partials: int = 8,
+                 partial_slots: Optional[PartialSlots] = None):
+        self.service = service
+        self.language = language
+        self.content_type = content_type
+        self.partial_bytes = partial_bytes
+        self.growth = growth
+        self.max_partials = max_partials
+        self.partial_slots = partial_slots or PartialSlots(1)
+        self.partials = 0
+        self._buffer = bytearray()
+        self._transcribed_size = 0
+        self._pending: Optional[asyncio.Task] = None
+
+    async def feed(self, chunk: bytes) -> Optional[str]:
+        self._buffer.extend(chunk)
+        partial = None
+        if self._pending is not None and self._pending.done():
+            task, self._pending = self._pending, None
+            if not task.cancelled() and task.exception() is None:
+                partial = task.result()["transcript"]
+        if self._pending is None and self._partial_due() and self.partial_slots.try_acquire():
+            self._transcribed_size = len(self._buffer)
+            self.partials += 1
+            self._pending = asyncio.create_task(
+                self.service.transcribe(self.language, self._content(bytes(self._buffer)), use_cache=False)
+            )
+            # Also runs if the task is cancelled before it starts
+            self._pending.add_done_callback(lambda _: self.partial_slots.release())
+        return partial
+
+    def _partial_due(self) -> bool:
+        if self.partials >= self.max_partials:
+            return False
+        size = len(self._buffer)
+        return size >= self._transcribed_size + self.partial_bytes and size >= self._transcribed_size * self.growth
+
+    async def finish(self) -> dict:
+        await self.aclose()
+        content = bytes(self._buffer)
+        return await self.service.transcribe(
+            self.language, self._content(content), content_sha256=hashlib.sha256(content).hexdigest()
+        )
+
+    def _content(self, data: bytes):
+        return ("audio", data, self.content_type) if self.content_type else data
+
+    async def aclose(self):
+        if self._pending is not None:
+            self._pending.cancel()
+            await asyncio.gather(self._pending, return_exceptions=True)
+            self._pending = None
+
+
+class ChunkedTranscriber(StreamingTranscriber):
+    def __init__(self, service: TranscriptionService, partial_bytes: int = 32 * 1024, growth: float = 1.5,
+                 max_partials: int = 8, partial_concurrency: int = 3):
+        self.service = service
+        self.partial_bytes = partial_bytes
+        self.growth = growth
+        self.max_partials = max_partials
+        # One budget for every stream on the worker
+        self.partial_slots = PartialSlots(partial_concurrency)
+
+    def open(self, language: str, content_type: Optional[str] = None) -> TranscriptionStream:
+        return ChunkedTranscriptionStream(
+            self.service, language, self.partial_bytes, content_type,
+            growth=self.growth, max_partials=self.max_partials, partial_slots=self.partial_slots,
+        )
+
+
+class FakeTranscriptionStream(TranscriptionStream):
+    """Treats the audio frames as UTF-8 text of what was said.
+
+    ``b"mo f"`` followed by ``b"e ra"`` gives the partials "mo f" and
+    "mo fe ra", including the half-heard trailing word a real recognizer
+    produces mid-utterance.
+    """
+
+    def __init__(self, delay: float = 0.0):
+        self.delay = delay
+        self._text = ""
+        # A character split across two frames is decoded once both arrive
+        self._decoder = codecs.getincrementaldecoder("utf-8")(errors="ignore")
+
+    async def feed(self, chunk: bytes) -> Optional[str]:
+        if self.delay:
+            await asyncio.sleep(self.delay)
+        self._text += self._decoder.decode(chunk)
+        return self._text
+
+    async def finish(self) -> dict:
+        return {"request_id": None, "transcript": self._text.strip(), "cached": False}
+
+
+class FakeStreamingTranscriber(StreamingTranscriber):
+    """Offline stand-in for local development and testing"""
+
+    def __init__(self, delay: float = 0.0):
+        self.delay = delay
+
+    def open(self, language: str, content_type: Optional[str] = None) -> TranscriptionStream:
+        return FakeTranscriptionStream(self.delay)
+
+
+_chunked: Optional[ChunkedTranscriber] = None
+
+def get_streaming_transcriber() -> StreamingTranscriber:
+    global _chunked
+    if settings.STREAM_TRANSCRIBER == "fake":
+        return FakeStreamingTranscriber()
+    if settings.STREAM_TRANSCRIBER == "spitch":
+        # Shared so the partial concurrency cap covers every stream on the worker
+        service = get_transcription_service()
+        if _chunked is None or _chunked.service is not service:
+            _chunked = ChunkedTranscriber(
+                service,
+                partial_bytes=settings.STREAM_PARTIAL_BYTES,
+                growth=settings.STREAM_PARTIAL_GROWTH,
+                max_partials=settings.STREAM_MAX_PARTIALS,
+                partial_concurrency=settings.STREAM_PARTIAL_CONCURRENCY,
+            )
+        return _chunked
+    raise ValueError(f"Unknown STREAM_TRANSCRIBER: {settings.STREAM_TRANSCRIBER}")
@@ -0,0 +1,82 @@
+# app/services/target_index.py
+import asyncio
+from typing import Dict, NamedTuple, Optional, Tuple
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.models import LessonItem
+from app.services.scoring import normalize_text
+
+
+class ScoringTarget(NamedTuple):
+    lesson_item_id: int
+    text: str
+    normalized: str
+    tokens: Tuple[str, ...]
+
+
+def build_target(lesson_item_id: int, text: Optional[str], expected_answer: Optional[str],
+                 normalized_answer: Optional[str] = None) -> ScoringTarget:
+    """Attempts are scored against the expected answer, falling back to the text.
+
+    ``normalized_answer`` is the value the catalog import stored; items that
+    predate it are normalized here.
+    """
+    target = expected_answer or text or ""
+    normalized = normalized_answer if normalized_answer is not None else normalize_text(target)
+    return ScoringTarget(lesson_item_id, target, normalized, tuple(normalized.split()))
+
+
+class TargetIndex:
+    """Normalized, tokenized scoring targets keyed by lesson_item_id.
+
+    The whole catalog is loaded with one query on first use; items added
+    afterwards are fetched and indexed one at a time.
+    """
+
+    def __init__(self):
+        self._targets: Dict[int, ScoringTarget] = {}
+        self._loaded = False
+        self._lock = asyncio.Lock()
+
+    async def get(self, db: AsyncSession, lesson_item_id: int) -> Optional[ScoringTarget]:
+        if not self._loaded:
+            await self._load(db)
+        target = self._targets.get(lesson_item_id)
+        if target is None:
+            item = await db.get(LessonItem, lesson_item_id)
+            if item is None:
+                return None
+            target = self.add(item.id, item.text, item.expected_answer, item.normalized_answer)
+        return target
+
+    def add(self, lesson_item_id: int, text: Optional[str], expected_answer: Optional[str],
+            normalized_answer: Optional[str] = None) -> ScoringTarget:
+        target = build_target(lesson_item_id, text, expected_answer, normalized_answer)
+        self._targets[lesson_item_id] = target
+        return target
+
+    def invalidate(self):
+        """Forget everything; the next lookup reloads the catalog"""
+        self._targets = {}
+        self._loaded = False
+
+    def __len__(self):
+        return len(self._targets)
+
+    async def _load(self, db: AsyncSession):
+        async with self._lock:
+            if self._loaded:
+                return
+            result = await db.execute(
+                select(LessonItem.id, LessonItem.text, LessonItem.expected_answer, LessonItem.normalized_answer)
+            )
+            self._targets = {
+                item_id: build_target(item_id, text, expected_answer, normalized_answer)
+                for item_id, text, expected_answer, normalized_answer in result
+            }
+            self._loaded = True
+
+
+target_index = TargetIndex()
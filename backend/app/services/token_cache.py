@@ -0,0 +1,118 @@
+# app/services/token_cache.py
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+from app.core.config import settings
+
+
+class CachedToken:
+    __slots__ = ("claims", "user", "expires_at")
+
+    def __init__(self, claims: Dict[str, Any], user: Dict[str, Any], expires_at: float):
+        self.claims = claims
+        self.user = user  # column snapshot of the User row
+        self.expires_at = expires_at
+
+
+class TokenCache:
+    """Bounded LRU of verified Firebase ID tokens and their user rows.
+
+    Entries expire at the token's own ``exp`` claim, capped by ``ttl`` so a
+    disabled account or edited user row is picked up again within a bounded
+    window. Keys are sha256 digests, the raw tokens are never stored.
+    """
+
+    def __init__(self, max_size: int = 10000, ttl: int = 300):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries: "OrderedDict[str, CachedToken]" = OrderedDict()
+        self._keys_by_uid: Dict[str, set] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _key(token: str) -> str:
+        return hashlib.sha256(token.encode("utf-8")).hexdigest()
+
+    def get(self, token: str) -> Optional[CachedToken]:
+        key = self._key(token)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            if entry.expires_at <= time.time():
+                self._remove(key)
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry
+
+    def put(self, token: str, claims: Dict[str, Any], user: Dict[str, Any]):
+        if self.max_size <= 0:
+            return
+        now = time.time()
+        expires_at = min(float(claims.get("exp", now)), now + self.ttl)
+        if expires_at <= now:
+            return
+
+        key = self._key(token)
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = CachedToken(claims, user, expires_at)
+            self._keys_by_uid.setdefault(claims["uid"], set()).add(key)
+            while len(self._entries) > self.max_size:
+                oldest = next(iter(self._entries))
+                self._remove(oldest)
+                self.evictions += 1
+
+    def invalidate(self, token: str):
+        """Drop a single token, e.g. on sign-out."""
+        with self._lock:
+            self._remove(self._key(token))
+
+    def invalidate_user(self, firebase_uid: str):
+        """Drop every cached token of a user, e.g. after their row changed."""
+        with self._lock:
+            for key in list(self._keys_by_uid.get(firebase_uid, ())):
+                self._remove(key)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._keys_by_uid.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "max_size": self.max_size,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+        }
+
+    def _remove(self, key: str):
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        uid = entry.claims.get("uid")
+        keys = self._keys_by_uid.get(uid)
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self._keys_by_uid[uid]
+
+
+token_cache = TokenCache(
+    max_size=settings.AUTH_CACHE_MAX_SIZE,
+    ttl=settings.AUTH_CACHE_TTL_SECONDS,
+)
@@ -0,0 +1,278 @@
+# app/services/transcription_cache.py
+import asyncio
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+from app.core.config import settings
+
+
+class CacheBackend(ABC):
+    """Storage for cached transcripts; values are small JSON-able dicts"""
+
+    # Backends that touch the filesystem run off the event loop
+    blocking = False
+
+    @abstractmethod
+    def get(self, key: str) -> Optional[dict]:
+        ...
+
+    @abstractmethod
+    def set(self, key: str, value: dict, expires_at: float):
+        ...
+
+    @abstractmethod
+    def clear(self):
+        ...
+
+    def stats(self) -> Dict[str, Any]:
+        return {}
+
+
+class MemoryBackend(CacheBackend):
+    """LRU bounded by the encoded size of its entries"""
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self.size_bytes = 0
+        self.evictions = 0
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[dict]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            value, expires_at, size = entry
+            if expires_at <= time.time():
+                self._pop(key)
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: dict, expires_at: float):
+        size = len(key) + len(json.dumps(value))
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            self._pop(key)
+            self._entries[key] = (value, expires_at, size)
+            self.size_bytes += size
+            while self.size_bytes > self.max_bytes:
+                self._pop(next(iter(self._entries)))
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.size_bytes = 0
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "entries": len(self._entries),
+            "size_bytes": self.size_bytes,
+            "max_bytes": self.max_bytes,
+            "evictions": self.evictions,
+        }
+
+    def _pop(self, key: str):
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self.size_bytes -= entry[2]
+
+
+class DiskBackend(CacheBackend):
+    """One JSON file per key, shared by every worker on the host.
+
+    Each file's mtime is set to its expiry, so a sweep can drop expired
+    entries and, once the directory is over ``max_bytes``, the ones closest
+    to expiring (the oldest) from ``stat`` alone, down to ``LOW_WATER`` of
+    the budget. Writes trigger the sweep: when this process's estimate of
+    the size passes the budget, or ``sweep_seconds`` after the last one.
+    Other workers write to the same directory, so the estimate is refreshed
+    by every sweep rather than trusted.
+    """
+
+    blocking = True
+    LOW_WATER = 0.9
+
+    def __init__(self, directory: str, max_bytes: int, sweep_seconds: float = 300):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.sweep_seconds = sweep_seconds
+        self.size_bytes: Optional[int] = None  # unknown until the first sweep
+        self.entries: Optional[int] = None
+        self.sweeps = 0
+        self.expired = 0
+        self.evictions = 0
+        self._last_sweep = 0.0
+        self._sweep_lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, key[:2], key + ".json")
+
+    def get(self, key: str) -> Optional[dict]:
+        path = self._path(key)
+        try:
+            with open(path, encoding="utf-8") as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if entry["expires_at"] <= time.time():
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+            return None
+        return entry["value"]
+
+    def set(self, key: str, value: dict, expires_at: float):
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # Write then rename so readers never see a partial file
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump({"value": value, "expires_at": expires_at}, f)
+            size = f.tell()
+        os.utime(tmp_path, (expires_at, expires_at))
+        os.replace(tmp_path, path)
+
+        if self.size_bytes is not None:
+            self.size_bytes += size
+        if (
+            self.size_bytes is None
+            or self.size_bytes > self.max_bytes
+            or time.monotonic() - self._last_sweep > self.sweep_seconds
+        ):
+            self.sweep()
+
+    def sweep(self):
+        """Remove expired entries, then the oldest until under LOW_WATER of max_bytes"""
+        # One sweep per process at a time; a write arriving meanwhile doesn't wait
+        if not self._sweep_lock.acquire(blocking=False):
+            return
+        try:
+            now = time.time()
+            live: List[Tuple[float, int, str]] = []
+            for root, _, files in os.walk(self.directory):
+                for name in files:
+                    if not name.endswith(".json"):
+                        continue
+                    path = os.path.join(root, name)
+                    try:
+                        stat = os.stat(path)
+                    except OSError:
+                        continue  # removed by another worker
+                    if stat.st_mtime <= now:
+                        self.expired += self._remove(path)
+                    else:
+                        live.append((stat.st_mtime, stat.st_size, path))
+
+            size = sum(entry[1] for entry in live)
+            if size > self.max_bytes:
+                live.sort()
+                target = self.max_bytes * self.LOW_WATER
+                while live and size > target:
+                    _, entry_size, path = live.pop(0)
+                    size -= entry_size
+                    self.evictions += self._remove(path)
+
+            self.size_bytes = size
+            self.entries = len(live)
+            self.sweeps += 1
+            self._last_sweep = time.monotonic()
+        finally:
+            self._sweep_lock.release()
+
+    @staticmethod
+    def _remove(path: str) -> int:
+        try:
+            os.remove(path)
+            return 1
+        except OSError:
+            return 0
+
+    def clear(self):
+        for root, _, files in os.walk(self.directory):
+            for name in files:
+                if name.endswith(".json"):
+                    os.remove(os.path.join(root, name))
+        self.size_bytes = self.entries = 0
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "entries": self.entries,
+            "size_bytes": self.size_bytes,
+            "max_bytes": self.max_bytes,
+            "sweeps": self.sweeps,
+            "expired": self.expired,
+            "evictions": self.evictions,
+        }
+
+
+class TranscriptionCache:
+    """Transcripts keyed by (sha256 of the audio bytes, language)"""
+
+    def __init__(self, backend: CacheBackend, ttl: int):
+        self.backend = backend
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.stores = 0
+
+    @staticmethod
+    def key(audio_sha256: str, language: str) -> str:
+        return hashlib.sha256(f"{audio_sha256}:{language}".encode()).hexdigest()
+
+    async def get(self, audio_sha256: str, language: str) -> Optional[dict]:
+        value = await self._call(self.backend.get, self.key(audio_sha256, language))
+        if value is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return value
+
+    async def set(self, audio_sha256: str, language: str, value: dict):
+        await self._call(self.backend.set, self.key(audio_sha256, language), value, time.time() + self.ttl)
+        self.stores += 1
+
+    async def _call(self, fn, *args):
+        if self.backend.blocking:
+            return await asyncio.to_thread(fn, *args)
+        return fn(*args)
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "backend": type(self.backend).__name__,
+            "hits": self.hits,
+            "misses": self.misses,
+            "stores": self.stores,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            **self.backend.stats(),
+        }
+
+
+def build_transcription_cache() -> Optional[TranscriptionCache]:
+    backend_name = settings.TRANSCRIPT_CACHE_BACKEND
+    if backend_name == "memory":
+        backend = MemoryBackend(settings.TRANSCRIPT_CACHE_MAX_BYTES)
+    elif backend_name == "disk":
+        backend = DiskBackend(
+            settings.TRANSCRIPT_CACHE_DIR,
+            max_bytes=settings.TRANSCRIPT_CACHE_DISK_MAX_BYTES,
+            sweep_seconds=settings.TRANSCRIPT_CACHE_SWEEP_SECONDS,
+        )
+    elif backend_name in ("", "none"):
+        return None
+    else:
+        raise ValueError(f"Unknown TRANSCRIPT_CACHE_BACKEND: {backend_name}")
+    return TranscriptionCache(backend, ttl=settings.TRANSCRIPT_CACHE_TTL_SECONDS)
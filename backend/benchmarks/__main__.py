@@ -0,0 +1,102 @@
+# benchmarks/__main__.py
+"""Run the benchmarks and write the results as JSON.
+
+    cd backend
+    python -m benchmarks                       # micro and macro
+    python -m benchmarks --only micro --size 5000
+    python -m benchmarks --compare benchmarks/results/<earlier>.json
+
+Results land in benchmarks/results/<UTC timestamp>.json unless --output is
+given, together with the git commit and interpreter so runs can be lined up
+over time. --compare prints the relative change of every median / p50
+against an earlier file.
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+from datetime import datetime, timezone
+
+from benchmarks import macro
+
+# Settings are read on first import of app, so point the database at a
+# scratch SQLite file before anything else is imported
+macro.configure(os.path.join(tempfile.gettempdir(), "oya_speak_bench.db"))
+
+from benchmarks.corpus import build_corpus  # noqa: E402
+from benchmarks.micro import run_micro  # noqa: E402
+
+RESULTS_DIR = os.path.join(os.path.dirname(__file__), "results")
+
+
+def _git_commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def _headline(results: dict) -> dict:
+    """benchmark name -> its median per-call time (micro) or p50 latency (macro)"""
+    values = {}
+    for name, result in results.get("micro", {}).items():
+        values[f"micro.{name}"] = result["per_call_us"]["median"]
+    for name, result in results.get("macro", {}).items():
+        values[f"macro.{name}"] = result["latency_ms"]["p50"]
+    return values
+
+def compare(current: dict, baseline_path: str):
+    with open(baseline_path) as f:
+        baseline = _headline(json.load(f))
+    print(f"{'benchmark':<32}{'baseline':>12}{'current':>12}{'change':>10}")
+    for name, value in _headline(current).items():
+        before = baseline.get(name)
+        change = f"{(value - before) / before * 100:+.1f}%" if before else "new"
+        print(f"{name:<32}{before if before is not None else '-':>12}{value:>12}{change:>10}")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Scoring and request-path benchmarks")
+    parser.add_argument("--only", choices=["micro", "macro"])
+    parser.add_argument("--size", type=int, default=2000, help="corpus samples")
+    parser.add_argument("--seed", type=int, default=1234)
+    parser.add_argument("--repeat", type=int, default=5, help="micro: timed passes over the corpus")
+    parser.add_argument("--requests", type=int, default=200, help="macro: requests per scenario")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--users", type=int, default=20)
+    parser.add_argument("--upstream-ms", type=float, default=0.0, help="macro: simulated Spitch latency")
+    parser.add_argument("--output", help="JSON file to write")
+    parser.add_argument("--compare", help="earlier results JSON to compare against")
+    args = parser.parse_args(argv)
+
+    corpus = build_corpus(args.size, args.seed)
+    results = {
+        "started_at": datetime.now(timezone.utc).isoformat(),
+        "commit": _git_commit(),
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "parameters": vars(args),
+    }
+    if args.only in (None, "micro"):
+        results["micro"] = run_micro(corpus, args.repeat)
+    if args.only in (None, "macro"):
+        results["macro"] = asyncio.run(macro.run_macro(
+            corpus, args.requests, args.concurrency, args.users, args.upstream_ms
+        ))
+
+    output = args.output
+    if output is None:
+        os.makedirs(RESULTS_DIR, exist_ok=True)
+        output = os.path.join(RESULTS_DIR, datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ") + ".json")
+    with open(output, "w") as f:
+        json.dump(results, f, indent=2)
+    print(f"Wrote {output}")
+    if args.compare:
+        compare(results, args.compare)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+# benchmarks/corpus.py
+"""Target/transcript pairs built from python_seed's lessons.
+
+Transcripts imitate what the ASR hands back for a learner: tone marks and
+underdots dropped, words missed, repeated or run together, fillers,
+near-miss spellings, stray casing and punctuation. A fixed seed makes every
+run score the same corpus.
+"""
+import random
+import unicodedata
+from typing import Callable, Dict, List, NamedTuple, Tuple
+
+from python_seed import LESSONS_DATA
+
+FILLERS = {
+    "yo": ["ẹ", "ṣé", "hmm"],
+    "ig": ["ehh", "nà"],
+    "ha": ["to", "ehm"],
+    "en": ["uh", "um", "like"],
+}
+VOWELS = "aeiouẹọ"
+
+
+class Sample(NamedTuple):
+    language: str
+    item: int  # index into lesson_items() of the (first) item spoken
+    target: str
+    transcript: str
+    errors: Tuple[str, ...]
+
+
+def lesson_items() -> List[Tuple[str, str, str]]:
+    """(language, text, expected_answer) for every seeded lesson item"""
+    return [
+        (group["language"], item["text"], item["expected_answer"])
+        for group in LESSONS_DATA
+        for lesson in group["lessons"]
+        for item in lesson["items"]
+    ]
+
+
+def strip_diacritics(words: List[str], rng: random.Random) -> List[str]:
+    return [
+        unicodedata.normalize("NFC", "".join(
+            ch for ch in unicodedata.normalize("NFD", word) if unicodedata.category(ch) != "Mn"
+        ))
+        for word in words
+    ]
+
+def drop_word(words: List[str], rng: random.Random) -> List[str]:
+    if len(words) < 2:
+        return words
+    index = rng.randrange(len(words))
+    return words[:index] + words[index + 1:]
+
+def repeat_word(words: List[str], rng: random.Random) -> List[str]:
+    index = rng.randrange(len(words))
+    return words[:index + 1] + words[index:]
+
+def merge_words(words: List[str], rng: random.Random) -> List[str]:
+    if len(words) < 2:
+        return words
+    index = rng.randrange(len(words) - 1)
+    return words[:index] + [words[index] + words[index + 1]] + words[index + 2:]
+
+def misspell(words: List[str], rng: random.Random) -> List[str]:
+    index = rng.randrange(len(words))
+    word = words[index]
+    if len(word) < 2:
+        return words
+    position = rng.randrange(len(word))
+    if word[position].lower() in VOWELS:
+        replacement = rng.choice(VOWELS)
+    else:
+        replacement = rng.choice("bdfgklmnprstwy")
+    return words[:index] + [word[:position] + replacement + word[position + 1:]] + words[index + 1:]
+
+def noisy_case(words: List[str], rng: random.Random) -> List[str]:
+    words = [word.upper() if rng.random() < 0.2 else word.capitalize() if rng.random() < 0.3 else word
+             for word in words]
+    return words[:-1] + [words[-1] + rng.choice([".", "?", "!", ","])]
+
+ERRORS: Dict[str, Callable[[List[str], random.Random], List[str]]] = {
+    "strip_diacritics": strip_diacritics,
+    "drop_word": drop_word,
+    "repeat_word": repeat_word,
+    "merge_words": merge_words,
+    "misspell": misspell,
+    "noisy_case": noisy_case,
+}
+
+
+def build_corpus(size: int = 2000, seed: int = 1234, long_fraction: float = 0.2) -> List[Sample]:
+    """``size`` samples; ``long_fraction`` of them chain 3-6 items of one language"""
+    rng = random.Random(seed)
+    items = lesson_items()
+    by_language: Dict[str, List[Tuple[str, str, str]]] = {}
+    for item in items:
+        by_language.setdefault(item[0], []).append(item)
+
+    corpus = []
+    for _ in range(size):
+        item = rng.randrange(len(items))
+        language, text, expected = items[item]
+        if rng.random() < long_fraction:
+            chain = [text] + [rng.choice(by_language[language])[1] for _ in range(rng.randint(2, 5))]
+            target = " ".join(chain)
+        else:
+            # The app scores against either the display text or the expected answer
+            target = text if rng.random() < 0.5 else expected
+
+        words = target.split()
+        applied = []
+        if language in FILLERS and rng.random() < 0.25:
+            index = rng.randrange(len(words) + 1)
+            words = words[:index] + [rng.choice(FILLERS[language])] + words[index:]
+            applied.append("filler")
+        for name in rng.sample(sorted(ERRORS), k=rng.choice([0, 1, 1, 2, 2, 3])):
+            words = ERRORS[name](words, rng)
+            applied.append(name)
+        corpus.append(Sample(language, item, target, " ".join(words), tuple(applied)))
+    return corpus
+
+def word_pairs(corpus: List[Sample]) -> List[Tuple[str, str]]:
+    """Target/heard word pairs as the aligner compares them"""
+    pairs = []
+    for sample in corpus:
+        for target, heard in zip(sample.target.lower().split(), sample.transcript.lower().split()):
+            pairs.append((target, heard))
+    return pairs
@@ -0,0 +1,157 @@
+# benchmarks/macro.py
+"""The FastAPI app driven in-process over ASGI.
+
+Firebase token checks and Spitch are stubbed; everything else - routers,
+the token cache, SQLite through aiosqlite, the catalog, scoring, rollups -
+is the real code. ``configure`` must run before anything imports ``app``,
+since settings are read once at import.
+"""
+import asyncio
+import os
+import statistics
+import time
+from collections import Counter
+from typing import Any, Awaitable, Callable, Dict, List
+
+import httpx
+
+from benchmarks.corpus import Sample, lesson_items
+
+
+def configure(db_path: str):
+    os.environ["_DATABASE_URL"] = f"sqlite:///{db_path}"
+    # Every practice request should reach the (stubbed) upstream
+    os.environ.setdefault("TRANSCRIPT_CACHE_BACKEND", "none")
+    if os.path.exists(db_path):
+        os.remove(db_path)
+
+
+class StubTranscriptionService:
+    """Reads the uploaded "audio" back as UTF-8 transcript text"""
+
+    def __init__(self, latency: float = 0.0):
+        self.latency = latency
+
+    async def transcribe(self, language: str, content, content_sha256=None, use_cache: bool = True) -> dict:
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        data = content[1] if isinstance(content, tuple) else content
+        if hasattr(data, "read"):
+            data.seek(0)
+            data = data.read()
+        return {"request_id": "bench", "transcript": data.decode("utf-8"), "cached": False}
+
+def stub_verify_token(token: str) -> dict:
+    return {"uid": token, "email": f"{token}@bench.local", "name": token, "exp": time.time() + 3600}
+
+
+def _summary(latencies: List[float], elapsed: float, statuses: Counter, concurrency: int) -> Dict[str, Any]:
+    ms = sorted(latency * 1000 for latency in latencies)
+    centiles = statistics.quantiles(ms, n=100) if len(ms) > 1 else ms * 99
+    return {
+        "requests": len(ms),
+        "concurrency": concurrency,
+        "statuses": {str(code): count for code, count in sorted(statuses.items())},
+        "requests_per_second": round(len(ms) / elapsed, 1),
+        "latency_ms": {
+            "mean": round(statistics.fmean(ms), 3),
+            "p50": round(centiles[49], 3),
+            "p95": round(centiles[94], 3),
+            "p99": round(centiles[98], 3),
+            "max": round(ms[-1], 3),
+        },
+    }
+
+async def _drive(send: Callable[[int], Awaitable[httpx.Response]], requests: int, concurrency: int):
+    latencies: List[float] = []
+    statuses: Counter = Counter()
+    indexes = iter(range(requests))
+
+    async def worker():
+        for index in indexes:
+            start = time.perf_counter()
+            response = await send(index)
+            latencies.append(time.perf_counter() - start)
+            statuses[response.status_code] += 1
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return _summary(latencies, time.perf_counter() - start, statuses, concurrency)
+
+
+async def run_macro(
+    corpus: List[Sample],
+    requests: int = 200,
+    concurrency: int = 8,
+    users: int = 20,
+    upstream_ms: float = 0.0,
+) -> Dict[str, Any]:
+    from python_seed import seed_lessons_with_expected_answers
+    from app.commands.migrate import migrate
+    from app.main import app
+    from app.db.database import SessionLocal, get_engine
+    from app.db.models import LessonItem
+    from app.services import auth
+    from app.services.spitch import get_transcription_service
+
+    auth.verify_token = stub_verify_token
+    stub = StubTranscriptionService(upstream_ms / 1000)
+    app.dependency_overrides[get_transcription_service] = lambda: stub
+
+    migrate()
+    seed_lessons_with_expected_answers(get_engine())
+    with SessionLocal() as db:
+        rows = db.query(LessonItem.id, LessonItem.lesson_id).order_by(LessonItem.id).all()
+    # Seeding inserts lesson_items() in order, so positions line up with ids
+    items = [(item_id, lesson_id) for (item_id, lesson_id), _ in zip(rows, lesson_items())]
+    short = [sample for sample in corpus if len(sample.target.split()) <= 8] or corpus
+    tokens = [f"bench-user-{n}" for n in range(users)]
+
+    def headers(index: int) -> Dict[str, str]:
+        return {"Authorization": f"Bearer {tokens[index % users]}"}
+
+    def sample(index: int) -> Sample:
+        return short[index % len(short)]
+
+    def item_id(index: int) -> int:
+        return items[sample(index).item][0]
+
+    results: Dict[str, Any] = {}
+    async with app.router.lifespan_context(app):
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            # First sight of each token creates its user
+            for index in range(users):
+                await client.get("/lessons/", headers=headers(index))
+
+            scenarios: Dict[str, Callable[[int], Awaitable[httpx.Response]]] = {
+                "lessons_list": lambda i: client.get("/lessons/", headers=headers(i)),
+                "lesson_items": lambda i: client.get(f"/lessons/{items[i % len(items)][1]}/items", headers=headers(i)),
+                "score": lambda i: client.post("/score/", headers=headers(i), json={
+                    "target_text": corpus[i % len(corpus)].target,
+                    "transcript": corpus[i % len(corpus)].transcript,
+                }),
+                "score_item": lambda i: client.post(
+                    f"/score/items/{item_id(i)}", headers=headers(i), json={"transcript": sample(i).transcript}
+                ),
+                "attempts_create": lambda i: client.post("/attempts/", headers=headers(i), json={
+                    "lesson_item_id": item_id(i),
+                    "transcript": sample(i).transcript,
+                    "score": 75.0,
+                    "word_feedback": [],
+                }),
+                "practice": lambda i: client.post(
+                    f"/practice/{item_id(i)}",
+                    headers=headers(i),
+                    files={"audio_file": ("clip.webm", sample(i).transcript.encode("utf-8"), "audio/webm")},
+                ),
+                "attempts_list": lambda i: client.get("/attempts/?limit=20", headers=headers(i)),
+                "leaderboard": lambda i: client.get("/leaderboard/", headers=headers(i)),
+                "progress": lambda i: client.get("/progress/", headers=headers(i)),
+                "flashcards_due": lambda i: client.get("/flashcards/due", headers=headers(i)),
+            }
+            for name, send in scenarios.items():
+                results[name] = await _drive(send, requests, concurrency)
+
+    app.dependency_overrides.pop(get_transcription_service, None)
+    return results
@@ -0,0 +1,57 @@
+# benchmarks/micro.py
+"""Per-call timings of the pure scoring functions over a corpus"""
+import statistics
+import time
+from typing import Any, Callable, Dict, List
+
+from app.services.scoring import (
+    align_words, normalize_text, score_attempt, score_attempts_batch, similarity_ratio, tokenize,
+)
+from benchmarks.corpus import Sample, word_pairs
+
+
+def measure(fn: Callable[[], Any], calls: int, repeat: int) -> Dict[str, Any]:
+    """Time ``repeat`` runs of ``fn`` (which makes ``calls`` calls); one warm-up run"""
+    fn()
+    runs = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        runs.append(time.perf_counter() - start)
+    per_call = [run / calls * 1e6 for run in runs]
+    return {
+        "calls": calls,
+        "repeat": repeat,
+        "per_call_us": {
+            "min": round(min(per_call), 3),
+            "median": round(statistics.median(per_call), 3),
+            "mean": round(statistics.fmean(per_call), 3),
+            "max": round(max(per_call), 3),
+        },
+        "calls_per_second": round(calls / statistics.median(runs)),
+    }
+
+def run_micro(corpus: List[Sample], repeat: int = 5) -> Dict[str, Any]:
+    texts = [sample.transcript for sample in corpus] + [sample.target for sample in corpus]
+    pairs = word_pairs(corpus)
+    tokenized = [(tokenize(sample.target), tokenize(sample.transcript)) for sample in corpus]
+    triples = [(sample.target, sample.transcript, 1.0) for sample in corpus]
+    long_corpus = [sample for sample in corpus if len(sample.target.split()) > 8]
+
+    benchmarks = {
+        "normalize_text": (lambda: [normalize_text(text) for text in texts], len(texts)),
+        "similarity_ratio": (lambda: [similarity_ratio(a, b) for a, b in pairs], len(pairs)),
+        "align_words": (lambda: [align_words(t, h) for t, h in tokenized], len(tokenized)),
+        "score_attempt": (
+            lambda: [score_attempt(s.target, s.transcript, 1.0) for s in corpus], len(corpus)
+        ),
+        "score_attempt_long": (
+            lambda: [score_attempt(s.target, s.transcript, 1.0) for s in long_corpus], len(long_corpus)
+        ),
+        "score_attempts_batch": (lambda: score_attempts_batch(triples), len(triples)),
+    }
+    return {
+        name: measure(fn, calls, repeat)
+        for name, (fn, calls) in benchmarks.items()
+        if calls
+    }
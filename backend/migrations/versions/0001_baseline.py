@@ -0,0 +1,91 @@
+"""Baseline: the schema create_all used to build at import
+
+Databases created before migrations existed are at this revision;
+``python -m app.commands.migrate`` stamps them automatically.
+
+Revision ID: 0001_baseline
+Revises:
+Create Date: 2026-10-18
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0001_baseline"
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "users",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("firebase_uid", sa.String()),
+        sa.Column("email", sa.String()),
+        sa.Column("name", sa.String()),
+        sa.Column("xp", sa.Integer()),
+        sa.Column("streak", sa.Integer()),
+        sa.Column("created_at", sa.DateTime()),
+    )
+    op.create_index("ix_users_id", "users", ["id"])
+    op.create_index("ix_users_firebase_uid", "users", ["firebase_uid"], unique=True)
+    op.create_index("ix_users_email", "users", ["email"], unique=True)
+
+    op.create_table(
+        "lessons",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("language", sa.String()),
+        sa.Column("title", sa.String()),
+        sa.Column("level", sa.String()),
+        sa.Column("created_at", sa.DateTime()),
+    )
+    op.create_index("ix_lessons_id", "lessons", ["id"])
+
+    op.create_table(
+        "user_preferences",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("user_id", sa.Integer(), sa.ForeignKey("users.id")),
+        sa.Column("target_language", sa.String()),
+        sa.Column("created_at", sa.DateTime()),
+        sa.Column("updated_at", sa.DateTime()),
+    )
+    op.create_index("ix_user_preferences_id", "user_preferences", ["id"])
+
+    op.create_table(
+        "lesson_items",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("lesson_id", sa.Integer(), sa.ForeignKey("lessons.id")),
+        sa.Column("text", sa.String()),
+        sa.Column("expected_answer", sa.String()),
+        sa.Column("audio_url", sa.String()),
+        sa.Column("hint", sa.String()),
+    )
+    op.create_index("ix_lesson_items_id", "lesson_items", ["id"])
+
+    op.create_table(
+        "attempts",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("user_id", sa.Integer(), sa.ForeignKey("users.id")),
+        sa.Column("lesson_item_id", sa.Integer(), sa.ForeignKey("lesson_items.id")),
+        sa.Column("transcript", sa.String()),
+        sa.Column("score", sa.Float()),
+        sa.Column("word_feedback", sa.JSON()),
+        sa.Column("created_at", sa.DateTime()),
+    )
+    op.create_index("ix_attempts_id", "attempts", ["id"])
+
+    op.create_table(
+        "flashcards",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("user_id", sa.Integer(), sa.ForeignKey("users.id")),
+        sa.Column("text", sa.String()),
+        sa.Column("times_wrong", sa.Integer()),
+        sa.Column("last_seen", sa.DateTime()),
+    )
+    op.create_index("ix_flashcards_id", "flashcards", ["id"])
+
+
+def downgrade():
+    for table in ("flashcards", "attempts", "lesson_items", "user_preferences", "lessons", "users"):
+        op.drop_table(table)
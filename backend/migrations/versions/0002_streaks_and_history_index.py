@@ -0,0 +1,33 @@
+"""Streak day on users, (user_id, created_at) index on attempts
+
+last_activity_date is filled from each user's latest attempt, so streaks
+carry on across the upgrade instead of restarting at 1.
+
+Revision ID: 0002_streaks_and_history_index
+Revises: 0001_baseline
+Create Date: 2026-10-18
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0002_streaks_and_history_index"
+down_revision = "0001_baseline"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column("users", sa.Column("last_activity_date", sa.Date()))
+    op.create_index("ix_attempts_user_id_created_at", "attempts", ["user_id", "created_at"])
+    # date() is the same on SQLite (an ISO string, as sa.Date stores it) and Postgres
+    op.execute(
+        "UPDATE users SET last_activity_date = "
+        "(SELECT date(MAX(created_at)) FROM attempts WHERE attempts.user_id = users.id)"
+    )
+
+
+def downgrade():
+    op.drop_index("ix_attempts_user_id_created_at", table_name="attempts")
+    with op.batch_alter_table("users") as batch:
+        batch.drop_column("last_activity_date")
@@ -0,0 +1,47 @@
+"""SM-2 schedule on flashcards, one card per (user, word)
+
+Revision ID: 0003_flashcard_schedule
+Revises: 0002_streaks_and_history_index
+Create Date: 2026-10-18
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0003_flashcard_schedule"
+down_revision = "0002_streaks_and_history_index"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Keep the oldest card of any duplicates so the unique constraint holds
+    op.execute(
+        "DELETE FROM flashcards WHERE id NOT IN "
+        "(SELECT keep_id FROM (SELECT MIN(id) AS keep_id FROM flashcards GROUP BY user_id, text) AS keep)"
+    )
+    with op.batch_alter_table("flashcards") as batch:
+        batch.add_column(sa.Column("lesson_item_id", sa.Integer()))
+        batch.add_column(sa.Column("due_at", sa.DateTime()))
+        batch.add_column(sa.Column("interval_days", sa.Float()))
+        batch.add_column(sa.Column("ease", sa.Float()))
+        batch.add_column(sa.Column("repetitions", sa.Integer()))
+        batch.create_foreign_key(
+            "fk_flashcards_lesson_item_id_lesson_items", "lesson_items", ["lesson_item_id"], ["id"]
+        )
+        batch.create_unique_constraint("uq_flashcards_user_id_text", ["user_id", "text"])
+    op.create_index("ix_flashcards_user_id_due_at", "flashcards", ["user_id", "due_at"])
+    # Existing cards start a fresh schedule and are due straight away
+    op.execute(
+        "UPDATE flashcards SET due_at = COALESCE(last_seen, CURRENT_TIMESTAMP), "
+        "interval_days = 0, ease = 2.5, repetitions = 0"
+    )
+
+
+def downgrade():
+    op.drop_index("ix_flashcards_user_id_due_at", table_name="flashcards")
+    with op.batch_alter_table("flashcards") as batch:
+        batch.drop_constraint("uq_flashcards_user_id_text", type_="unique")
+        batch.drop_constraint("fk_flashcards_lesson_item_id_lesson_items", type_="foreignkey")
+        for column in ("repetitions", "ease", "interval_days", "due_at", "lesson_item_id"):
+            batch.drop_column(column)
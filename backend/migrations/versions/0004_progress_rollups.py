@@ -0,0 +1,63 @@
+"""item_progress and daily_progress rollups
+
+The tables are filled from the existing attempts with the same queries as
+``python -m app.commands.backfill_progress``, written out here so the
+migration doesn't depend on the current models.
+
+Revision ID: 0004_progress_rollups
+Revises: 0003_flashcard_schedule
+Create Date: 2026-10-18
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0004_progress_rollups"
+down_revision = "0003_flashcard_schedule"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "item_progress",
+        sa.Column("user_id", sa.Integer(), sa.ForeignKey("users.id"), primary_key=True),
+        sa.Column("lesson_item_id", sa.Integer(), sa.ForeignKey("lesson_items.id"), primary_key=True),
+        sa.Column("attempts", sa.Integer(), nullable=False),
+        sa.Column("total_score", sa.Float(), nullable=False),
+        sa.Column("best_score", sa.Float()),
+        sa.Column("last_score", sa.Float()),
+        sa.Column("last_attempt_at", sa.DateTime()),
+    )
+    op.create_table(
+        "daily_progress",
+        sa.Column("user_id", sa.Integer(), sa.ForeignKey("users.id"), primary_key=True),
+        sa.Column("day", sa.Date(), primary_key=True),
+        sa.Column("attempts", sa.Integer(), nullable=False),
+        sa.Column("total_score", sa.Float(), nullable=False),
+        sa.Column("xp", sa.Integer(), nullable=False),
+    )
+
+    # xp is int(score) as record_attempt computes it; Postgres rounds on cast
+    xp = "CAST(TRUNC(score) AS INTEGER)" if op.get_context().dialect.name == "postgresql" else "CAST(score AS INTEGER)"
+    op.execute(
+        "INSERT INTO item_progress "
+        "(user_id, lesson_item_id, attempts, total_score, best_score, last_score, last_attempt_at) "
+        "SELECT user_id, lesson_item_id, COUNT(*), SUM(score), MAX(score), "
+        "MAX(CASE WHEN position = 1 THEN score END), MAX(created_at) "
+        "FROM (SELECT user_id, lesson_item_id, score, created_at, ROW_NUMBER() OVER "
+        "(PARTITION BY user_id, lesson_item_id ORDER BY created_at DESC, id DESC) AS position "
+        "FROM attempts WHERE score IS NOT NULL AND lesson_item_id IS NOT NULL) AS ranked "
+        "GROUP BY user_id, lesson_item_id"
+    )
+    op.execute(
+        "INSERT INTO daily_progress (user_id, day, attempts, total_score, xp) "
+        f"SELECT user_id, date(created_at), COUNT(*), SUM(score), SUM({xp}) FROM attempts "
+        "WHERE score IS NOT NULL AND lesson_item_id IS NOT NULL AND created_at IS NOT NULL "
+        "GROUP BY user_id, date(created_at)"
+    )
+
+
+def downgrade():
+    op.drop_table("daily_progress")
+    op.drop_table("item_progress")
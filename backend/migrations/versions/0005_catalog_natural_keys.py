@@ -0,0 +1,35 @@
+"""Natural keys on lessons and lesson items, stored normalized answers
+
+Lessons are unique on (language, level, title) and items on (lesson_id,
+text), which app.commands.import_catalog upserts on. normalized_answer
+starts out empty (scoring normalizes on the fly until then) and is filled
+in by the next catalog import.
+
+Revision ID: 0005_catalog_natural_keys
+Revises: 0004_progress_rollups
+Create Date: 2026-10-18
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0005_catalog_natural_keys"
+down_revision = "0004_progress_rollups"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table("lessons") as batch:
+        batch.create_unique_constraint("uq_lessons_language_level_title", ["language", "level", "title"])
+    with op.batch_alter_table("lesson_items") as batch:
+        batch.add_column(sa.Column("normalized_answer", sa.String()))
+        batch.create_unique_constraint("uq_lesson_items_lesson_id_text", ["lesson_id", "text"])
+
+
+def downgrade():
+    with op.batch_alter_table("lesson_items") as batch:
+        batch.drop_constraint("uq_lesson_items_lesson_id_text", type_="unique")
+        batch.drop_column("normalized_answer")
+    with op.batch_alter_table("lessons") as batch:
+        batch.drop_constraint("uq_lessons_language_level_title", type_="unique")
@@ -0,0 +1,31 @@
+"""One preferences row per user
+
+The preferences endpoints used to insert a row whenever they found none,
+so concurrent first requests could leave a user with several. The row the
+API has been reading and updating (the oldest) is kept.
+
+Revision ID: 0006_unique_user_preferences
+Revises: 0005_catalog_natural_keys
+Create Date: 2026-10-18
+"""
+from alembic import op
+
+
+revision = "0006_unique_user_preferences"
+down_revision = "0005_catalog_natural_keys"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.execute(
+        "DELETE FROM user_preferences WHERE id NOT IN "
+        "(SELECT keep_id FROM (SELECT MIN(id) AS keep_id FROM user_preferences GROUP BY user_id) AS keep)"
+    )
+    with op.batch_alter_table("user_preferences") as batch:
+        batch.create_unique_constraint("uq_user_preferences_user_id", ["user_id"])
+
+
+def downgrade():
+    with op.batch_alter_table("user_preferences") as batch:
+        batch.drop_constraint("uq_user_preferences_user_id", type_="unique")
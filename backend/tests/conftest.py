@@ -0,0 +1,65 @@
+# tests/conftest.py
+import asyncio
+import os
+import tempfile
+import time
+
+# Point the app at a throwaway SQLite file before anything reads its settings
+_DB_DIR = tempfile.mkdtemp(prefix="oya-tests-")
+os.environ["_DATABASE_URL"] = "sqlite:///" + os.path.join(_DB_DIR, "test.db")
+os.environ.pop("ASYNC_DATABASE_URL", None)
+
+import pytest
+
+
+@pytest.fixture
+def anyio_backend():
+    # Async tests run on asyncio only (the app never runs on trio)
+    return "asyncio"
+
+
+def _reset_worker_state():
+    from app.services.catalog import lesson_catalog
+    from app.services.ranking import leaderboard_index
+    from app.services.target_index import target_index
+    from app.services.token_cache import token_cache
+
+    token_cache.clear()
+    lesson_catalog.invalidate()
+    target_index.invalidate()
+    leaderboard_index.invalidate()
+
+
+@pytest.fixture
+def database():
+    """A fresh schema (the models' create_all) and empty per-worker caches"""
+    from app.db import models  # noqa: F401  registers the tables
+    from app.db.database import Base, dispose_engines, get_engine
+
+    engine = get_engine()
+    Base.metadata.drop_all(engine)
+    Base.metadata.create_all(engine)
+    _reset_worker_state()
+    yield engine
+    _reset_worker_state()
+    asyncio.run(dispose_engines())
+
+
+@pytest.fixture
+def fake_auth(monkeypatch):
+    """Accept any bearer token; the token doubles as the Firebase UID"""
+    from app.services import auth
+
+    monkeypatch.setattr(auth, "verify_token", lambda token: {
+        "uid": token, "email": f"{token}@example.com", "name": token, "exp": time.time() + 3600,
+    })
+
+
+@pytest.fixture
+def client(database, fake_auth):
+    from fastapi.testclient import TestClient
+    from app.main import app
+
+    with TestClient(app) as test_client:
+        yield test_client
+
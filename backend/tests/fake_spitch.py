@@ -0,0 +1,58 @@
+# tests/fake_spitch.py
+"""Stand-in for the Spitch API, for tests and local development.
+
+Tests mount it in-process:
+
+    fake = FakeSpitch(delay=0.05)
+    service = TranscriptionService("key", base_url="http://fake-spitch",
+                                   transport=httpx.ASGITransport(app=create_app(fake)))
+
+and it can also be served for a local API (``SPITCH_BASE_URL=http://127.0.0.1:8765``):
+
+    python -m uvicorn tests.fake_spitch:app --port 8765
+
+Transcripts read ``"<language>:<bytes>"``, so a test can tell which audio
+reached the upstream.
+"""
+import asyncio
+from typing import Optional
+
+from fastapi import FastAPI, File, Form, UploadFile
+from fastapi.responses import JSONResponse
+
+
+class FakeSpitch:
+    """Behaviour of the fake, changeable between requests"""
+
+    def __init__(self, delay: float = 0.0, status: int = 200, text: Optional[str] = None):
+        self.delay = delay
+        self.status = status
+        self.text = text
+        self.requests = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+
+def create_app(fake: FakeSpitch) -> FastAPI:
+    app = FastAPI()
+
+    @app.post("/v1/transcriptions")
+    async def transcriptions(content: UploadFile = File(...), language: str = Form(None)):
+        fake.requests += 1
+        fake.in_flight += 1
+        fake.max_in_flight = max(fake.max_in_flight, fake.in_flight)
+        try:
+            data = await content.read()
+            if fake.delay:
+                await asyncio.sleep(fake.delay)
+            if fake.status != 200:
+                return JSONResponse({"message": f"fake error {fake.status}"}, status_code=fake.status)
+            text = fake.text if fake.text is not None else f"{language}:{len(data)}"
+            return {"request_id": f"fake-{fake.requests}", "text": text}
+        finally:
+            fake.in_flight -= 1
+
+    return app
+
+
+app = create_app(FakeSpitch(delay=0.2))
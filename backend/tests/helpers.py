@@ -0,0 +1,33 @@
+# tests/helpers.py
+
+def auth_headers(token: str = "learner") -> dict:
+    return {"Authorization": f"Bearer {token}"}
+
+
+def seed_lesson(engine, language: str = "yo", texts=("Báwo ni", "Ẹ káàrọ̀")) -> dict:
+    """One lesson with an item per text; returns {"lesson_id", "item_ids"}"""
+    from app.db.database import SessionLocal
+    from app.db.models import Lesson, LessonItem
+
+    with SessionLocal() as session:
+        lesson = Lesson(language=language, title="Greetings", level="beginner")
+        session.add(lesson)
+        session.flush()
+        items = [LessonItem(lesson_id=lesson.id, text=text) for text in texts]
+        session.add_all(items)
+        session.commit()
+        return {"lesson_id": lesson.id, "item_ids": [item.id for item in items]}
+
+
+def wav_bytes(seconds: float = 0.5, rate: int = 16000) -> bytes:
+    """A silent mono 16-bit WAV clip"""
+    import io
+    import wave
+
+    buffer = io.BytesIO()
+    with wave.open(buffer, "wb") as clip:
+        clip.setnchannels(1)
+        clip.setsampwidth(2)
+        clip.setframerate(rate)
+        clip.writeframes(b"\0\0" * int(seconds * rate))
+    return buffer.getvalue()
@@ -0,0 +1,145 @@
+# tests/test_attempt_buffer.py
+import asyncio
+from datetime import date, datetime
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import func, select
+from sqlalchemy.exc import NoResultFound
+
+from app.db.database import AsyncSessionLocal, SessionLocal
+from app.db.models import Attempt, DailyProgress, User
+from app.services.attempt_buffer import AttemptBuffer, PendingAttempt
+from tests.helpers import seed_lesson
+
+pytestmark = pytest.mark.anyio
+
+MISSING_USER = 9999
+
+
+@pytest.fixture
+def learners(database):
+    """Two users and a lesson item; returns (user ids, item id)"""
+    item_id = seed_lesson(database)["item_ids"][0]
+    with SessionLocal() as session:
+        users = [User(firebase_uid=name, email=f"{name}@example.com", name=name) for name in ("ade", "bisi")]
+        session.add_all(users)
+        session.commit()
+        return [user.id for user in users], item_id
+
+
+async def count_attempts() -> int:
+    async with AsyncSessionLocal() as db:
+        return await db.scalar(select(func.count()).select_from(Attempt))
+
+
+async def test_flush_ack_returns_xp_after_commit(learners):
+    (ade, _), item_id = learners
+    buffer = AttemptBuffer(flush_ms=5000, max_rows=2)
+    results = await asyncio.gather(
+        buffer.submit(ade, "ade", item_id, "bawo ni", 80.0, []),
+        buffer.submit(ade, "ade", item_id, "bawo", 45.5, []),
+    )
+    # Two rows fill the batch, so it is written without waiting out flush_ms
+    assert results == [(125, 1), (125, 1)]
+    assert await count_attempts() == 2
+    assert buffer.stats()["flushes"] == 1
+    await buffer.shutdown()
+
+async def test_enqueue_ack_returns_before_the_write(learners):
+    (ade, _), item_id = learners
+    buffer = AttemptBuffer(ack="enqueue", flush_ms=5000)
+    assert await buffer.submit(ade, "ade", item_id, "bawo ni", 80.0, []) == (None, None)
+    assert await count_attempts() == 0
+    await buffer.shutdown()
+    assert await count_attempts() == 1
+
+async def test_full_buffer_answers_429(learners):
+    (ade, _), item_id = learners
+    buffer = AttemptBuffer(ack="enqueue", flush_ms=5000, max_pending=1)
+    await buffer.submit(ade, "ade", item_id, "bawo ni", 80.0, [])
+    with pytest.raises(HTTPException) as raised:
+        await buffer.submit(ade, "ade", item_id, "bawo ni", 80.0, [])
+    assert raised.value.status_code == 429
+    assert raised.value.headers == {"Retry-After": "1"}
+    assert buffer.stats()["rejected"] == 1
+    await buffer.shutdown()
+    assert await count_attempts() == 1
+
+async def test_bad_row_fails_alone(learners):
+    (ade, bisi), item_id = learners
+    buffer = AttemptBuffer(flush_ms=5000, max_rows=3)
+    results = await asyncio.gather(
+        buffer.submit(ade, "ade", item_id, "bawo ni", 80.0, []),
+        buffer.submit(MISSING_USER, None, item_id, "bawo ni", 80.0, []),
+        buffer.submit(bisi, "bisi", item_id, "bawo", 40.0, []),
+        return_exceptions=True,
+    )
+    assert results[0] == (80, 1)
+    assert isinstance(results[1], NoResultFound)
+    assert results[2] == (40, 1)
+    stats = buffer.stats()
+    assert (stats["isolated_flushes"], stats["failed"]) == (1, 1)
+    assert stats["last_error"].startswith("NoResultFound")
+    assert await count_attempts() == 2
+    await buffer.shutdown()
+
+async def test_failed_batch_retries_every_row(learners):
+    (ade, bisi), item_id = learners
+    buffer = AttemptBuffer(flush_ms=5000, max_rows=2)
+
+    async def broken_write(batch):
+        raise RuntimeError("connection reset")
+
+    buffer._write = broken_write
+    results = await asyncio.gather(
+        buffer.submit(ade, "ade", item_id, "bawo ni", 80.0, []),
+        buffer.submit(bisi, "bisi", item_id, "bawo", 40.0, []),
+    )
+    assert results == [(80, 1), (40, 1)]
+    assert buffer.stats()["isolated_flushes"] == 1
+    assert buffer.stats()["failed"] == 0
+    await buffer.shutdown()
+
+async def test_xp_is_summed_per_user_and_day(learners):
+    (ade, bisi), item_id = learners
+    buffer = AttemptBuffer()
+
+    def attempt(user_id, score, created_at):
+        return PendingAttempt(user_id, None, item_id, "bawo", score, [], created_at, None)
+
+    await buffer._flush([
+        attempt(ade, 50.9, datetime(2026, 3, 2, 8)),
+        attempt(bisi, 30.0, datetime(2026, 3, 1, 9)),
+        attempt(ade, 20.0, datetime(2026, 3, 1, 9)),
+        attempt(ade, 10.0, datetime(2026, 3, 2, 9)),
+    ])
+
+    async with AsyncSessionLocal() as db:
+        users = {user.id: user for user in await db.scalars(select(User))}
+        days = {
+            (row.user_id, row.day): (row.attempts, row.xp)
+            for row in await db.scalars(select(DailyProgress))
+        }
+    # Days are applied in order, so ade's streak runs across both
+    assert (users[ade].xp, users[ade].streak, users[ade].last_activity_date) == (80, 2, date(2026, 3, 2))
+    assert (users[bisi].xp, users[bisi].streak) == (30, 1)
+    assert days == {
+        (ade, date(2026, 3, 1)): (1, 20),
+        (ade, date(2026, 3, 2)): (2, 60),
+        (bisi, date(2026, 3, 1)): (1, 30),
+    }
+    assert buffer.stats()["flushes"] == 1
+
+async def test_shutdown_drains_and_then_refuses(learners):
+    (ade, bisi), item_id = learners
+    buffer = AttemptBuffer(ack="enqueue", flush_ms=5000, max_rows=2)
+    for user_id in (ade, bisi, ade, bisi, ade):
+        await buffer.submit(user_id, None, item_id, "bawo ni", 80.0, [])
+    await buffer.shutdown()
+
+    assert await count_attempts() == 5
+    assert buffer.stats()["pending"] == 0
+    with pytest.raises(HTTPException) as raised:
+        await buffer.submit(ade, "ade", item_id, "bawo ni", 80.0, [])
+    assert raised.value.status_code == 503
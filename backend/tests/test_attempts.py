@@ -0,0 +1,86 @@
+# tests/test_attempts.py
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import select
+
+from app.db.database import SessionLocal
+from app.db.models import Attempt, User
+from tests.helpers import auth_headers, seed_lesson
+
+NOON = datetime(2026, 3, 1, 12)
+
+
+@pytest.fixture
+def attempt_ids(client, database):
+    """Seven of the learner's attempts, newest first; five share one timestamp"""
+    assert client.get("/attempts/", headers=auth_headers()).status_code == 200  # creates the user
+    item_id = seed_lesson(database)["item_ids"][0]
+    created = [NOON - timedelta(minutes=1)] + [NOON] * 5 + [NOON + timedelta(minutes=1)]
+    with SessionLocal() as session:
+        learner = session.scalar(select(User).where(User.firebase_uid == "learner"))
+        other = User(firebase_uid="other", email="other@example.com", name="other")
+        session.add(other)
+        session.flush()
+        attempts = [
+            Attempt(user_id=learner.id, lesson_item_id=item_id, transcript=f"take {n}", score=float(n),
+                    word_feedback=[{"word": "bawo", "status": "correct"}], created_at=created_at)
+            for n, created_at in enumerate(created)
+        ]
+        session.add_all(attempts)
+        session.add(Attempt(user_id=other.id, lesson_item_id=item_id, transcript="not mine", score=1.0,
+                            word_feedback=[], created_at=NOON))
+        session.commit()
+        ordered = sorted(attempts, key=lambda attempt: (attempt.created_at, attempt.id), reverse=True)
+        return [attempt.id for attempt in ordered]
+
+
+def test_cursor_pages_cover_tied_timestamps_once(client, attempt_ids):
+    seen, pages, cursor = [], 0, None
+    while True:
+        params = {"limit": 2, **({"cursor": cursor} if cursor else {})}
+        response = client.get("/attempts/", headers=auth_headers(), params=params)
+        assert response.status_code == 200
+        seen += [attempt["id"] for attempt in response.json()]
+        pages += 1
+        cursor = response.headers.get("X-Next-Cursor")
+        if cursor is None:
+            break
+    assert seen == attempt_ids
+    assert pages == 4
+
+def test_last_full_page_has_no_next_cursor(client, attempt_ids):
+    response = client.get("/attempts/", headers=auth_headers(), params={"limit": len(attempt_ids)})
+    assert [attempt["id"] for attempt in response.json()] == attempt_ids
+    assert "X-Next-Cursor" not in response.headers
+
+def test_invalid_cursor_is_rejected(client, attempt_ids):
+    response = client.get("/attempts/", headers=auth_headers(), params={"cursor": "not-a-cursor"})
+    assert response.status_code == 400
+
+def test_default_fields_leave_out_word_feedback(client, attempt_ids):
+    attempt = client.get("/attempts/", headers=auth_headers()).json()[0]
+    assert set(attempt) == {"id", "lesson_item_id", "transcript", "score", "created_at"}
+
+def test_fields_projection_keeps_the_cursor_columns(client, attempt_ids):
+    response = client.get("/attempts/", headers=auth_headers(), params={"fields": "score, word_feedback", "limit": 2})
+    attempts = response.json()
+    assert [set(attempt) for attempt in attempts] == [{"id", "created_at", "score", "word_feedback"}] * 2
+    assert attempts[0]["word_feedback"] == [{"word": "bawo", "status": "correct"}]
+    assert "X-Next-Cursor" in response.headers
+
+def test_unknown_fields_are_rejected(client, attempt_ids):
+    response = client.get("/attempts/", headers=auth_headers(), params={"fields": "score,password,user_id"})
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Unknown fields: password, user_id"
+
+def test_skip_still_pages_by_offset(client, attempt_ids):
+    response = client.get("/attempts/", headers=auth_headers(), params={"skip": 2, "limit": 3})
+    assert [attempt["id"] for attempt in response.json()] == attempt_ids[2:5]
+    assert "X-Next-Cursor" in response.headers
+
+def test_skip_is_ignored_with_a_cursor(client, attempt_ids):
+    first = client.get("/attempts/", headers=auth_headers(), params={"limit": 2})
+    cursor = first.headers["X-Next-Cursor"]
+    response = client.get("/attempts/", headers=auth_headers(), params={"cursor": cursor, "skip": 4, "limit": 2})
+    assert [attempt["id"] for attempt in response.json()] == attempt_ids[2:4]
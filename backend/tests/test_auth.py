@@ -0,0 +1,56 @@
+# tests/test_auth.py
+import asyncio
+
+import pytest
+from sqlalchemy import func, select
+
+from app.db.database import AsyncSessionLocal
+from app.db.models import User
+from app.services.auth import authenticate_token
+from app.services.token_cache import token_cache
+
+pytestmark = pytest.mark.anyio
+
+
+async def authenticate(token: str) -> User:
+    async with AsyncSessionLocal() as db:
+        return await authenticate_token(token, db)
+
+
+async def test_first_sight_creates_the_user(database, fake_auth):
+    user = await authenticate("new-learner")
+    assert (user.firebase_uid, user.email, user.xp) == ("new-learner", "new-learner@example.com", 0)
+
+async def test_concurrent_first_requests_share_one_user(database, fake_auth):
+    # The client's first page load sends several requests with a brand-new token at once
+    users = await asyncio.gather(*[authenticate("new-learner") for _ in range(4)])
+    assert len({user.id for user in users}) == 1
+    async with AsyncSessionLocal() as db:
+        assert await db.scalar(select(func.count()).select_from(User)) == 1
+
+async def test_cached_token_skips_verification(database, fake_auth, monkeypatch):
+    first = await authenticate("learner")
+    from app.services import auth
+    monkeypatch.setattr(auth, "verify_token", lambda token: pytest.fail("token verified twice"))
+    assert (await authenticate("learner")).id == first.id
+
+async def test_email_owned_by_another_account_is_a_conflict(database, fake_auth, monkeypatch):
+    await authenticate("learner")
+    from app.services import auth
+    monkeypatch.setattr(auth, "verify_token", lambda token: {"uid": token, "email": "learner@example.com"})
+    with pytest.raises(Exception) as raised:
+        await authenticate("recreated-account")
+    assert getattr(raised.value, "status_code", None) == 409
+
+async def test_first_page_load_with_a_new_token(database, fake_auth):
+    import httpx
+    from app.main import app
+    from tests.helpers import auth_headers
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        responses = await asyncio.gather(*[
+            client.get(path, headers=auth_headers("new-learner"))
+            for path in ("/lessons/", "/preference/", "/leaderboard/", "/progress/")
+        ])
+    assert [response.status_code for response in responses] == [200] * 4
@@ -0,0 +1,100 @@
+# tests/test_flashcards.py
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import false, select
+
+from app.db.database import AsyncSessionLocal, SessionLocal
+from app.db.models import Flashcard, User
+from app.services.flashcards import DEFAULT_EASE, MIN_EASE, review, schedule_from_feedback
+
+NOW = datetime(2026, 3, 1, 12)
+
+
+def new_card() -> Flashcard:
+    return Flashcard(user_id=1, text="bawo", times_wrong=0, ease=DEFAULT_EASE, repetitions=0, interval_days=0.0)
+
+
+@pytest.mark.parametrize("quality, ease, interval, repetitions, times_wrong", [
+    (0, 1.7, 0.0, 0, 1),
+    (1, 1.96, 0.0, 0, 1),
+    (2, 2.18, 0.0, 0, 1),
+    (3, 2.36, 1.0, 1, 0),
+    (4, 2.5, 1.0, 1, 0),
+    (5, 2.6, 1.0, 1, 0),
+])
+def test_first_review_of_each_quality(quality, ease, interval, repetitions, times_wrong):
+    card = new_card()
+    review(card, quality, NOW)
+    assert (card.ease, card.interval_days, card.repetitions, card.times_wrong) == (
+        ease, interval, repetitions, times_wrong,
+    )
+    assert card.due_at == NOW + timedelta(days=interval)
+    assert card.last_seen == NOW
+
+def test_intervals_grow_by_ease_after_the_second_recall():
+    card = new_card()
+    intervals = []
+    for day in range(4):
+        review(card, 5, NOW + timedelta(days=day))
+        intervals.append(card.interval_days)
+    # 1 and 6 days, then the previous interval times the ease before the review
+    assert intervals == [1.0, 6.0, 16.2, 45.36]
+    assert card.ease == 2.9
+
+def test_lapse_restarts_the_schedule_and_is_due_at_once():
+    card = new_card()
+    review(card, 5, NOW)
+    review(card, 5, NOW)
+    review(card, 1, NOW)
+    assert (card.repetitions, card.interval_days, card.due_at, card.times_wrong) == (0, 0.0, NOW, 1)
+    review(card, 4, NOW)
+    assert (card.repetitions, card.interval_days) == (1, 1.0)
+
+def test_ease_never_drops_below_the_floor():
+    card = new_card()
+    for _ in range(5):
+        review(card, 0, NOW)
+    assert card.ease == MIN_EASE
+
+
+@pytest.fixture
+def learner_id(database):
+    with SessionLocal() as session:
+        user = User(firebase_uid="learner", email="learner@example.com", name="learner")
+        session.add(user)
+        session.commit()
+        return user.id
+
+
+@pytest.mark.anyio
+async def test_concurrent_first_miss_reviews_the_winning_card(learner_id):
+    missed = [{"word": "bawo", "status": "wrong"}, {"word": "ni", "status": "close"}]
+    # The other request creates the card first
+    async with AsyncSessionLocal() as db:
+        await schedule_from_feedback(db, learner_id, None, [missed[0]], NOW)
+        await db.commit()
+
+    async with AsyncSessionLocal() as db:
+        execute = db.execute
+        lookups = []
+
+        async def stale_first_lookup(statement, *args, **kwargs):
+            # This request read the cards before the other one committed
+            lookups.append(statement)
+            if len(lookups) == 1:
+                statement = statement.where(false())
+            return await execute(statement, *args, **kwargs)
+
+        db.execute = stale_first_lookup
+        await schedule_from_feedback(db, learner_id, None, missed, NOW + timedelta(minutes=1))
+        await db.commit()
+
+    assert len(lookups) == 2
+    async with AsyncSessionLocal() as db:
+        cards = {card.text: card for card in await db.scalars(select(Flashcard))}
+    assert set(cards) == {"bawo", "ni"}
+    # Both misses landed on the one bawo card
+    assert cards["bawo"].times_wrong == 2
+    assert cards["bawo"].last_seen == NOW + timedelta(minutes=1)
+    assert (cards["ni"].times_wrong, cards["ni"].repetitions) == (0, 1)
@@ -0,0 +1,80 @@
+# tests/test_jobs.py
+import asyncio
+import io
+
+import httpx
+import pytest
+
+from app.services.jobs import FAILED, SUCCEEDED, TranscriptionJobQueue, spool_content
+from app.services.spitch import TranscriptionService
+from tests.fake_spitch import FakeSpitch, create_app
+
+pytestmark = pytest.mark.anyio
+
+
+def make_queue(fake: FakeSpitch, **kwargs) -> TranscriptionJobQueue:
+    service = TranscriptionService(
+        api_key="test",
+        base_url="http://fake-spitch",
+        max_retries=0,
+        transport=httpx.ASGITransport(app=create_app(fake)),
+    )
+    kwargs.setdefault("backoff", 0.01)
+    return TranscriptionJobQueue(service, **kwargs)
+
+
+async def wait_finished(job, timeout: float = 5.0):
+    async def finished():
+        while job.status not in (SUCCEEDED, FAILED):
+            await job.changed.wait()
+    await asyncio.wait_for(finished(), timeout)
+
+
+async def test_job_succeeds_and_releases_its_audio():
+    fake = FakeSpitch()
+    queue = make_queue(fake)
+    content = spool_content(("a.wav", io.BytesIO(b"audio"), "audio/wav"))
+    job = queue.submit(1, "yo", content)
+    await wait_finished(job)
+    await queue.shutdown()
+    await queue.service.aclose()
+    assert job.status == SUCCEEDED
+    assert job.result["transcript"] == "yo:5"
+    assert content[1].closed
+
+async def test_server_errors_are_retried():
+    fake = FakeSpitch(status=503)
+    queue = make_queue(fake, max_retries=2)
+    job = queue.submit(1, "yo", b"audio")
+    await wait_finished(job)
+    await queue.shutdown()
+    await queue.service.aclose()
+    assert job.status == FAILED
+    assert job.attempts == 3
+    assert fake.requests == 3
+
+async def test_rejected_audio_is_not_retried():
+    fake = FakeSpitch(status=400)
+    queue = make_queue(fake, max_retries=2)
+    job = queue.submit(1, "yo", b"audio")
+    await wait_finished(job)
+    await queue.shutdown()
+    await queue.service.aclose()
+    assert job.status == FAILED
+    assert job.attempts == 1
+    assert "(400)" in job.error
+
+async def test_shutdown_fails_queued_and_running_jobs():
+    fake = FakeSpitch(delay=5.0)
+    queue = make_queue(fake, workers=1)
+    contents = [spool_content(("a.wav", io.BytesIO(b"audio"), "audio/wav")) for _ in range(3)]
+    jobs = [queue.submit(1, "yo", content) for content in contents]
+    while fake.in_flight == 0:
+        await asyncio.sleep(0.01)
+    await queue.shutdown()
+    await queue.service.aclose()
+    assert [job.status for job in jobs] == [FAILED] * 3
+    assert "while the job was running" in jobs[0].error
+    assert all("before the job ran" in job.error for job in jobs[1:])
+    assert all(content[1].closed for content in contents)
+    assert queue.depth == 0
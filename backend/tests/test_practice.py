@@ -0,0 +1,81 @@
+# tests/test_practice.py
+import pytest
+from sqlalchemy import select
+
+from app.db.database import SessionLocal, get_async_engine
+from app.db.models import Attempt, User
+from app.main import app
+from app.services.spitch import get_transcription_service
+from tests.helpers import auth_headers, seed_lesson, wav_bytes
+
+
+class StubTranscriptionService:
+    """Answers with a fixed transcript and notes what the pool looked like meanwhile"""
+
+    def __init__(self, transcript: str):
+        self.transcript = transcript
+        self.calls = []
+        self.connections_in_use = []
+
+    async def transcribe(self, language, content, content_sha256=None, use_cache=True):
+        self.calls.append(language)
+        self.connections_in_use.append(get_async_engine().sync_engine.pool.checkedout())
+        return {"request_id": "stub-1", "transcript": self.transcript, "cached": False}
+
+
+@pytest.fixture
+def stub_service():
+    service = StubTranscriptionService("bawo ni")
+    app.dependency_overrides[get_transcription_service] = lambda: service
+    yield service
+    app.dependency_overrides.pop(get_transcription_service, None)
+
+
+def practice(client, item_id, **data):
+    return client.post(
+        f"/practice/{item_id}",
+        data=data,
+        files={"audio_file": ("clip.wav", wav_bytes(), "audio/wav")},
+        headers=auth_headers(),
+    )
+
+
+def test_practice_scores_and_stores_the_attempt(client, database, stub_service):
+    item_id = seed_lesson(database)["item_ids"][0]
+    response = practice(client, item_id)
+    assert response.status_code == 200
+    body = response.json()
+    assert (body["transcript"], body["score"], body["xp"], body["streak"]) == ("bawo ni", 100.0, 100, 1)
+    # The item's lesson language is used when none is given
+    assert stub_service.calls == ["yo"]
+
+    with SessionLocal() as session:
+        attempt = session.scalars(select(Attempt)).one()
+        assert (attempt.lesson_item_id, attempt.score) == (item_id, 100.0)
+        assert session.scalars(select(User)).one().xp == 100
+
+def test_no_connection_is_held_during_transcription(client, database, stub_service):
+    item_id = seed_lesson(database)["item_ids"][0]
+    # A cold request: token, target index and catalog all miss and query the database
+    assert practice(client, item_id).status_code == 200
+    assert stub_service.connections_in_use == [0]
+
+def test_unknown_item_is_404(client, database, stub_service):
+    seed_lesson(database)
+    assert practice(client, 999).status_code == 404
+    assert stub_service.calls == []
+
+def test_confidence_out_of_range_is_422(client, database, stub_service):
+    item_id = seed_lesson(database)["item_ids"][0]
+    assert practice(client, item_id, confidence="50").status_code == 422
+    assert practice(client, item_id, confidence="-5").status_code == 422
+
+def test_transcribe_holds_no_connection_during_the_upstream_call(client, database, stub_service):
+    response = client.post(
+        "/transcribe/",
+        data={"language": "yo"},
+        files={"audio_file": ("clip.wav", wav_bytes(), "audio/wav")},
+        headers=auth_headers(),
+    )
+    assert response.status_code == 200
+    assert stub_service.connections_in_use == [0]
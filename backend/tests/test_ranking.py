@@ -0,0 +1,81 @@
+# tests/test_ranking.py
+import asyncio
+
+import pytest
+
+from app.db.database import AsyncSessionLocal, SessionLocal
+from app.db.models import User, UserPreferences
+from app.services.ranking import LeaderboardIndex
+
+pytestmark = pytest.mark.anyio
+
+
+async def loaded_index(users=(), reload_seconds: float = 0) -> LeaderboardIndex:
+    """An index loaded from an empty table, then fed (user_id, xp) through update_user"""
+    index = LeaderboardIndex(reload_seconds=reload_seconds)
+    async with AsyncSessionLocal() as db:
+        await index.ensure_loaded(db)
+    for user_id, xp in users:
+        index.update_user(user_id, xp, name=f"user{user_id}")
+    return index
+
+def ranks(ranked):
+    return [(entry.rank, entry.user_id) for entry in ranked]
+
+
+async def test_equal_xp_shares_a_rank(database):
+    index = await loaded_index([(1, 50), (2, 80), (3, 50), (4, 10)])
+    assert ranks(index.top(10)) == [(1, 2), (2, 1), (2, 3), (4, 4)]
+    assert index.rank(3).rank == 2
+
+async def test_neighbors_around_a_user(database):
+    index = await loaded_index([(user_id, 100 - user_id * 10) for user_id in range(1, 8)])
+    assert ranks(index.neighbors(4, around=1)) == [(3, 3), (4, 4), (5, 5)]
+    # At the top of the board the window is filled from below
+    assert ranks(index.neighbors(1, around=2)) == [(1, 1), (2, 2), (3, 3), (4, 4), (5, 5)]
+    assert index.neighbors(99, around=2) == []
+    # A tie straddling the window's first entry keeps its shared rank
+    index.update_user(3, 80)
+    assert ranks(index.neighbors(4, around=1)) == [(2, 3), (4, 4), (5, 5)]
+
+async def test_per_language_boards_follow_set_language(database):
+    index = await loaded_index([(1, 30), (2, 20), (3, 10)])
+    index.set_language(1, "yoruba")
+    index.set_language(3, "yo")
+    index.set_language(2, "igbo")
+    assert ranks(index.top(10, "yo")) == [(1, 1), (2, 3)]
+    assert ranks(index.top(10, "igbo")) == [(1, 2)]
+
+    index.set_language(1, "igbo")
+    assert ranks(index.top(10, "yoruba")) == [(1, 3)]
+    assert ranks(index.top(10, "ig")) == [(1, 1), (2, 2)]
+    assert index.rank(1, "yo") is None
+    # The global board doesn't change
+    assert ranks(index.top(10)) == [(1, 1), (2, 2), (3, 3)]
+
+async def test_xp_updates_move_users(database):
+    index = await loaded_index([(1, 30), (2, 20)])
+    index.update_user(2, 45)
+    assert ranks(index.top(10)) == [(1, 2), (2, 1)]
+    assert index.rank(2).xp == 45
+
+async def test_writes_from_elsewhere_show_up_after_the_reload_interval(database):
+    with SessionLocal() as session:
+        session.add(User(firebase_uid="a", email="a@example.com", name="a", xp=10))
+        session.commit()
+    index = await loaded_index(reload_seconds=0.2)
+    assert [entry.name for entry in index.top(10)] == ["a"]
+
+    # Another process (rescore, another worker) writes directly
+    with SessionLocal() as session:
+        session.add(User(firebase_uid="b", email="b@example.com", name="b", xp=99))
+        session.commit()
+        session.add(UserPreferences(user_id=2, target_language="yo"))
+        session.commit()
+    async with AsyncSessionLocal() as db:
+        await index.ensure_loaded(db)
+        assert [entry.name for entry in index.top(10)] == ["a"]
+        await asyncio.sleep(0.25)
+        await index.ensure_loaded(db)
+    assert [entry.name for entry in index.top(10)] == ["b", "a"]
+    assert [entry.name for entry in index.top(10, "yoruba")] == ["b"]
@@ -0,0 +1,55 @@
+# tests/test_rescore.py
+from datetime import date, datetime
+
+import pytest
+from sqlalchemy import select
+
+from app.commands import rescore
+from app.db.database import SessionLocal
+from app.db.models import Attempt, DailyProgress, ItemProgress, User
+from app.services.scoring import score_attempt
+from tests.helpers import seed_lesson
+
+
+@pytest.fixture
+def history(database):
+    """Two attempts on one day, stored with stale scores and their XP already credited"""
+    item_ids = seed_lesson(database)["item_ids"]
+    with SessionLocal() as session:
+        user = User(firebase_uid="learner", email="learner@example.com", name="learner", xp=180)
+        session.add(user)
+        session.flush()
+        session.add_all([
+            Attempt(user_id=user.id, lesson_item_id=item_ids[0], transcript="bawo ni",
+                    score=90.0, word_feedback=[], created_at=datetime(2026, 3, 1, 9)),
+            Attempt(user_id=user.id, lesson_item_id=item_ids[1], transcript="e kaaro",
+                    score=90.0, word_feedback=[], created_at=datetime(2026, 3, 1, 10)),
+        ])
+        session.add(DailyProgress(user_id=user.id, day=date(2026, 3, 1), attempts=2, total_score=180.0, xp=180))
+        session.commit()
+        return user.id
+
+
+def test_confidence_is_required(capsys):
+    with pytest.raises(SystemExit):
+        rescore.main([])
+    assert "--confidence" in capsys.readouterr().err
+
+
+def test_rebuild_progress_keeps_xp_in_step_with_users(history, tmp_path):
+    rescore.main([
+        "--confidence", "0.5", "--workers", "1", "--user-id", str(history),
+        "--checkpoint", str(tmp_path / "checkpoint.json"), "--rebuild-progress",
+    ])
+
+    expected = [score_attempt("Báwo ni", "bawo ni", 0.5)["score"], score_attempt("Ẹ káàrọ̀", "e kaaro", 0.5)["score"]]
+    with SessionLocal() as session:
+        scores = session.scalars(select(Attempt.score).order_by(Attempt.id)).all()
+        day = session.get(DailyProgress, (history, date(2026, 3, 1)))
+        user = session.get(User, history)
+        items = session.scalars(select(ItemProgress).order_by(ItemProgress.lesson_item_id)).all()
+
+    assert scores == expected
+    assert (day.attempts, day.total_score) == (2, pytest.approx(sum(expected)))
+    assert day.xp == user.xp == 180
+    assert [item.last_score for item in items] == expected
@@ -0,0 +1,69 @@
+# tests/test_scoring.py
+from app.services.scoring import align_words, score_attempt, score_attempts_batch, tokenize
+from tests.helpers import auth_headers
+
+
+def ops(target: str, heard: str):
+    return [(op, t, h) for op, t, h, _ in align_words(tokenize(target), tokenize(heard))]
+
+
+def test_exact_reading_matches_every_word():
+    assert ops("Báwo ni", "bawo ni") == [("match", "bawo", "bawo"), ("match", "ni", "ni")]
+    assert score_attempt("Báwo ni", "bawo ni", 1.0)["score"] == 100
+
+def test_missing_word_is_a_deletion():
+    assert ops("I am going", "I going") == [
+        ("match", "i", "i"), ("delete", "am", None), ("match", "going", "going"),
+    ]
+
+def test_extra_word_is_an_insertion():
+    assert ops("the market", "the big market") == [
+        ("match", "the", "the"), ("insert", None, "big"), ("match", "market", "market"),
+    ]
+
+def test_repeated_word_is_an_insertion():
+    assert ops("the market", "the the market") == [
+        ("match", "the", "the"), ("insert", None, "the"), ("match", "market", "market"),
+    ]
+
+def test_missing_and_extra_word_are_not_shifted_onto_neighbours():
+    feedback = score_attempt("I am going to the market", "I going to to the market", 1.0)["word_feedback"]
+    assert [(entry["word"], entry["op"]) for entry in feedback] == [
+        ("i", "match"), ("am", "delete"), ("going", "match"), ("to", "insert"),
+        ("to", "match"), ("the", "match"), ("market", "match"),
+    ]
+
+def test_lone_wrong_word_is_a_substitution():
+    feedback = score_attempt("the cat sat", "the dog sat", 1.0)["word_feedback"]
+    assert feedback[1] == {
+        "word": "cat", "status": "wrong", "suggestion": "Expected 'cat' but heard 'dog'", "op": "substitute",
+    }
+
+def test_mispronounced_word_is_a_close_substitution():
+    feedback = score_attempt("go to the market", "go to the markit", 1.0)["word_feedback"]
+    assert (feedback[3]["op"], feedback[3]["status"]) == ("substitute", "close")
+
+def test_empty_transcript_deletes_every_word():
+    assert ops("a b", "") == [("delete", "a", None), ("delete", "b", None)]
+    assert score_attempt("a b", "", 1.0)["score"] == 0
+
+def test_batch_matches_single_scoring_in_input_order():
+    triples = [
+        ("Báwo ni", "bawo ni", 1.0),
+        ("I am going to the market", "I going to to the market", 0.5),
+        ("Báwo ni", "bawo", 0.2),
+        ("", "anything", 1.0),
+        ("Báwo ni", "bawo ni", 0.0),
+    ]
+    results = score_attempts_batch(triples)
+    assert [entry["index"] for entry in results] == [0, 1, 2, 3, 4]
+    assert results[3] == {"index": 3, "error": "target_text is empty"}
+    for entry, (target, transcript, confidence) in zip(results, triples):
+        if "result" in entry:
+            assert entry["result"] == score_attempt(target, transcript, confidence)
+
+def test_batch_endpoint_rejects_out_of_range_confidence(client):
+    response = client.post("/score/batch", headers=auth_headers(), json={"items": [
+        {"target_text": "Báwo ni", "transcript": "bawo ni", "confidence": 1.5},
+    ]})
+    assert response.status_code == 422
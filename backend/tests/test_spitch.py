@@ -0,0 +1,97 @@
+# tests/test_spitch.py
+import asyncio
+
+import httpx
+import pytest
+from fastapi import HTTPException
+
+from app.services.spitch import TranscriptionService, UpstreamError
+from tests.fake_spitch import FakeSpitch, create_app
+
+pytestmark = pytest.mark.anyio
+
+
+def make_service(fake: FakeSpitch, transport=None, **kwargs) -> TranscriptionService:
+    kwargs.setdefault("max_retries", 0)
+    return TranscriptionService(
+        api_key="test",
+        base_url="http://fake-spitch",
+        transport=transport or httpx.ASGITransport(app=create_app(fake)),
+        **kwargs,
+    )
+
+
+async def test_transcribes_through_the_fake():
+    fake = FakeSpitch()
+    service = make_service(fake)
+    try:
+        result = await service.transcribe("yoruba", b"audio")
+    finally:
+        await service.aclose()
+    assert result == {"request_id": "fake-1", "transcript": "yo:5", "cached": False}
+
+async def test_concurrency_is_capped():
+    fake = FakeSpitch(delay=0.05)
+    service = make_service(fake, max_concurrency=2)
+    try:
+        results = await asyncio.gather(*[service.transcribe("yo", b"x" * n) for n in range(1, 7)])
+    finally:
+        await service.aclose()
+    assert [r["transcript"] for r in results] == [f"yo:{n}" for n in range(1, 7)]
+    assert fake.requests == 6
+    assert fake.max_in_flight == 2
+
+async def test_slow_upstream_times_out_as_504():
+    fake = FakeSpitch(delay=1.0)
+    service = make_service(fake, timeout=0.1)
+    try:
+        with pytest.raises(HTTPException) as raised:
+            await service.transcribe("yo", b"audio")
+    finally:
+        await service.aclose()
+    assert raised.value.status_code == 504
+    assert raised.value.retryable
+
+async def test_waiting_for_a_slot_counts_against_the_timeout():
+    fake = FakeSpitch(delay=0.3)
+    service = make_service(fake, max_concurrency=1, timeout=0.5)
+    try:
+        results = await asyncio.gather(
+            service.transcribe("yo", b"a"), service.transcribe("yo", b"b"), return_exceptions=True
+        )
+    finally:
+        await service.aclose()
+    statuses = sorted(getattr(r, "status_code", 200) for r in results)
+    assert statuses == [200, 504]
+
+@pytest.mark.parametrize("upstream, status_code, retryable", [
+    (500, 502, True),
+    (503, 502, True),
+    (429, 502, True),
+    (401, 502, False),
+    (400, 422, False),
+    (415, 422, False),
+])
+async def test_upstream_errors_keep_their_status(upstream, status_code, retryable):
+    fake = FakeSpitch(status=upstream)
+    service = make_service(fake)
+    try:
+        with pytest.raises(UpstreamError) as raised:
+            await service.transcribe("yo", b"audio")
+    finally:
+        await service.aclose()
+    assert raised.value.status_code == status_code
+    assert raised.value.upstream_status == upstream
+    assert raised.value.retryable is retryable
+
+async def test_unreachable_upstream_is_502():
+    def refuse(request):
+        raise httpx.ConnectError("connection refused", request=request)
+
+    service = make_service(FakeSpitch(), transport=httpx.MockTransport(refuse))
+    try:
+        with pytest.raises(HTTPException) as raised:
+            await service.transcribe("yo", b"audio")
+    finally:
+        await service.aclose()
+    assert raised.value.status_code == 502
@@ -0,0 +1,130 @@
+# tests/test_streaming.py
+import asyncio
+
+import pytest
+
+from app.core.config import settings
+from app.main import app
+from app.services.streaming import (
+    ChunkedTranscriber, ChunkedTranscriptionStream, FakeStreamingTranscriber, get_streaming_transcriber,
+)
+from tests.helpers import seed_lesson
+
+
+class RecordingService:
+    """TranscriptionService stand-in that records the size of every upload"""
+
+    def __init__(self, delay: float = 0.0):
+        self.delay = delay
+        self.sizes = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def transcribe(self, language, content, content_sha256=None, use_cache=True):
+        self.sizes.append(len(content))
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(self.delay)
+        finally:
+            self.in_flight -= 1
+        return {"request_id": None, "transcript": f"{len(content)}", "cached": False}
+
+
+@pytest.mark.anyio
+async def test_partials_are_spaced_out_geometrically():
+    service = RecordingService()
+    stream = ChunkedTranscriptionStream(service, "yo", partial_bytes=1000, growth=1.5, max_partials=100)
+    for _ in range(200):  # 200 KB in 1 KB chunks
+        await stream.feed(b"\0" * 1000)
+        await asyncio.sleep(0)
+    final = await stream.finish()
+
+    partial_sizes = service.sizes[:-1]
+    assert final["transcript"] == "200000"
+    assert all(later >= earlier * 1.5 for earlier, later in zip(partial_sizes, partial_sizes[1:]))
+    # Everything uploaded stays within a small multiple of the audio, not ~N^2
+    assert sum(service.sizes) < 4 * 200000
+
+@pytest.mark.anyio
+async def test_partials_per_stream_are_capped():
+    service = RecordingService()
+    stream = ChunkedTranscriptionStream(service, "yo", partial_bytes=10, growth=1.0, max_partials=3)
+    for _ in range(50):
+        await stream.feed(b"\0" * 10)
+        await asyncio.sleep(0)
+    await stream.finish()
+    assert stream.partials == 3
+    assert len(service.sizes) == 4
+
+@pytest.mark.anyio
+async def test_partials_share_a_worker_wide_concurrency_cap():
+    service = RecordingService(delay=0.05)
+    transcriber = ChunkedTranscriber(service, partial_bytes=10, growth=1.0, partial_concurrency=2)
+    streams = [transcriber.open("yo") for _ in range(6)]
+    for stream in streams:
+        await stream.feed(b"\0" * 10)
+    await asyncio.sleep(0.01)
+    # Streams that found every slot taken skipped their partial instead of queueing
+    assert service.max_in_flight == 2
+    assert sum(stream.partials for stream in streams) == 2
+    for stream in streams:
+        await stream.aclose()
+    assert transcriber.partial_slots.in_use == 0
+
+
+@pytest.fixture
+def fake_stream():
+    app.dependency_overrides[get_streaming_transcriber] = lambda: FakeStreamingTranscriber()
+    yield
+    app.dependency_overrides.pop(get_streaming_transcriber, None)
+
+
+def test_stream_sends_ready_partial_and_final(client, database, fake_stream):
+    item_id = seed_lesson(database, texts=("mo fe ra eran",))["item_ids"][0]
+    with client.websocket_connect(f"/transcribe/stream/{item_id}") as ws:
+        ws.send_json({"token": "learner"})
+        assert ws.receive_json() == {"type": "ready", "lesson_item_id": item_id, "words": ["mo", "fe", "ra", "eran"]}
+
+        ws.send_bytes("mo fe ".encode())
+        partial = ws.receive_json()
+        assert partial["type"] == "partial"
+        assert partial["transcript"] == "mo fe "
+        assert [(word["index"], word["status"]) for word in partial["words"]] == [(0, "correct")]
+
+        ws.send_bytes("ra eran".encode())
+        assert ws.receive_json()["type"] == "partial"
+        ws.send_text("end")
+        final = ws.receive_json()
+    assert final["type"] == "final"
+    assert (final["transcript"], final["score"]) == ("mo fe ra eran", 100.0)
+
+def test_stream_rejects_a_bad_start_frame(client, database, fake_stream):
+    item_id = seed_lesson(database)["item_ids"][0]
+    with client.websocket_connect(f"/transcribe/stream/{item_id}") as ws:
+        ws.send_text("not json")
+        error = ws.receive_json()
+    assert (error["type"], error["status"]) == ("error", 400)
+
+    with client.websocket_connect(f"/transcribe/stream/{item_id}") as ws:
+        ws.send_json({"language": "yo"})
+        assert ws.receive_json()["status"] == 401
+
+def test_stream_for_an_unknown_item_is_404(client, database, fake_stream):
+    seed_lesson(database)
+    with client.websocket_connect("/transcribe/stream/999") as ws:
+        ws.send_json({"token": "learner"})
+        error = ws.receive_json()
+    assert (error["type"], error["status"], error["detail"]) == ("error", 404, "Lesson item not found")
+
+def test_stream_stops_at_the_byte_cap(client, database, fake_stream, monkeypatch):
+    monkeypatch.setattr(settings, "AUDIO_MAX_BYTES", 16)
+    item_id = seed_lesson(database)["item_ids"][0]
+    with client.websocket_connect(f"/transcribe/stream/{item_id}") as ws:
+        ws.send_json({"token": "learner"})
+        assert ws.receive_json()["type"] == "ready"
+        ws.send_bytes(b"bawo ")
+        assert ws.receive_json()["type"] == "partial"
+        ws.send_bytes(b"ni " * 10)
+        error = ws.receive_json()
+    assert (error["type"], error["status"]) == ("error", 413)
@@ -0,0 +1,46 @@
+# tests/test_transcription_cache.py
+import os
+import time
+
+import pytest
+
+from app.services.transcription_cache import CacheBackend, DiskBackend
+
+
+def disk_files(directory):
+    return sorted(name for _, _, files in os.walk(directory) for name in files)
+
+
+def test_backends_must_implement_the_interface():
+    with pytest.raises(TypeError):
+        CacheBackend()
+
+def test_disk_backend_round_trip(tmp_path):
+    backend = DiskBackend(str(tmp_path), max_bytes=1024 * 1024)
+    backend.set("ab" * 32, {"transcript": "bawo ni"}, time.time() + 60)
+    assert backend.get("ab" * 32) == {"transcript": "bawo ni"}
+    assert backend.get("cd" * 32) is None
+    assert backend.stats()["entries"] == 1
+
+def test_disk_backend_sweeps_expired_entries(tmp_path):
+    backend = DiskBackend(str(tmp_path), max_bytes=1024 * 1024, sweep_seconds=0)
+    backend.set("aa" * 32, {"transcript": "old"}, time.time() - 1)
+    backend.set("bb" * 32, {"transcript": "new"}, time.time() + 60)
+    assert disk_files(tmp_path) == ["bb" * 32 + ".json"]
+    assert backend.stats()["expired"] == 1
+
+def test_disk_backend_evicts_the_oldest_past_its_budget(tmp_path):
+    backend = DiskBackend(str(tmp_path), max_bytes=600)
+    now = time.time()
+    keys = [f"{n:02d}" * 32 for n in range(20)]
+    for n, key in enumerate(keys):
+        backend.set(key, {"transcript": "x" * 40}, now + 60 + n)
+
+    stats = backend.stats()
+    assert stats["evictions"] > 0
+    assert stats["size_bytes"] <= 600
+    assert sum(os.path.getsize(os.path.join(root, name))
+               for root, _, files in os.walk(tmp_path) for name in files) <= 600
+    # The newest entries survive
+    assert backend.get(keys[-1]) == {"transcript": "x" * 40}
+    assert backend.get(keys[0]) is None
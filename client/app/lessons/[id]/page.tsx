@@ -176,31 +176,20 @@ export default function LessonPage() {
       const file = new File([audioBlob], "recording.wav", { type: "audio/wav" })
       console.log("[v0] Processing recording without transcription")
 
-      // const transcript = currentItem.expected_answer || currentItem.text
-      const transcript = await apiClient.transcribeAudio(file, lesson.language)
-      console.log("[v0] Using expected answer as transcript:", transcript)
-  
-      const scoreResult = await apiClient.scoreAttempt(currentItem.text, transcript.transcript
-)
-      console.log("[v0] Score result:", scoreResult)
+      // One round trip: transcribe, score against the item's expected answer and save
+      const practice = await apiClient.practiceItem(currentItem.id, file, lesson.language)
+      console.log("[v0] Practice result:", practice)
 
       const result: SpeechResult = {
-        transcript: transcript.transcript,
-        score: scoreResult.score,
-        word_scores: scoreResult.word_scores || [],
-        suggestions: scoreResult.suggestions || [],
+        transcript: practice.transcript,
+        score: practice.score,
+        word_scores: practice.word_feedback || [],
+        suggestions: practice.suggestions || [],
       }
 
       setSpeechResult(result)
       setShowFeedback(true)
 
-      await apiClient.saveAttempt({
-  lesson_item_id: currentItem.id,
-  transcript: result.transcript,
-  score: result.score,
-  word_feedback: result.word_scores || [],
-})
-
       // Show error to user
      
       setShowFeedback(true)
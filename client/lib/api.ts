@@ -73,16 +73,25 @@ export class ApiClient {
 
   // Speech processing
   async transcribeAudio(audioFile: File, language: string) {
+    return this.postAudio("/transcribe/", audioFile, language)
+  }
+
+  // Transcribe, score against the item and save the attempt in one request
+  async practiceItem(itemId: number, audioFile: File, language?: string) {
+    return this.postAudio(`/practice/${itemId}`, audioFile, language)
+  }
+
+  private async postAudio(path: string, audioFile: File, language?: string) {
     const formData = new FormData()
     formData.append("audio_file", audioFile, "recording.wav")
-    formData.append("language", language)
+    if (language) formData.append("language", language)
 
     const headers: HeadersInit = {}
     if (this.token) {
       headers.Authorization = `Bearer ${this.token}`
     }
 
-    const url = `${this.baseUrl}/transcribe/`
+    const url = `${this.baseUrl}${path}`
     console.log("[v0] Transcribing audio to:", url)
 
     try {
@@ -170,6 +179,25 @@ export class ApiClient {
 
 
 
+  async getProgress(language?: string, days = 30) {
+    const params = new URLSearchParams()
+    if (language) params.append("language", language)
+    params.append("days", days.toString())
+    return this.request(`/progress/?${params.toString()}`)
+  }
+
+  // Practice Again deck (spaced repetition)
+  async getDueFlashcards(limit = 20) {
+    return this.request(`/flashcards/due?limit=${limit}`)
+  }
+
+  async reviewFlashcard(flashcardId: number, quality: number) {
+    return this.request(`/flashcards/${flashcardId}/review`, {
+      method: "POST",
+      body: JSON.stringify({ quality }),
+    })
+  }
+
   async getLeaderboard(language?: string, limit = 10) {
     // Added limit param
     const params = new URLSearchParams()